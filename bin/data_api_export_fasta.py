@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Export the contigs of an Assembly or ContigSet object as FASTA.
+
+Sequences are streamed to the output as they are read, so memory use
+does not grow with the size of the assembly. Use --rss to check this.
+"""
+
+import argparse
+import logging
+import os
+import resource
+import sys
+import time
+#
+from doekbase.data_api.sequence.assembly.api import AssemblyAPI
+
+g_log = logging.getLogger()
+_hnd = logging.StreamHandler()
+_hnd.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+g_log.addHandler(_hnd)
+
+def peak_rss_mb():
+    """Peak resident set size of this process, in MB.
+    """
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        kb /= 1024  # reported in bytes
+    return kb / 1024.0
+
+def main(cmdline):
+    """Program entry point.
+    """
+    # Process command-line arguments
+    desc = __doc__.strip()
+    parser = argparse.ArgumentParser(description=desc)
+    parser.add_argument('ref', help='Object reference, e.g. 1019/4/1')
+    parser.add_argument('--output', '-o', dest='output', default=None,
+                        help='Output file (default=standard output)')
+    parser.add_argument('--contig', '-c', dest='contigs', action='append',
+                        default=None, metavar='ID',
+                        help='Export only this contig. Repeatable. '
+                             '(default=all contigs)')
+    parser.add_argument('--width', '-w', dest='width', type=int, default=60,
+                        help='Bases per line (default=%(default)s)')
+    parser.add_argument('--ws-url', dest='ws_url',
+                        default='https://ci.kbase.us/services/ws/',
+                        help='Workspace service URL (default=%(default)s)')
+    parser.add_argument('--shock-url', dest='shock_url',
+                        default='https://ci.kbase.us/services/shock-api/',
+                        help='Shock service URL (default=%(default)s)')
+    parser.add_argument('--handle-url', dest='handle_url',
+                        default='https://ci.kbase.us/services/handle_service/',
+                        help='Handle service URL (default=%(default)s)')
+    parser.add_argument('--rss', action='store_true',
+                        help='Print time taken and peak resident memory '
+                             'to standard error')
+    parser.add_argument('--verbose', '-v', dest='vb', action="count", default=0,
+                        help="Print more verbose messages to standard error. "
+                             "Repeatable. (default=ERROR)")
+    args = parser.parse_args(cmdline)
+
+    # Set logging verbosity
+    verbosity = (logging.ERROR, logging.INFO, logging.DEBUG)[min(args.vb, 2)]
+    g_log.setLevel(verbosity)
+
+    services = {"workspace_service_url": args.ws_url,
+                "shock_service_url": args.shock_url,
+                "handle_service_url": args.handle_url}
+    token = os.environ.get('KB_AUTH_TOKEN', '')
+
+    t0 = time.time()
+    try:
+        api = AssemblyAPI(services, token, args.ref)
+        if args.output is None:
+            num_contigs = api.export_fasta(sys.stdout, args.contigs, args.width)
+        else:
+            with open(args.output, 'w') as f:
+                num_contigs = api.export_fasta(f, args.contigs, args.width)
+    except Exception as err:
+        g_log.error('Error: {}'.format(err))
+        return 1
+    g_log.info('Exported {:d} contigs from {}'.format(num_contigs, args.ref))
+
+    if args.rss:
+        sys.stderr.write('contigs={:d} seconds={:.3f} peak_rss_mb={:.1f}\n'
+                         .format(num_contigs, time.time() - t0,
+                                 peak_rss_mb()))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
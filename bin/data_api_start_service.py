@@ -20,7 +20,7 @@ from doekbase.data_api.util import log_event, log_start, log_end
 import doekbase.data_api.util
 
 # Constants
-SERVICE_NAMES = ["object", "taxon", "assembly", "genome_annotation"]
+SERVICE_NAMES = ["object", "taxon", "assembly", "genome_annotation", "all"]
 KBASE_TARGETS = ["prod", "next", "ci", "localhost", "dir_cache", "dir_nocache"]
 
 # Global variables
@@ -157,6 +157,89 @@ def low_memory_abort(mon_obj, avail, thresh, driver, service_name, pidfile):
     pidlockfile.remove_existing_pidfile(pidfile.path)
     sys.exit(-1)
 
+def get_response_cache(config, stanza):
+    """Create the serialized-response cache from the service stanza.
+
+    Options:
+        response-cache-mb: byte budget in MB; 0 or absent disables the cache
+        response-cache-methods: comma-separated method names (default=all)
+        response-cache-per-token: cache non-public objects per token
+
+    Returns:
+        cache.ResponseCache, or None if not enabled
+    """
+    if not config.has_option(stanza, 'response-cache-mb'):
+        return None
+    mb = config.getint(stanza, 'response-cache-mb')
+    if mb <= 0:
+        return None
+    methods = None
+    if config.has_option(stanza, 'response-cache-methods'):
+        methods = [m.strip() for m in
+                   config.get(stanza, 'response-cache-methods').split(',')
+                   if m.strip()]
+    per_token = False
+    if config.has_option(stanza, 'response-cache-per-token'):
+        per_token = config.getboolean(stanza, 'response-cache-per-token')
+    log_event(_log, 'activating response cache',
+              kvp=dict(mb=mb, methods=methods or 'all', per_token=per_token))
+    return cache.ResponseCache(max_bytes=mb * 1024 * 1024, methods=methods,
+                               per_token=per_token)
+
+def get_scheduler(config, stanza):
+    """Create the per-token fair scheduler from the service stanza.
+
+    Options:
+        scheduler-workers: threads for normal calls; 0 or absent disables
+        scheduler-fast-workers: threads only for fast-lane calls (default=1)
+        scheduler-fast-methods: comma-separated method names in the
+                                fast lane (default=get_info, get_taxon,
+                                get_assembly, get_feature_types)
+
+    Returns:
+        service_core.FairScheduler, or None if not enabled
+    """
+    from doekbase.data_api import service_core
+    if not config.has_option(stanza, 'scheduler-workers'):
+        return None
+    workers = config.getint(stanza, 'scheduler-workers')
+    if workers <= 0:
+        return None
+    fast_workers = 1
+    if config.has_option(stanza, 'scheduler-fast-workers'):
+        fast_workers = config.getint(stanza, 'scheduler-fast-workers')
+    fast_methods = None
+    if config.has_option(stanza, 'scheduler-fast-methods'):
+        fast_methods = [m.strip() for m in
+                        config.get(stanza, 'scheduler-fast-methods').split(',')
+                        if m.strip()]
+    log_event(_log, 'activating scheduler',
+              kvp=dict(workers=workers, fast_workers=fast_workers,
+                       fast_methods=fast_methods or 'default'))
+    return service_core.FairScheduler(workers=workers,
+                                      fast_workers=fast_workers,
+                                      fast_methods=fast_methods)
+
+def set_node_cache(config, stanza):
+    """Set up the local cache of Shock node files from the service stanza.
+
+    Options:
+        shock-cache-dir: directory for the files; absent disables the cache
+        shock-cache-mb: disk budget in MB (default=10240)
+    """
+    from doekbase.data_api import shock
+    if not config.has_option(stanza, 'shock-cache-dir'):
+        return
+    directory = config.get(stanza, 'shock-cache-dir')
+    mb = 10240
+    if config.has_option(stanza, 'shock-cache-mb'):
+        mb = config.getint(stanza, 'shock-cache-mb')
+    if not directory or mb <= 0:
+        return
+    log_event(_log, 'activating shock node cache',
+              kvp=dict(dir=directory, mb=mb))
+    shock.set_node_cache(shock.NodeFileCache(directory, mb * 1024 * 1024))
+
 def main():
     global pidfile, _log
     parser = argparse.ArgumentParser()
@@ -225,6 +308,8 @@ def main():
     service_port = None
     redis_host = None
     redis_port = None
+    response_cache = None
+    scheduler = None
 
     # Read and process main configuration
     cfg_t0 = log_start(_log, 'configure', kvp=dict(file=args.config))
@@ -253,6 +338,16 @@ def main():
             service_port = config.getint(service_stanza_name, 'service-port')
         if config.has_option(service_stanza_name, 'pidfile'):
             pidfilename = config.get(service_stanza_name, 'pidfile')
+        response_cache = get_response_cache(config, service_stanza_name)
+        scheduler = get_scheduler(config, service_stanza_name)
+        set_node_cache(config, service_stanza_name)
+        if config.has_option(service_stanza_name, 'pack-sequences'):
+            cache.ObjectCache.pack_sequences = config.getboolean(
+                service_stanza_name, 'pack-sequences')
+        if config.has_option(service_stanza_name, 'feature-container-workers'):
+            from doekbase.data_api.annotation.genome_annotation import api
+            api.CONTAINER_WORKERS = config.getint(
+                service_stanza_name, 'feature-container-workers')
     # let command line override config file
     if args.pidfile:
         pidfilename = args.pidfile
@@ -301,6 +396,8 @@ def main():
         elif service_name == "genome_annotation":
             from doekbase.data_api.annotation.genome_annotation.service import \
                 driver
+        elif service_name == "all":
+            from doekbase.data_api import service_driver as driver
         else:
             raise Exception("Service not activated: {}".format(service_name))
 
@@ -308,7 +405,9 @@ def main():
             mem_mon.add_alert(args.mem_stop, low_memory_abort, driver,
                               service_name, pidfile)
         driver.start_service(services=services, port=service_port, host='',
-                             killprocgrp=args.kill_on_exit)
+                             killprocgrp=args.kill_on_exit,
+                             response_cache=response_cache,
+                             scheduler=scheduler)
     finally:
         release_pidfile(pidfile)
         log_end(_log, t0, service_name, kvp=service_info)
@@ -6,14 +6,22 @@ Assembly and Taxon associated with an annotation, as well as retrieving individu
 # stdlib imports
 import abc
 import hashlib
+import itertools
 
 # 3rd party imports
 #import blist
 
 # local imports
 from doekbase.data_api.core import ObjectAPI, fix_docs
-from doekbase.data_api.util import get_logger, logged
+from doekbase.data_api.util import get_logger, logged, check_deadline, \
+    get_deadline, set_deadline, get_thread_pool, PerfCollector
 from doekbase.data_api import exceptions
+from doekbase.data_api.annotation.genome_annotation.index import \
+    AliasIndex, FeatureLookup, FunctionIndex, RegionIndex, RelationshipIndex
+from doekbase.data_api.annotation.genome_annotation.exons import MRNAExons
+from doekbase.data_api.annotation.genome_annotation.table import \
+    FeatureTable, check_fields, LOCATION_FIELDS
+from doekbase.data_api.sequence.packed import unpack
 import doekbase.data_api.annotation.genome_annotation.service.ttypes as ttypes
 
 _GENOME_TYPES = ['KBaseGenomes.Genome']
@@ -48,8 +56,93 @@ FEATURE_DESCRIPTIONS = {
     "trnspn": "Transposon"    
 }
 
+#: Fields of the Features in a Feature container, in groups that are
+#: fetched (with `get_data_subset`) and cached together. Each method
+#: asks only for the groups it reads.
+FEATURE_FIELD_GROUPS = {
+    "ids": ["feature_id", "type"],
+    "locations": ["locations"],
+    "function": ["function"],
+    "aliases": ["aliases"],
+    "dna": ["dna_sequence"],
+    "publications": ["publications"],
+    "md5": ["md5"],
+    "relationships": ["gene_properties", "mRNA_properties", "CDS_properties"],
+    "details": ["dna_sequence_length", "notes", "inference", "quality",
+                "quality_warnings"]
+}
+
+#: Feature containers fetched at a time, shared by all calls in the
+#: process; 1 fetches them one after another. Takes effect when the
+#: pool is first used.
+CONTAINER_WORKERS = 4
+
 _log = get_logger("GenomeAnnotationAPI")
 
+g_stats = PerfCollector('GenomeAnnotationAPI')
+
+# distinguishes concurrent fetches of the same container in g_stats
+_fetch_ids = itertools.count()
+
+
+#: Filters of `get_feature_ids` answered by an index, with the name of
+#: their values in error messages
+_INDEX_FILTERS = (("region_list", "region dictionaries"),
+                  ("function_list", "Feature function strings"),
+                  ("alias_list", "Feature alias strings"))
+
+def _get_index_filters(filters):
+    """Get the (name, values) of the filters in `filters` that are
+    answered by an index, in the order of `_INDEX_FILTERS`.
+
+    Raises:
+      TypeError: if the values of a filter are not a non-empty list
+    """
+    result = []
+    for name, description in _INDEX_FILTERS:
+        values = filters.get(name)
+        if values is None:
+            continue
+        if not isinstance(values, list):
+            raise TypeError("A list of {} is required.".format(description))
+        elif len(values) == 0:
+            raise TypeError("A list of {} is required, received an empty "
+                            "list.".format(description))
+        result.append((name, values))
+    return result
+
+def _intersect_hits(index_filters, query):
+    """Get the keys of the Features that pass every index filter, by
+    intersecting the hits of each, so the cost depends on the number
+    of hits and not of Features.
+
+    Args:
+      index_filters (list): Result of `_get_index_filters`, not empty
+      query (function): query(name, values) gives the set of keys
+                        matching one filter
+    Returns:
+      set of keys
+    """
+    hits = None
+    for name, values in index_filters:
+        found = query(name, values)
+        hits = found if hits is None else hits & found
+        if not hits:
+            break
+    return hits
+
+def _filter_feature_table(api, table, filters):
+    """Select the rows of a FeatureTable for the Features that pass
+    `filters`, as for `get_feature_ids`.
+    """
+    if not filters:
+        return table
+    feature_ids = set()
+    for ids in api.get_feature_ids(filters, group_by="type")["by_type"].values():
+        feature_ids.update(ids)
+    keep = [i for i, x in enumerate(table["feature_id"]) if x in feature_ids]
+    return table.select(keep)
+
 
 class GenomeAnnotationInterface(object):
     __metaclass__ = abc.ABCMeta
@@ -224,6 +317,30 @@ class GenomeAnnotationInterface(object):
         """
         pass
 
+    @abc.abstractmethod
+    def get_feature_table(self, fields=None, filters=None):
+        """Retrieves Feature data as columns, one row per Feature.
+
+        This is much faster than `get_features` for looking at many
+        Features at once, e.g. with NumPy or pandas. The columns are
+        described in
+        :class:`doekbase.data_api.annotation.genome_annotation.table.FeatureTable`.
+        The table for the whole genome is cached, so do not modify its
+        arrays.
+
+        Args:
+          fields (list<str>): Columns to include, from "feature_id", "type",
+              "contig_id", "start", "length", "strand", "function" and "md5".
+              "feature_id" is always included. If None, include all columns.
+          filters (dict): Include only the Features that pass these filters,
+              with the same keys and meaning as for `get_feature_ids`.
+              If None, include all Features.
+
+        Returns:
+          FeatureTable: Use its `to_dataframe()` method for a pandas DataFrame.
+        """
+        pass
+
     @abc.abstractmethod
     def get_proteins(self):
         """Retrieves all the available proteins for a genome.
@@ -445,6 +562,38 @@ class GenomeAnnotationInterface(object):
         """
         pass
 
+    @abc.abstractmethod
+    def get_gene_models(self, gene_id_list=None, include_sequences=False):
+        """Retrieves gene models: each gene with its mRNAs, the CDS of each
+        mRNA, and their locations and functions, as for writing GFF.
+
+        Every Feature container is read at most once, however many genes
+        are requested.
+
+        Note - The Genome data type does not contain interfeature relationship information
+        and will raise a TypeError exception when this method is called.
+
+        Args:
+          gene_id_list (list<str>): List of gene Feature ids.
+            If None, returns the models of all genes.
+          include_sequences (bool): Whether to include the DNA sequence
+            of each Feature.
+
+        Returns:
+          dict<str gene_feature_id>: {"gene": Model_feature,
+                                      "mrnas": list<{"mrna": Model_feature, "cds": Model_feature or None}>,
+                                      "unassigned_cds": list<Model_feature>}
+
+          Where "unassigned_cds" has the CDS children of the gene that are
+          not the CDS of any of its mRNAs (e.g., for genes without mRNAs),
+          and Model_feature is a dictionary with these key/value pairs:
+              - feature_id: str
+              - feature_locations: list<{"contig_id": str, "start": int, "strand": str, "length": int}>
+              - feature_function: str
+              - feature_dna_sequence: str, only if include_sequences is True
+        """
+        pass
+
 
 @fix_docs
 class GenomeAnnotationAPI(ObjectAPI, GenomeAnnotationInterface):
@@ -504,6 +653,9 @@ class GenomeAnnotationAPI(ObjectAPI, GenomeAnnotationInterface):
     def get_features(self, feature_id_list=None):
         return self.proxy.get_features(feature_id_list)
 
+    def get_feature_table(self, fields=None, filters=None):
+        return self.proxy.get_feature_table(fields, filters)
+
     def get_proteins(self):
         return self.proxy.get_proteins()
 
@@ -530,6 +682,9 @@ class GenomeAnnotationAPI(ObjectAPI, GenomeAnnotationInterface):
     
     def get_mrna_by_gene(self, gene_feature_id_list=None):
         return self.proxy.get_mrna_by_gene(gene_feature_id_list)
+
+    def get_gene_models(self, gene_id_list=None, include_sequences=False):
+        return self.proxy.get_gene_models(gene_id_list, include_sequences)
     
 
 @fix_docs
@@ -557,7 +712,7 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
 
     def get_feature_types(self):
         feature_types = []
-        features = self.get_data()['features']
+        features = self._get_packed_data()['features']
 
         for x in features:
             if "type" in x and x["type"] not in feature_types:
@@ -577,84 +732,29 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
             raise ValueError("Invalid group_by {}, valid group_by values are {}".format(group_by, self._valid_groups))
 
         # no choice but to pull all features
-        features = self.get_data()['features']
+        features = self._get_packed_data()['features']
 
-        # now process all filters and reduce the data
-        remove_features = set()
-
-        if "type_list" in filters and filters["type_list"] is not None:
-            if not isinstance(filters["type_list"], list):
+        type_list = filters.get("type_list")
+        if type_list is not None:
+            if not isinstance(type_list, list):
                 raise TypeError("A list of strings indicating Feature types is required.")
-            elif len(filters["type_list"]) == 0:
+            elif len(type_list) == 0:
                 raise TypeError("A list of strings indicating Feature types is required, received an empty list.")
 
-            for i in xrange(len(features)):
-                if features[i]["type"] not in filters["type_list"]:
-                    remove_features.add(i)
-
-        if "region_list" in filters and filters["region_list"] is not None:
-            if not isinstance(filters["region_list"], list):
-                raise TypeError("A list of region dictionaries is required.")
-            elif len(filters["region_list"]) == 0:
-                raise TypeError("A list of region dictionaries is required, received an empty list.")
-
-            def is_feature_in_regions(f, regions):
-                if "location" not in f:
-                    return False
-
-                for loc in f["location"]:
-                    for r in regions:
-                        if r["contig_id"] == loc[0] and loc[2] == r["strand"]:
-                            if loc[2] == "+" and \
-                               max(loc[1], r["start"]) <= min(loc[1]+loc[3], r["start"] + r["length"]):
-                                return True
-                            elif loc[2] == "-" and \
-                               max(loc[1] - loc[3], r["start"] - r["length"]) <= min(loc[1], r["start"]):
-                                return True
-                return False
-
-            for i in xrange(len(features)):
-                if not is_feature_in_regions(features[i], filters["region_list"]):
-                    remove_features.add(i)
-
-        if "function_list" in filters and filters["function_list"] is not None:
-            if not isinstance(filters["function_list"], list):
-                raise TypeError("A list of Feature function strings is required.")
-            elif len(filters["function_list"]) == 0:
-                raise TypeError("A list of Feature function strings is required, received an empty list.")
-
-            for i in xrange(len(features)):
-                if "function" not in features[i]:
-                    remove_features.add(i)
-                else:
-                    found = False
-                    for f in filters["function_list"]:
-                        if features[i]["function"].find(f) >= 0:
-                            found = True
-                            break
-
-                    if not found:
-                        remove_features.add(i)
-
-        if "alias_list" in filters and filters["alias_list"] is not None:
-            if not isinstance(filters["alias_list"], list):
-                raise TypeError("A list of Feature alias strings is required.")
-            elif len(filters["alias_list"]) == 0:
-                raise TypeError("A list of Feature alias strings is required, received an empty list.")
-
-            for i in xrange(len(features)):
-                if "aliases" not in features[i]:
-                    remove_features.add(i)
-                else:
-                    found = False
-                    for alias in filters["alias_list"]:
-                        if alias in features[i]["aliases"]:
-                            found = True
-
-                    if not found:
-                        remove_features.add(i)
+        # start from the index hits, if any, and check only those
+        index_filters = _get_index_filters(filters)
+        if index_filters:
+            indexes = {"region_list": self._get_region_index,
+                       "function_list": self._get_function_index,
+                       "alias_list": self._get_alias_index}
+            keep_features = sorted(_intersect_hits(
+                index_filters, lambda name, values: indexes[name]().query(values)))
+        else:
+            keep_features = xrange(len(features))
 
-        keep_features = [i for i in xrange(len(features)) if i not in remove_features]
+        if type_list is not None:
+            types = set(type_list)
+            keep_features = [i for i in keep_features if features[i]["type"] in types]
 
         # now that filtering has been completed, attempt to group the data as requested
         results = {}
@@ -704,6 +804,36 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
 
         return results
 
+    def _get_region_index(self):
+        """Get the interval index of Feature locations, keyed by the
+        position of each Feature in the "features" list.
+        """
+        def create():
+            features = self._get_packed_data()["features"]
+            return RegionIndex((i, f.get("location", []))
+                               for i, f in enumerate(features))
+        return self._cache.get_derived_data(create, 'region-index')
+
+    def _get_function_index(self):
+        """Get the substring index of Feature functions, keyed by the
+        position of each Feature in the "features" list.
+        """
+        def create():
+            features = self._get_packed_data()["features"]
+            return FunctionIndex((i, f.get("function"))
+                                 for i, f in enumerate(features))
+        return self._cache.get_derived_data(create, 'function-index')
+
+    def _get_alias_index(self):
+        """Get the index of Feature aliases, keyed by the position of each
+        Feature in the "features" list.
+        """
+        def create():
+            features = self._get_packed_data()["features"]
+            return AliasIndex((i, f.get("aliases"))
+                              for i, f in enumerate(features))
+        return self._cache.get_derived_data(create, 'alias-index')
+
     def get_feature_type_counts(self, type_list=None):
         """
         Retrieves the number of genome Features from a KBaseGenomes.Genome object, filtering on Feature type.
@@ -711,7 +841,7 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
         Returns:
           dict<str>:int"""
         counts = {}
-        features = self.get_data()["features"]
+        features = self._get_packed_data()["features"]
 
         if type_list is None:
             for x in features:
@@ -736,9 +866,21 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
         
         return counts
 
+    def _select_features(self, features, feature_id_list):
+        """Get the Features with the given ids, skipping unknown ids.
+
+        Uses a cached map of Feature id to position in `features`, which
+        must be the "features" list of this object.
+        """
+        def create():
+            return {x['id']: i for i, x in enumerate(features)}
+        positions = self._cache.get_derived_data(create, 'feature-positions')
+        return [features[positions[x]] for x in set(feature_id_list)
+                if x in positions]
+
     def get_feature_locations(self, feature_id_list=None):
         locations = {}
-        features = self.get_data()['features']
+        features = self._get_packed_data()['features']
 
         if feature_id_list is None:
             for x in features:
@@ -760,29 +902,28 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
             except AssertionError:
                 raise TypeError("A list of strings indicating Feature identifiers is required, received an empty list.")
 
-            for x in features:
-                if x['id'] in feature_id_list:
-                    locations[x['id']] = []
-
-                    if 'location' in x:
-                        for loc in x['location']:
-                            locations[x['id']].append({
-                                "contig_id": loc[0],
-                                "strand": loc[2],
-                                "start": loc[1],
-                                "length": loc[3]
-                            })
+            for x in self._select_features(features, feature_id_list):
+                locations[x['id']] = []
+
+                if 'location' in x:
+                    for loc in x['location']:
+                        locations[x['id']].append({
+                            "contig_id": loc[0],
+                            "strand": loc[2],
+                            "start": loc[1],
+                            "length": loc[3]
+                        })
 
         return locations
 
     def get_feature_dna(self, feature_id_list=None):
         sequences = {}
-        features = self.get_data()['features']
+        features = self._get_packed_data()['features']
 
         if feature_id_list is None:
             for x in features:
                 if "sequence" in x:
-                    sequences[x['id']] = x["sequence"]
+                    sequences[x['id']] = unpack(x["sequence"])
                 else:
                     sequences[x['id']] = ""
         else:
@@ -794,18 +935,17 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
             except AssertionError:
                 raise TypeError("A list of strings indicating Feature identifiers is required, received an empty list.")
 
-            for x in features:
-                if x['id'] in feature_id_list:
-                    if "sequence" in x:
-                        sequences[x['id']] = x["sequence"]
-                    else:
-                        sequences[x['id']] = ""
+            for x in self._select_features(features, feature_id_list):
+                if "sequence" in x:
+                    sequences[x['id']] = unpack(x["sequence"])
+                else:
+                    sequences[x['id']] = ""
 
         return sequences
 
     def get_feature_functions(self, feature_id_list=None):
         functions = {}
-        features = self.get_data()['features']
+        features = self._get_packed_data()['features']
 
         if feature_id_list is None:
             for x in features:
@@ -822,18 +962,17 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
             except AssertionError:
                 raise TypeError("A list of strings indicating Feature identifiers is required, received an empty list.")
 
-            for x in features:
-                if x['id'] in feature_id_list:
-                    if "function" in x:
-                        functions[x['id']] = x["function"]
-                    else:
-                        functions[x['id']] = ""
+            for x in self._select_features(features, feature_id_list):
+                if "function" in x:
+                    functions[x['id']] = x["function"]
+                else:
+                    functions[x['id']] = ""
 
         return functions
 
     def get_feature_aliases(self, feature_id_list=None):
         aliases = {}
-        features = self.get_data()['features']
+        features = self._get_packed_data()['features']
 
         if feature_id_list is None:
             for x in features:
@@ -850,18 +989,17 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
             except AssertionError:
                 raise TypeError("A list of strings indicating Feature identifiers is required, received an empty list.")
 
-            for x in features:
-                if x['id'] in feature_id_list:
-                    if "aliases" in x:
-                        aliases[x['id']] = x["aliases"]
-                    else:
-                        aliases[x['id']] = []
+            for x in self._select_features(features, feature_id_list):
+                if "aliases" in x:
+                    aliases[x['id']] = x["aliases"]
+                else:
+                    aliases[x['id']] = []
 
         return aliases
     
     def get_feature_publications(self, feature_id_list=None):
         publications = {}
-        features = self.get_data()['features']
+        features = self._get_packed_data()['features']
 
         if feature_id_list is None:
             for x in features:
@@ -878,18 +1016,17 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
             except AssertionError:
                 raise TypeError("A list of strings indicating Feature identifiers is required, received an empty list.")
 
-            for x in features:
-                if x['id'] in feature_id_list:
-                    if "publications" in x:
-                        publications[x['id']] = x["publications"]
-                    else:
-                        publications[x['id']] = []
+            for x in self._select_features(features, feature_id_list):
+                if "publications" in x:
+                    publications[x['id']] = x["publications"]
+                else:
+                    publications[x['id']] = []
 
         return publications
 
     def get_features(self, feature_id_list=None):
         out_features = {}
-        features = self.get_data()['features']
+        features = self._get_packed_data()['features']
 
         def fill_out_feature(x):
             f = {}
@@ -906,12 +1043,12 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
                 f["feature_locations"] = []
 
             if 'dna_sequence' in x:
-                f["feature_dna_sequence"] = x['dna_sequence']
+                f["feature_dna_sequence"] = unpack(x['dna_sequence'])
 
                 if 'md5' in x:
                     f["feature_md5"] = x['md5']
                 else:
-                    f["feature_md5"] = hashlib.md5(x["dna_sequence"].upper()).hexdigest()
+                    f["feature_md5"] = hashlib.md5(f["feature_dna_sequence"].upper()).hexdigest()
             else:
                 f["feature_dna_sequence"] = ""
                 f["feature_md5"] = ""
@@ -956,15 +1093,42 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
             except AssertionError:
                 raise TypeError("A list of strings indicating Feature identifiers is required, received an empty list.")
 
-            for x in features:
-                if x['id'] in feature_id_list:
-                    out_features[x['id']] = fill_out_feature(x)
+            for x in self._select_features(features, feature_id_list):
+                out_features[x['id']] = fill_out_feature(x)
 
         return out_features
 
+    def get_feature_table(self, fields=None, filters=None):
+        fields = check_fields(fields)
+
+        def md5(x):
+            # as for get_features
+            if 'dna_sequence' not in x:
+                return None
+            elif 'md5' in x:
+                return x['md5']
+            return hashlib.md5(unpack(x["dna_sequence"]).upper()).hexdigest()
+
+        def create():
+            features = self._get_packed_data()["features"]
+            columns = {"feature_ids": [x["id"] for x in features]}
+            if "type" in fields:
+                columns["types"] = [x["type"] for x in features]
+            if any(f in fields for f in LOCATION_FIELDS):
+                columns["locations"] = [x.get("location", []) for x in features]
+            if "function" in fields:
+                columns["functions"] = [x.get("function") for x in features]
+            if "md5" in fields:
+                columns["md5s"] = [md5(x) for x in features]
+            return FeatureTable.build(fields, **columns)
+
+        table = self._cache.get_derived_data(
+            create, 'feature-table:' + ','.join(fields))
+        return _filter_feature_table(self, table, filters)
+
     def get_proteins(self):
         proteins = {}
-        features = self.get_data()['features']
+        features = self._get_packed_data()['features']
         
         for f in features:
             if "protein_translation" in f and len(f["protein_translation"]) > 0:
@@ -986,22 +1150,22 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
                         "  This method cannot return valid results for this data type.")
 
     def get_mrna_exons(self, mrna_feature_id_list=None):
-        data = self.get_data()
+        data = self._get_packed_data()
 
         exons = {}
 
         if mrna_feature_id_list is None:
             mrna_feature_id_list = []
 
-        mrna_list_length = len(mrna_feature_id_list)
+        if len(mrna_feature_id_list) > 0:
+            features = self._select_features(data["features"], mrna_feature_id_list)
+        else:
+            features = data["features"]
 
-        for feature_data in data["features"]:
+        for feature_data in features:
             if feature_data["type"] != "mRNA":
                 continue
 
-            if mrna_list_length > 0 and feature_data["id"] not in mrna_feature_id_list:
-                continue
-
             if "dna_sequence" not in feature_data or "location" not in feature_data:
                 continue
 
@@ -1050,12 +1214,93 @@ class _KBaseGenomes_Genome(ObjectAPI, GenomeAnnotationInterface):
         raise TypeError("The Genome type does not contain relationships between Features." +
                         "  This method cannot return valid results for this data type.")
 
+    def get_gene_models(self, gene_id_list=None, include_sequences=False):
+        raise TypeError("The Genome type does not contain relationships between Features." +
+                        "  This method cannot return valid results for this data type.")
+
 
 @fix_docs
 class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
     def __init__(self, services, token, ref):
         super(_GenomeAnnotation, self).__init__(services, token, ref)
 
+    @staticmethod
+    def _get_container_features(container, groups, feature_ids=None,
+                                merge=True):
+        """Get the Features of a Feature container, with only the fields
+        in the given groups of `FEATURE_FIELD_GROUPS`.
+
+        Each group is a separate subset, cached on its own, so a later
+        call for other groups does not fetch these fields again.
+
+        Args:
+          container (ObjectAPI): The Feature container
+          groups (list): Names of field groups
+          feature_ids (list): Get only these Features, or None for all
+          merge (bool): If False, do not merge the groups, but return
+                        the (cached) Features of each group separately
+        Returns:
+          dict of Feature id to dict of fields, or if `merge` is False,
+          dict of group name to such a dict, which must not be modified
+        """
+        if feature_ids is None:
+            feature_ids = ["*"]
+        features, by_group = {}, {}
+        for group in groups:
+            path_list = ["features/{}/{}".format(x, field)
+                         for x in feature_ids
+                         for field in FEATURE_FIELD_GROUPS[group]]
+            subset = container.get_data_subset(path_list=path_list)
+            by_group[group] = subset.get("features", {})
+            if merge:
+                for x, fields in by_group[group].iteritems():
+                    features.setdefault(x, {}).update(fields)
+        return features if merge else by_group
+
+    def _fetch_containers(self, refs, groups, feature_ids=None, merge=True):
+        """Fetch the Features of Feature containers, several at a time.
+
+        Fetches run on a pool of `CONTAINER_WORKERS` threads shared by
+        the whole process, and each is recorded as a 'fetch_container'
+        event in `g_stats`.
+
+        Args:
+          refs (list): Object references of the containers
+          groups (list): Names of field groups, as for
+                         `_get_container_features`
+          feature_ids (dict): Feature ids to get from each container, by
+                              reference, or None for all Features
+          merge (bool): As for `_get_container_features`
+        Returns:
+          list of (ObjectAPI, features) tuples, in the order of `refs`
+        """
+        deadline = get_deadline()
+
+        def fetch(ref):
+            previous = get_deadline()
+            set_deadline(deadline)
+            try:
+                check_deadline('feature_container')
+                key = '{}#{:d}'.format(ref, next(_fetch_ids))
+                g_stats.start_event('fetch_container', key)
+                container = ObjectAPI(self.services, self._token, ref)
+                features = self._get_container_features(
+                    container, groups,
+                    None if feature_ids is None else feature_ids[ref],
+                    merge=merge)
+                g_stats.end_event('fetch_container', key, ref=ref,
+                                  groups=','.join(groups))
+                return container, features
+            finally:
+                set_deadline(previous)
+
+        refs = list(refs)
+        if CONTAINER_WORKERS <= 1 or len(refs) <= 1:
+            return [fetch(ref) for ref in refs]
+        pool = get_thread_pool('feature_containers', CONTAINER_WORKERS)
+        pending = [pool.apply_async(fetch, (ref,)) for ref in refs]
+        return [p.get() for p in pending]
+
     def _get_feature_containers(self, feature_id_list=None):
         if feature_id_list is None:
             feature_containers = self.get_data_subset(["feature_container_references"])["feature_container_references"].values()
@@ -1063,15 +1308,7 @@ class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
             try:
                 assert len(feature_id_list) > 0
 
-                feature_lookup = self.get_data_subset(path_list=["feature_lookup"])["feature_lookup"]
-                feature_containers = {}
-
-                for x in feature_id_list:
-                    for feature_ref in feature_lookup[x]:
-                        if feature_ref[0] not in feature_containers:
-                            feature_containers[feature_ref[0]] = []
-
-                        feature_containers[feature_ref[0]].append(feature_ref[1])
+                feature_containers = self._get_feature_lookup().group(feature_id_list)
             except TypeError:
                 raise TypeError("A list of strings indicating Feature identifiers is required.")
             except AssertionError:
@@ -1079,6 +1316,50 @@ class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
 
         return feature_containers
 
+    def _get_feature_lookup(self):
+        """Get the compact form of "feature_lookup", which maps Feature id
+        to the containers holding the Feature.
+        """
+        def create():
+            feature_lookup = self.get_data_subset(path_list=["feature_lookup"])["feature_lookup"]
+            return FeatureLookup(feature_lookup)
+        return self._cache.get_derived_data(create, 'feature-lookup')
+
+    def _get_relationship_index(self):
+        """Get the links between the gene, mRNA and CDS Features, read
+        from the relationship fields of their containers in one pass.
+        """
+        def create():
+            feature_container_references = self.get_data_subset(
+                path_list=["feature_container_references"])["feature_container_references"]
+            types = [t for t in ("gene", "mRNA", "CDS")
+                     if t in feature_container_references]
+            fetched = self._fetch_containers(
+                [feature_container_references[t] for t in types],
+                ["ids", "relationships"])
+            return RelationshipIndex(
+                {t: features for t, (_, features) in zip(types, fetched)})
+        return self._cache.get_derived_data(create, 'relationship-index')
+
+    def _get_relationships(self, source, target, feature_id_list):
+        """Get the Features of type `target` linked from Features of type
+        `source`, for `feature_id_list` or all of them if it is None.
+        """
+        if feature_id_list is not None:
+            self._check_feature_id_list(feature_id_list)
+
+        return self._get_relationship_index().query(source, target, feature_id_list)
+
+    @staticmethod
+    def _check_feature_id_list(feature_id_list):
+        if not isinstance(feature_id_list, list):
+            raise TypeError("A list of strings indicating Feature " +
+                            "identifiers is required.")
+        elif len(feature_id_list) == 0:
+            raise TypeError("A list of strings indicating Feature " +
+                            "identifiers is required, " +
+                            "received an empty list.")
+
     def get_taxon(self, ref_only=False):
         from doekbase.data_api.taxonomy.taxon.api import TaxonAPI
 
@@ -1113,13 +1394,8 @@ class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
         if group_by not in self._valid_groups:
             raise ValueError("Invalid group_by {}, valid group_by values are {}".format(group_by, self._valid_groups))
 
-        data = self.get_data()
-
-        # XXX: debugging
-        #return {'by_' + group_by: []}
-        # XXX
-
-        feature_container_references = data["feature_container_references"]
+        feature_container_references = self.get_data_subset(
+            path_list=["feature_container_references"])["feature_container_references"]
         features = {}
 
         # process all filters
@@ -1130,88 +1406,42 @@ class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
                 raise TypeError("A list of strings indicating Feature types is required, received an empty list.")
 
             # only pull data for features that are in the type_list
-            for f in feature_container_references:
-                if f in filters["type_list"]:
-                    container_data = ObjectAPI(self.services, self._token, feature_container_references[f]).get_data()["features"]
-                    features.update(container_data)
+            refs = [feature_container_references[f] for f in feature_container_references
+                    if f in filters["type_list"]]
         else:
             # pull down all features
-            for f in feature_container_references:
-                container_data = ObjectAPI(self.services, self._token, feature_container_references[f]).get_data()["features"]
-                features.update(container_data)
-
-        if "region_list" in filters and filters["region_list"] is not None:
-            if not isinstance(filters["region_list"], list):
-                raise TypeError("A list of region dictionaries is required.")
-            elif len(filters["region_list"]) == 0:
-                raise TypeError("A list of region dictionaries is required, received an empty list.")
-
-            def is_feature_in_regions(f, regions):
-                for loc in f["locations"]:
-                    for r in regions:
-                        if r["contig_id"] == loc[0] and loc[2] == r["strand"]:
-                            if loc[2] == "+" and \
-                               max(loc[1], r["start"]) <= min(loc[1] + loc[3], r["start"] + r["length"]):
-                                return True
-                            elif loc[2] == "-" and \
-                               max(loc[1] - loc[3], r["start"] - r["length"]) <= min(loc[1], r["start"]):
-                                return True
-                return False
-
-            remove_features = []
-
-            for f in features:
-                if not is_feature_in_regions(features[f], filters["region_list"]):
-                    remove_features.append(f)
-
-            for f in remove_features:
-                del features[f]
-
-        if "function_list" in filters and filters["function_list"] is not None:
-            if not isinstance(filters["function_list"], list):
-                raise TypeError("A list of Feature function strings is required.")
-            elif len(filters["function_list"]) == 0:
-                raise TypeError("A list of Feature function strings is required, received an empty list.")
-
-            remove_features = []
-
-            for f in features:
-                if "function" not in features[f]:
-                    remove_features.append(f)
-                else:
-                    found = False
-                    for func in filters["function_list"]:
-                        if features[f]["function"].find(func) >= 0:
-                            found = True
-
-                    if not found:
-                        remove_features.append(f)
-
-            for f in remove_features:
-                del features[f]
-
-        if "alias_list" in filters and filters["alias_list"] is not None:
-            if not isinstance(filters["alias_list"], list):
-                raise TypeError("A list of Feature alias strings is required.")
-            elif len(filters["alias_list"]) == 0:
-                raise TypeError("A list of Feature alias strings is required, received an empty list.")
-
-            remove_features = []
-
-            for f in features:
-                if "aliases" not in features[f]:
-                    remove_features.append(f)
-                else:
-                    found = False
-                    for alias in filters["alias_list"]:
-                        if alias in features[f]["aliases"]:
-                            found = True
-
-                    if not found:
-                        remove_features.append(f)
+            refs = feature_container_references.values()
+
+        # only pull the fields needed for grouping
+        groups = ["ids"]
+        if group_by == "region":
+            groups.append("locations")
+        if group_by == "function":
+            groups.append("function")
+        if group_by == "alias":
+            groups.append("aliases")
+
+        index_filters = _get_index_filters(filters)
+        if index_filters:
+            # query the indexes of each container, and fetch only the
+            # Features that pass every filter
+            indexes = {"region_list": self._get_region_index,
+                       "function_list": self._get_function_index,
+                       "alias_list": self._get_alias_index}
+            feature_ids = {}
+            for container, _ in self._fetch_containers(refs, []):
+                hits = _intersect_hits(
+                    index_filters,
+                    lambda name, values: indexes[name](container).query(values))
+                if hits:
+                    feature_ids[container.ref] = sorted(hits)
+            fetched = self._fetch_containers(feature_ids.keys(), groups,
+                                             feature_ids)
+        else:
+            fetched = self._fetch_containers(refs, groups)
 
-            for f in remove_features:
-                del features[f]
+        for container, container_features in fetched:
+            features.update(container_features)
 
         # now that filtering has been completed, attempt to group the data as requested
         results = {}
@@ -1265,6 +1495,42 @@ class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
     def get_feature_type_counts(self, type_list=None):
         return self.get_data_subset(path_list=["counts_map"])["counts_map"]
 
+    @staticmethod
+    def _get_region_index(container):
+        """Get the interval index of Feature locations in a Feature
+        container, keyed by Feature id. It is cached with the container.
+        """
+        def create():
+            features = _GenomeAnnotation._get_container_features(
+                container, ["locations"])
+            return RegionIndex((f, v.get("locations", []))
+                               for f, v in features.iteritems())
+        return container._cache.get_derived_data(create, 'region-index')
+
+    @staticmethod
+    def _get_function_index(container):
+        """Get the substring index of Feature functions in a Feature
+        container, keyed by Feature id. It is cached with the container.
+        """
+        def create():
+            features = _GenomeAnnotation._get_container_features(
+                container, ["function"])
+            return FunctionIndex((f, v.get("function"))
+                                 for f, v in features.iteritems())
+        return container._cache.get_derived_data(create, 'function-index')
+
+    @staticmethod
+    def _get_alias_index(container):
+        """Get the index of Feature aliases in a Feature container, keyed
+        by Feature id. It is cached with the container.
+        """
+        def create():
+            features = _GenomeAnnotation._get_container_features(
+                container, ["aliases"])
+            return AliasIndex((f, v.get("aliases"))
+                              for f, v in features.iteritems())
+        return container._cache.get_derived_data(create, 'alias-index')
+
     def _get_feature_data(self, data=None, feature_id_list=None):
         out = {}
         feature_containers = self._get_feature_containers(feature_id_list)
@@ -1281,15 +1547,25 @@ class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
                                 "identifiers is required, " +
                                 "received an empty list.")
 
-        for ref in feature_containers:
+        # the "ids" group lists every Feature, including those
+        # without the requested field
+        groups = ["ids", {"aliases": "aliases", "locations": "locations",
+                          "dna": "dna", "publications": "publications",
+                          "functions": "function"}[data]]
+
+        if feature_id_list is None:
+            fetched = self._fetch_containers(feature_containers, groups)
+        else:
+            fetched = self._fetch_containers(feature_containers, groups,
+                                             feature_containers)
+
+        for ref, (_, features) in zip(feature_containers, fetched):
             # Get list of Feature IDs
             if feature_id_list is None:
-                features = ObjectAPI(self.services, self._token, ref).get_data()["features"]
                 working_list = features
             else:
-                container = ObjectAPI(self.services, self._token, ref)
-                features = container.get_data_subset(path_list=feature_refs)["features"]
-                working_list = feature_id_list
+                working_list = [x for x in feature_containers[ref]
+                                if x in features]
             # Pull out a specific type of data from each Feature
             if data == "aliases":
                 for feature_id in working_list:
@@ -1393,19 +1669,60 @@ class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
 
             return f
 
-        containers = {ref: ObjectAPI(self.services, self._token, ref) for ref in feature_containers}
+        groups = ["ids", "locations", "function", "aliases", "dna", "md5",
+                  "details"]
 
         if feature_id_list is None:
-            out_features = {x: fill_out_feature(v) for ref in containers \
-                            for x,v in containers[ref].get_data()["features"].items()}
+            fetched = self._fetch_containers(feature_containers, groups)
         else:
-            for ref in feature_containers:
-                path_list = ["features/" + f for f in feature_containers[ref]]
-                subset_features = containers[ref].get_data_subset(path_list)["features"].items()
-                out_features.update({x: fill_out_feature(v) for x,v in subset_features})
+            fetched = self._fetch_containers(feature_containers, groups,
+                                             feature_containers)
+
+        for _, features in fetched:
+            out_features.update({x: fill_out_feature(v) for x,v in features.items()})
 
         return out_features
 
+    def get_feature_table(self, fields=None, filters=None):
+        fields = check_fields(fields)
+
+        def create():
+            feature_container_references = self.get_data_subset(
+                ["feature_container_references"])["feature_container_references"]
+            refs = [feature_container_references[t] for t in sorted(feature_container_references)]
+            groups = ["ids"]
+            if any(f in fields for f in LOCATION_FIELDS):
+                groups.append("locations")
+            if "function" in fields:
+                groups.append("function")
+            if "md5" in fields:
+                groups.append("md5")
+
+            # read the cached field groups directly, by Feature id order
+            columns = {"feature_ids": [], "types": [], "locations": [],
+                       "functions": [], "md5s": []}
+            for _, by_group in self._fetch_containers(refs, groups, merge=False):
+                order = sorted(by_group["ids"])
+                columns["feature_ids"].extend(order)
+                columns["types"].extend(by_group["ids"][x]["type"] for x in order)
+                if "locations" in by_group:
+                    features = by_group["locations"]
+                    columns["locations"].extend(
+                        features[x].get("locations", []) if x in features else []
+                        for x in order)
+                for group, field, column in [("function", "function", "functions"),
+                                             ("md5", "md5", "md5s")]:
+                    if group in by_group:
+                        features = by_group[group]
+                        columns[column].extend(
+                            features[x].get(field) if x in features else None
+                            for x in order)
+            return FeatureTable.build(fields, **columns)
+
+        table = self._cache.get_derived_data(
+            create, 'feature-table:' + ','.join(fields))
+        return _filter_feature_table(self, table, filters)
+
     def get_proteins(self):
         protein_container = ObjectAPI(self.services, self._token, self.get_data()["protein_container_ref"])
         result = protein_container.get_data()["proteins"]
@@ -1421,223 +1738,80 @@ class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
         return output
 
     def _get_by_mrna(self, feature_type=None, mrna_feature_id_list=None):
-        out = {}
-
-        feature_container_references = self.get_data_subset(
-            path_list=["feature_container_references"])["feature_container_references"]
+        target = {"cds": "CDS", "gene": "gene"}[feature_type]
+        linked = self._get_relationships("mRNA", target, mrna_feature_id_list)
+        return {x: linked[x][0] if linked[x] else None for x in linked}
 
-        if "mRNA" in feature_container_references:
-            try:
-                mrna_refs = ["features/" + x for x in mrna_feature_id_list]
-                assert len(mrna_refs) > 0
-            except TypeError:
-                raise TypeError("A list of strings indicating Feature " +
-                                "identifiers is required.")
-            except AssertionError:
-                raise TypeError("A list of strings indicating Feature " +
-                                "identifiers is required, " +
-                                "received an empty list.")
-
-            mrna_feature_container_ref = feature_container_references["mRNA"]
-            mrna_feature_container = ObjectAPI(self.services,
-                                               self._token,
-                                               mrna_feature_container_ref)
-            mrna_features = mrna_feature_container.get_data_subset(path_list=mrna_refs)["features"]
-
-            for mrna_feature_key in mrna_features:
-                mrna_id = mrna_features[mrna_feature_key]["feature_id"]
-
-                if feature_type == "cds" and "mRNA_properties" in mrna_features[mrna_feature_key] and \
-                "associated_CDS" in mrna_features[mrna_feature_key]["mRNA_properties"]:
-                    out[mrna_id] = mrna_features[mrna_feature_key]["mRNA_properties"]["associated_CDS"][1]
-                elif feature_type == "gene" and "mRNA_properties" in mrna_features[mrna_feature_key] and \
-                "parent_gene" in mrna_features[mrna_feature_key]["mRNA_properties"]:
-                    out[mrna_id] = mrna_features[mrna_feature_key]["mRNA_properties"]["parent_gene"][1]
-                else:
-                    out[mrna_id] = None
-
-        return out
+    def _get_mrna_exons(self, mrna_feature_id_list=None):
+        """Get the exons of the given mRNAs, or of every mRNA if the list
+        is None (kept as derived data), as an MRNAExons.
+        """
+        def create():
+            ref = self._get_mrna_container_ref()
+            feature_ids = None
+            if mrna_feature_id_list is not None:
+                feature_ids = {ref: mrna_feature_id_list}
+            ((_, features),) = self._fetch_containers(
+                [ref], ["ids", "locations"], feature_ids)
+            mrna_ids = features.keys()
+            return MRNAExons(mrna_ids, [features[x].get("locations", [])
+                                        for x in mrna_ids])
 
-    def get_mrna_utrs(self, mrna_feature_id_list=None):
         if mrna_feature_id_list is None:
+            return self._cache.get_derived_data(create, 'mrna-exons')
+        self._check_feature_id_list(mrna_feature_id_list)
+        return create()
+
+    def _get_mrna_utrs(self, mrna_feature_id_list=None):
+        """Get the exons of the given mRNAs, or of every mRNA if the list
+        is None (kept as derived data), with the UTR arrays computed by
+        `MRNAExons.utrs` from the CDS of each mRNA.
+        """
+        def create():
+            exons = self._get_mrna_exons(mrna_feature_id_list)
+            cds_ids = self.get_cds_by_mrna(mrna_feature_id_list)
             feature_container_references = self.get_data_subset(
                 path_list=["feature_container_references"])["feature_container_references"]
 
-            mrna_feature_container_ref = feature_container_references["mRNA"]
-            mrna_feature_container = ObjectAPI(self.services,
-                                               self._token,
-                                               mrna_feature_container_ref)
-            mrna_feature_id_list = mrna_feature_container.get_data()["features"].keys()
-
-        # fetch the cds info we need
-        cds_ids = self.get_cds_by_mrna(mrna_feature_id_list)
-        cds_locations = self._get_feature_data("locations", cds_ids.values())
-
-        # fetch the mrna Feature data
-        mrna_data = self.get_features(mrna_feature_id_list)
-
-        utrs = {}
+            cds_features = {}
+            wanted = sorted(set(x for x in cds_ids.itervalues() if x is not None))
+            if "CDS" in feature_container_references and wanted:
+                ref = feature_container_references["CDS"]
+                feature_ids = None
+                if mrna_feature_id_list is not None:
+                    feature_ids = {ref: wanted}
+                ((_, cds_features),) = self._fetch_containers(
+                    [ref], ["locations"], feature_ids)
 
-        for mrna_id in mrna_data:
-            mrna_locations = mrna_data[mrna_id]["feature_locations"]
-            mrna_sequence = mrna_data[mrna_id]["feature_dna_sequence"]
-
-            direction = cds_locations[cds_ids[mrna_id]][0]["strand"]
-
-            utr5_locations = []
-            utr3_locations = []
-            utr5_sequence = []
-            utr3_sequence = []
-            offset = 0
-
-            # if minus strand, 5' starts at the largest value, and we subtract length from start
-            if direction == "-":
-                cds_max = cds_locations[cds_ids[mrna_id]][0]["start"]
-                cds_min = cds_locations[cds_ids[mrna_id]][-1]["start"] - \
-                          cds_locations[cds_ids[mrna_id]][-1]["length"]
-
-                for x in mrna_locations:
-                    exon_max = x["start"]
-                    exon_min = x["start"] - x["length"]
-
-                    if exon_min > cds_max:
-                        # the exon ends before the cds starts
-                        utr5_locations.append(x)
-                        utr5_sequence.append(mrna_sequence[offset:offset + x["length"]])
-                    elif cds_max > exon_min and cds_max < exon_max:
-                        # the cds starts inside this exon
-                        utr_boundary = cds_max + 1
-                        utr_length = exon_max - utr_boundary + 1
-
-                        utr5_locations.append({
-                            "contig_id": x["contig_id"],
-                            "start": exon_max,
-                            "strand": x["strand"],
-                            "length": utr_length
-                        })
-                        utr5_sequence.append(mrna_sequence[offset:offset + utr_length])
-
-                    if cds_min > exon_min and cds_min < exon_max:
-                        # the cds ends inside this exon
-                        utr_boundary = cds_min - 1
-                        utr_length = utr_boundary - exon_min + 1
-
-                        utr3_locations.append({
-                            "contig_id": x["contig_id"],
-                            "start": utr_boundary,
-                            "strand": x["strand"],
-                            "length": utr_length
-                        })
-                        utr3_sequence.append(mrna_sequence[offset:offset + utr_length])
-                    elif exon_max < cds_min:
-                        # the exon begins after the cds ends
-                        utr3_locations.append(x)
-                        utr3_sequence.append(mrna_sequence[offset:offset + x["length"]])
-
-                    offset += x["length"]
-            elif direction == "+":
-                cds_max = cds_locations[cds_ids[mrna_id]][-1]["start"] + \
-                          cds_locations[cds_ids[mrna_id]][-1]["length"]
-                cds_min = cds_locations[cds_ids[mrna_id]][0]["start"]
-
-                for x in mrna_locations:
-                    exon_min = x["start"]
-                    exon_max = x["start"] + x["length"]
-
-                    if exon_max < cds_min:
-                        # the exon ends before the cds starts
-                        utr5_locations.append(x)
-                        utr5_sequence.append(mrna_sequence[offset:offset + x["length"]])
-                    elif cds_min > exon_min and cds_min < exon_max:
-                        # the cds starts inside this exon
-                        utr_boundary = cds_min - 1
-                        utr_length = utr_boundary - exon_min + 1
-
-                        utr5_locations.append({
-                            "contig_id": x["contig_id"],
-                            "start": exon_min,
-                            "strand": x["strand"],
-                            "length": utr_length
-                        })
-                        utr5_sequence.append(mrna_sequence[offset:offset + utr_length])
-
-                    if cds_max > exon_min and cds_max < exon_max:
-                        # the cds ends inside this exon
-                        utr_boundary = cds_max + 1
-                        utr_length = exon_max - utr_boundary + 1
-
-                        utr3_locations.append({
-                            "contig_id": x["contig_id"],
-                            "start": utr_boundary,
-                            "strand": x["strand"],
-                            "length": utr_length
-                        })
-                        utr3_sequence.append(mrna_sequence[offset:offset + utr_length])
-                    elif exon_min > cds_max:
-                        # the exon starts after the cds ends
-                        utr3_locations.append(x)
-                        utr3_sequence.append(mrna_sequence[offset:offset + x["length"]])
-
-                    offset += x["length"]
-            else:
-                raise Exception("Found location with unrecognized strand {}".format(direction))
-
-            # save the final results
-            utrs[mrna_id] = {}
-
-            if len(utr5_locations) > 0:
-                utrs[mrna_id]["5'UTR"] = {
-                    "utr_locations": utr5_locations,
-                    "utr_dna_sequence": "".join(utr5_sequence)
-                }
-
-            if len(utr3_locations) > 0:
-                utrs[mrna_id]["3'UTR"] = {
-                    "utr_locations": utr3_locations,
-                    "utr_dna_sequence": "".join(utr3_sequence)
-                }
-        #end outer for loop
-
-        return utrs
-
-    def get_mrna_exons(self, mrna_feature_id_list=None):
-        feature_container_references = self.get_data_subset(
-            path_list=["feature_container_references"])["feature_container_references"]
-
-        mrna_feature_container_ref = feature_container_references["mRNA"]
-        mrna_feature_container = ObjectAPI(self.services,
-                                           self._token,
-                                           mrna_feature_container_ref)
+            cds_locations = [cds_features.get(cds_ids.get(x), {}).get("locations")
+                             for x in exons.mrna_ids]
+            return exons, exons.utrs(cds_locations)
 
         if mrna_feature_id_list is None:
-            mrna_data = mrna_feature_container.get_data()
-        else:
-            mrna_data = mrna_feature_container.get_data_subset(
-                path_list=["features/" + x for x in mrna_feature_id_list])
+            return self._cache.get_derived_data(create, 'mrna-utrs')
+        return create()
 
-        exons = {}
-        for mrna_id in mrna_data["features"]:
-            feature_exons = []
-            mrna_sequence = mrna_data["features"][mrna_id]["dna_sequence"]
-
-            offset = 0
-            for i in xrange(len(mrna_data["features"][mrna_id]["locations"])):
-                exon_location = mrna_data["features"][mrna_id]["locations"][i]
-                exon_sequence = mrna_sequence[offset:offset + exon_location[3]]
-
-                feature_exons.append({"exon_location": {"contig_id": exon_location[0],
-                                                        "start": exon_location[1],
-                                                        "strand": exon_location[2],
-                                                        "length": exon_location[3]},
-                                       "exon_dna_sequence": exon_sequence,
-                                       "exon_ordinal": i})
+    def _get_mrna_sequences(self, mrna_feature_id_list=None):
+        """Get the DNA sequences of the given mRNAs, or of every mRNA.
+        """
+        ref = self._get_mrna_container_ref()
+        feature_ids = None
+        if mrna_feature_id_list is not None:
+            feature_ids = {ref: mrna_feature_id_list}
+        ((_, features),) = self._fetch_containers([ref], ["dna"], feature_ids)
+        return {x: features[x].get("dna_sequence") for x in features}
 
-                offset += exon_location[3]
+    def _get_mrna_container_ref(self):
+        return self.get_data_subset(
+            path_list=["feature_container_references"])["feature_container_references"]["mRNA"]
 
-            # assign here to avoid multiple memory reallocations of the dict
-            exons[mrna_id] = feature_exons
+    def get_mrna_utrs(self, mrna_feature_id_list=None):
+        exons, utrs = self._get_mrna_utrs(mrna_feature_id_list)
+        return exons.utr_dicts(utrs, self._get_mrna_sequences(mrna_feature_id_list))
 
-        return exons
+    def get_mrna_exons(self, mrna_feature_id_list=None):
+        exons = self._get_mrna_exons(mrna_feature_id_list)
+        return exons.exon_dicts(self._get_mrna_sequences(mrna_feature_id_list))
 
     def get_cds_by_mrna(self, mrna_feature_id_list=None):
         return self._get_by_mrna("cds", mrna_feature_id_list)
@@ -1646,42 +1820,9 @@ class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
         return self._get_by_mrna("gene", mrna_feature_id_list)
 
     def _get_by_cds(self, feature_type=None, cds_feature_id_list=None):
-        out = {}
-
-        feature_container_references = self.get_data_subset(
-            path_list=["feature_container_references"])["feature_container_references"]
-
-        if "CDS" in feature_container_references:
-            try:
-                cds_refs = ["features/" + x for x in cds_feature_id_list]
-                assert len(cds_refs) > 0
-            except TypeError:
-                raise TypeError("A list of strings indicating Feature " +
-                                "identifiers is required.")
-            except AssertionError:
-                raise TypeError("A list of strings indicating Feature " +
-                                "identifiers is required, " +
-                                "received an empty list.")
-
-            cds_feature_container_ref = feature_container_references["CDS"]
-            cds_feature_container = ObjectAPI(self.services,
-                                              self._token,
-                                              cds_feature_container_ref)
-            cds_features = cds_feature_container.get_data_subset(path_list=cds_refs)["features"]
-
-            for cds_feature_key in cds_features:
-                cds_id = cds_features[cds_feature_key]["feature_id"]
-
-                if feature_type == "mrna" and "CDS_properties" in cds_features[cds_feature_key] and \
-                "associated_mRNA" in cds_features[cds_feature_key]["CDS_properties"]:
-                    out[cds_id] = cds_features[cds_feature_key]["CDS_properties"]["associated_mRNA"][1]
-                elif feature_type == "gene" and "CDS_properties" in cds_features[cds_feature_key] and \
-                "associated_mRNA" in cds_features[cds_feature_key]["CDS_properties"]:
-                    out[cds_id] = cds_features[cds_feature_key]["CDS_properties"]["parent_gene"][1]
-                else:
-                    out[cds_id] = None
-
-        return out
+        target = {"mrna": "mRNA", "gene": "gene"}[feature_type]
+        linked = self._get_relationships("CDS", target, cds_feature_id_list)
+        return {x: linked[x][0] if linked[x] else None for x in linked}
 
     def get_mrna_by_cds(self, cds_feature_id_list=None):
         return self._get_by_cds("mrna", cds_feature_id_list)
@@ -1690,15 +1831,26 @@ class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
         return self._get_by_cds("gene", cds_feature_id_list)
 
     def _get_by_gene(self, feature_type=None, gene_feature_id_list=None):
-        out = {}
+        target = {"cds": "CDS", "mrna": "mRNA"}[feature_type]
+        return self._get_relationships("gene", target, gene_feature_id_list)
+
+    def get_cds_by_gene(self, gene_feature_id_list=None):
+        return self._get_by_gene("cds", gene_feature_id_list)
 
+    def get_mrna_by_gene(self, gene_feature_id_list=None):
+        return self._get_by_gene("mrna", gene_feature_id_list)
+
+    def get_gene_models(self, gene_id_list=None, include_sequences=False):
         feature_container_references = self.get_data_subset(
             path_list=["feature_container_references"])["feature_container_references"]
 
-        if "gene" in feature_container_references:
+        if "gene" not in feature_container_references:
+            return {}
+
+        if gene_id_list is not None:
             try:
-                gene_refs = ["features/" + x for x in gene_feature_id_list]
-                assert len(gene_refs) > 0
+                assert len(gene_id_list) > 0
+                gene_id_list = list(gene_id_list)
             except TypeError:
                 raise TypeError("A list of strings indicating Feature " +
                                 "identifiers is required.")
@@ -1707,31 +1859,74 @@ class _GenomeAnnotation(ObjectAPI, GenomeAnnotationInterface):
                                 "identifiers is required, " +
                                 "received an empty list.")
 
-            gene_feature_container = ObjectAPI(self.services,
-                                               self._token,
-                                               feature_container_references["gene"])
-            gene_features = gene_feature_container.get_data_subset(path_list=gene_refs)["features"]
-
-            for gene_feature_key in gene_features:
-                gene_id = gene_features[gene_feature_key]["feature_id"]
-                out[gene_id] = []
-
-                if feature_type == "cds" and "gene_properties" in gene_features[gene_feature_key] and \
-                "children_CDS" in gene_features[gene_feature_key]["gene_properties"]:
-                    for cds_tuple in gene_features[gene_feature_key]["gene_properties"]["children_CDS"]:
-                        out[gene_id].append(cds_tuple[1])
-                elif feature_type == "mrna" and "gene_properties" in gene_features[gene_feature_key] and \
-                "children_mRNA" in gene_features[gene_feature_key]["gene_properties"]:
-                    for mrna_tuple in gene_features[gene_feature_key]["gene_properties"]["children_mRNA"]:
-                        out[gene_id].append(mrna_tuple[1])
-
-        return out
+        groups = ["ids", "locations", "function", "relationships"]
+        if include_sequences:
+            groups.append("dna")
 
-    def get_cds_by_gene(self, gene_feature_id_list=None):
-        return self._get_by_gene("cds", gene_feature_id_list)
+        # first the genes, then every container of their children at once
+        gene_ref = feature_container_references["gene"]
+        if gene_id_list is None:
+            (_, genes), = self._fetch_containers([gene_ref], groups)
+        else:
+            (_, genes), = self._fetch_containers([gene_ref], groups,
+                                                 {gene_ref: gene_id_list})
+
+        children = {}
+        for gene in genes.itervalues():
+            properties = gene.get("gene_properties", {})
+            for ref, x in properties.get("children_mRNA", []) + properties.get("children_CDS", []):
+                children.setdefault(ref, set()).add(x)
+
+        refs = sorted(children)
+        if gene_id_list is None:
+            fetched = self._fetch_containers(refs, groups)
+        else:
+            fetched = self._fetch_containers(
+                refs, groups, {ref: sorted(children[ref]) for ref in refs})
 
-    def get_mrna_by_gene(self, gene_feature_id_list=None):
-        return self._get_by_gene("mrna", gene_feature_id_list)
+        features = {}
+        for ref, (_, container_features) in zip(refs, fetched):
+            for x, f in container_features.iteritems():
+                features[(ref, x)] = f
+
+        def model_feature(f):
+            out = {"feature_id": f["feature_id"],
+                   "feature_locations": [{"contig_id": loc[0],
+                                          "start": loc[1],
+                                          "strand": loc[2],
+                                          "length": loc[3]} for loc in f.get("locations", [])],
+                   "feature_function": f.get("function", "")}
+            if include_sequences:
+                out["feature_dna_sequence"] = f.get("dna_sequence", "")
+            return out
+
+        models = {}
+        for gene in genes.itervalues():
+            properties = gene.get("gene_properties", {})
+            mrnas, assigned = [], set()
+
+            for mrna_ref in properties.get("children_mRNA", []):
+                mrna = features.get(tuple(mrna_ref))
+                if mrna is None:
+                    continue
+
+                cds = None
+                cds_ref = mrna.get("mRNA_properties", {}).get("associated_CDS")
+                if cds_ref is not None and tuple(cds_ref) in features:
+                    cds = model_feature(features[tuple(cds_ref)])
+                    assigned.add(tuple(cds_ref))
+
+                mrnas.append({"mrna": model_feature(mrna), "cds": cds})
+
+            unassigned_cds = [model_feature(features[tuple(c)])
+                              for c in properties.get("children_CDS", [])
+                              if tuple(c) not in assigned and tuple(c) in features]
+
+            models[gene["feature_id"]] = {"gene": model_feature(gene),
+                                          "mrnas": mrnas,
+                                          "unassigned_cds": unassigned_cds}
+
+        return models
 
 
 _ga_log = get_logger('GenomeAnnotationClientAPI')
@@ -1762,12 +1957,13 @@ class GenomeAnnotationClientAPI(GenomeAnnotationInterface):
         return wrapper
 
     @logged(_ga_log, log_name='init')
-    def __init__(self, url=None, token=None, ref=None):
+    def __init__(self, url=None, token=None, ref=None, timeout=None):
         from doekbase.data_api.annotation.genome_annotation.service.interface import GenomeAnnotationClientConnection
 
         #TODO add exception handling and better error messages here
         self.url = url
-        self.transport, self.client = GenomeAnnotationClientConnection(url).get_client()
+        self.transport, self.client = GenomeAnnotationClientConnection(
+            url, timeout=timeout, key=ref).get_client()
         self.ref = ref
         self._token = token
 
@@ -1867,6 +2063,51 @@ class GenomeAnnotationClientAPI(GenomeAnnotationInterface):
 
         return output
 
+    @logged(_ga_log)
+    def get_feature_table(self, fields=None, filters=None):
+        # built here from get_features, as the service has no columnar call
+        fields = check_fields(fields)
+
+        if filters:
+            feature_id_list = [x for ids in self.get_feature_ids(filters)["by_type"].values()
+                               for x in ids]
+            features = self.get_features(feature_id_list) if feature_id_list else {}
+        else:
+            features = self.get_features()
+
+        order = sorted(features)
+        return FeatureTable.build(
+            fields, order,
+            types=[features[x]["feature_type"] for x in order],
+            locations=[[(loc["contig_id"], loc["start"], loc["strand"], loc["length"])
+                        for loc in features[x]["feature_locations"]] for x in order],
+            functions=[features[x]["feature_function"] for x in order],
+            md5s=[features[x]["feature_md5"] for x in order])
+
+    @logged(_ga_log)
+    @client_method
+    def get_gene_models(self, gene_id_list=None, include_sequences=False):
+        result = self.client.get_gene_models(self._token, self.ref, gene_id_list, include_sequences)
+
+        def model_feature(f):
+            out = {"feature_id": f.feature_id,
+                   "feature_locations": [{"contig_id": loc.contig_id,
+                                          "start": loc.start,
+                                          "strand": loc.strand,
+                                          "length": loc.length
+                                         } for loc in f.feature_locations],
+                   "feature_function": f.feature_function}
+            if include_sequences:
+                out["feature_dna_sequence"] = f.feature_dna_sequence
+            return out
+
+        return {x: {"gene": model_feature(result[x].gene),
+                    "mrnas": [{"mrna": model_feature(m.mrna),
+                               "cds": model_feature(m.cds) if m.cds is not None else None}
+                              for m in result[x].mrnas],
+                    "unassigned_cds": [model_feature(c) for c in result[x].unassigned_cds]}
+                for x in result}
+
     @logged(_ga_log)
     @client_method
     def get_proteins(self):
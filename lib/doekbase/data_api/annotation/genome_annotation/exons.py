@@ -0,0 +1,202 @@
+"""
+Exons and untranslated regions (UTRs) of the mRNA Features of a genome,
+computed for all mRNAs at once from flat arrays of their locations.
+"""
+
+# Imports
+
+# Third-party
+import numpy as np
+
+# Constants
+
+#: Keys of the UTRs of an mRNA, 5' first
+UTR_KEYS = ("5'UTR", "3'UTR")
+
+# Functions and classes
+
+def _ends(locations):
+    """Strand, start and length of the first and last location of each
+    list of locations, with strand "" and 0 for an empty list.
+    """
+    strands = np.array([locs[0][2] if locs else "" for locs in locations],
+                       dtype=object)
+    ends = np.zeros((len(locations), 4), dtype=np.int64)
+    for i, locs in enumerate(locations):
+        if locs:
+            ends[i] = (locs[0][1], locs[0][3], locs[-1][1], locs[-1][3])
+    return strands, ends.T
+
+
+class MRNAExons(object):
+    """Exons of mRNA Features in flat arrays, one row per exon.
+
+    The exons of mRNA `i` (of `mrna_ids`) are the rows
+    ``starts[i]:starts[i + 1]``, ordered 5' to 3' as the locations of the
+    mRNA. Columns, in `columns` by name:
+
+    - contig_id, strand: Location contig and strand (object)
+    - start, length: Location start and length (int64)
+    - ordinal: Position of the exon in its mRNA (int64)
+    - offset: Offset of the exon in the mRNA DNA sequence (int64)
+    """
+    def __init__(self, mrna_ids, locations):
+        """Build from mRNA locations.
+
+        Args:
+          mrna_ids (list): mRNA Feature ids
+          locations (list): Per mRNA, a list of (contig_id, start, strand,
+                            length), possibly empty
+        """
+        self.mrna_ids = list(mrna_ids)
+        counts = np.array([len(locs) for locs in locations], dtype=np.int64)
+        self.starts = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.starts[1:])
+        flat = [loc for locs in locations for loc in locs]
+        self.columns = {
+            "contig_id": np.array([loc[0] for loc in flat], dtype=object),
+            "start": np.array([loc[1] for loc in flat], dtype=np.int64),
+            "strand": np.array([loc[2] for loc in flat], dtype=object),
+            "length": np.array([loc[3] for loc in flat], dtype=np.int64)}
+        first = np.repeat(self.starts[:-1], counts)
+        self.columns["ordinal"] = np.arange(len(flat), dtype=np.int64) - first
+        # exclusive running total of lengths, restarted for each mRNA
+        total = np.concatenate([[0], np.cumsum(self.columns["length"])])
+        self.columns["offset"] = total[:-1] - total[first]
+
+    def __len__(self):
+        return len(self.columns["start"])
+
+    @property
+    def owners(self):
+        """Index in `mrna_ids` of the mRNA of each exon.
+        """
+        return np.repeat(np.arange(len(self.mrna_ids)), np.diff(self.starts))
+
+    def utrs(self, cds_locations):
+        """Compute the UTRs of every mRNA, from the span of its CDS.
+
+        The span runs from the first to the last CDS location, on the
+        strand of the first. On "+" it is [start, start + length], and on
+        "-" [start - length, start]. Exons (compared on the same strand)
+        entirely before the span are 5' UTR and entirely after it 3' UTR;
+        an exon holding an end of the span contributes the part outside
+        it, in the coordinates of `get_mrna_utrs`.
+
+        Args:
+          cds_locations (list): Per mRNA, the CDS locations as
+                                (contig_id, start, strand, length), or
+                                None or [] if it has no CDS
+        Returns:
+          dict of "5'UTR" and "3'UTR" to (rows, starts, lengths) arrays,
+          where rows are the exons holding each UTR part, in order
+        Raises:
+          ValueError: if a CDS strand is not "+" or "-"
+        """
+        strands, (f_start, f_length, l_start, l_length) = _ends(
+            [locs or [] for locs in cds_locations])
+        has_cds = strands != ""
+        bad = has_cds & (strands != "+") & (strands != "-")
+        if bad.any():
+            raise ValueError("Found location with unrecognized strand "
+                             "{}".format(strands[bad][0]))
+        minus = strands == "-"
+        cds_min = np.where(minus, l_start - l_length, f_start)
+        cds_max = np.where(minus, f_start, l_start + l_length)
+
+        # everything per exon from here on
+        owners = self.owners
+        has_cds, minus = has_cds[owners], minus[owners]
+        cds_min, cds_max = cds_min[owners], cds_max[owners]
+        start, length = self.columns["start"], self.columns["length"]
+        low = np.where(minus, start - length, start)
+        high = np.where(minus, start, start + length)
+        # the 5' end of the CDS span is its low end on "+", high on "-"
+        near = np.where(minus, cds_max, cds_min)
+        far = np.where(minus, cds_min, cds_max)
+        holds_near = (near > low) & (near < high)
+        holds_far = (far > low) & (far < high)
+        whole5 = np.where(minus, low > cds_max, high < cds_min)
+        whole3 = ~holds_far & np.where(minus, high < cds_min, low > cds_max)
+
+        part5 = ~whole5 & holds_near
+        part5_start = np.where(minus, high, low)
+        part5_length = np.where(minus, high - near, near - low)
+        part3_start = np.where(minus, far - 1, far + 1)
+        part3_length = np.where(minus, far - low, high - far)
+
+        result = {}
+        for key, whole, part, part_start, part_length in (
+                ("5'UTR", whole5, part5, part5_start, part5_length),
+                ("3'UTR", whole3, holds_far, part3_start, part3_length)):
+            rows = np.flatnonzero(has_cds & (whole | part))
+            result[key] = (rows,
+                           np.where(whole, start, part_start)[rows],
+                           np.where(whole, length, part_length)[rows])
+        return result
+
+    def _region(self, row, start=None, length=None):
+        return {"contig_id": self.columns["contig_id"][row],
+                "start": int(self.columns["start"][row]
+                             if start is None else start),
+                "strand": self.columns["strand"][row],
+                "length": int(self.columns["length"][row]
+                              if length is None else length)}
+
+    def exon_dicts(self, sequences):
+        """Get the exons in the form returned by `get_mrna_exons`.
+
+        Args:
+          sequences (dict): mRNA id to DNA sequence
+        Returns:
+          dict of mRNA id to list of exon dicts
+        """
+        offsets = self.columns["offset"].tolist()
+        lengths = self.columns["length"].tolist()
+        starts = self.starts.tolist()
+        exons = {}
+        for i, mrna_id in enumerate(self.mrna_ids):
+            sequence = sequences.get(mrna_id) or ""
+            exons[mrna_id] = [
+                {"exon_location": self._region(row),
+                 "exon_dna_sequence": sequence[offsets[row]:
+                                               offsets[row] + lengths[row]],
+                 "exon_ordinal": row - starts[i]}
+                for row in xrange(starts[i], starts[i + 1])]
+        return exons
+
+    def utr_dicts(self, utrs, sequences):
+        """Get UTRs in the form returned by `get_mrna_utrs`.
+
+        The sequence of each UTR part is read from the offset of its exon
+        in the mRNA sequence.
+
+        Args:
+          utrs (dict): Result of `utrs`
+          sequences (dict): mRNA id to DNA sequence
+        Returns:
+          dict of mRNA id to dict of "5'UTR" and/or "3'UTR" to UTR dict,
+          with an empty dict for an mRNA without UTRs
+        """
+        result = dict((mrna_id, {}) for mrna_id in self.mrna_ids)
+        owners = self.owners
+        offsets = self.columns["offset"]
+        for key in UTR_KEYS:
+            rows, starts, lengths = utrs[key]
+            if rows.size == 0:
+                continue
+            part_owners = owners[rows]
+            bounds = np.flatnonzero(np.diff(part_owners)) + 1
+            for part in np.split(np.arange(rows.size), bounds):
+                mrna_id = self.mrna_ids[part_owners[part[0]]]
+                sequence = sequences.get(mrna_id) or ""
+                locations, pieces = [], []
+                for row, start, length in zip(rows[part].tolist(),
+                                              starts[part].tolist(),
+                                              lengths[part].tolist()):
+                    locations.append(self._region(row, start, length))
+                    offset = int(offsets[row])
+                    pieces.append(sequence[offset:offset + length])
+                result[mrna_id][key] = {"utr_locations": locations,
+                                        "utr_dna_sequence": "".join(pieces)}
+        return result
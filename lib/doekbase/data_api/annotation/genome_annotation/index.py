@@ -0,0 +1,356 @@
+"""
+Indexes over the Features of a genome, built once per object version
+and kept as derived data in the object cache.
+"""
+
+# Imports
+
+# Third-party
+import numpy as np
+
+# Functions and classes
+
+def _interval(start, length, strand):
+    """Closed interval [low, high] covered by a location or region, as
+    compared by `get_feature_ids`: [start, start + length] on the "+"
+    strand and [start - length, start] on the "-" strand.
+    """
+    if strand == "-":
+        return start - length, start
+    return start, start + length
+
+
+class RegionIndex(object):
+    """Interval index of Feature locations, for finding the Features that
+    overlap a set of regions.
+
+    Locations are grouped by contig and strand, and then by length class
+    (powers of 2). Within a group they are sorted by start, so a query
+    is a binary search per group plus a scan of the locations that
+    could overlap, which is O(log n + k) for k results.
+    """
+    def __init__(self, features):
+        """Build the index.
+
+        Args:
+          features: iterable of (key, locations), where key identifies the
+                    Feature and each location is a sequence of
+                    (contig_id, start, strand, length)
+        """
+        self.keys = []
+        groups = {}
+        for key, locations in features:
+            n = len(self.keys)
+            self.keys.append(key)
+            for loc in locations:
+                contig_id, start, strand, length = loc[:4]
+                if strand not in ("+", "-"):
+                    continue
+                low, high = _interval(start, length, strand)
+                group = (contig_id, strand, int(high - low).bit_length())
+                groups.setdefault(group, []).append((low, high, n))
+        # group -> (max length, lows, highs, key positions), by low
+        self._groups = {}
+        self._classes = {}
+        for group, entries in groups.iteritems():
+            entries.sort()
+            lows, highs, positions = [np.array(x, dtype=np.int64)
+                                      for x in zip(*entries)]
+            self._groups[group] = ((highs - lows).max(), lows, highs,
+                                   positions)
+            self._classes.setdefault(group[:2], []).append(group[2])
+
+    def query(self, regions):
+        """Find the Features with a location that overlaps any region on
+        the same contig and strand. Touching counts as overlapping.
+
+        Args:
+          regions: list of dict with "contig_id", "start", "strand" and
+                   "length", as for `get_feature_ids` region filters
+        Returns:
+          set of the keys of matching Features
+        """
+        found = []
+        for r in regions:
+            low, high = _interval(r["start"], r["length"], r["strand"])
+            for cls in self._classes.get((r["contig_id"], r["strand"]), []):
+                max_length, lows, highs, positions = \
+                    self._groups[(r["contig_id"], r["strand"], cls)]
+                first = np.searchsorted(lows, low - max_length, side='left')
+                last = np.searchsorted(lows, high, side='right')
+                hits = highs[first:last] >= low
+                found.append(positions[first:last][hits])
+        if not found:
+            return set()
+        return set(self.keys[i] for i in np.unique(np.concatenate(found)))
+
+
+class FunctionIndex(object):
+    """Trigram index of Feature functions, for finding the Features whose
+    function contains any of a set of strings.
+
+    Each distinct function is indexed once. A search intersects the
+    lists of functions holding every trigram of the string, then checks
+    the few that remain with ``str.find``, so results are exactly those
+    of a full scan.
+    """
+    #: Length of the indexed substrings
+    GRAM = 3
+
+    def __init__(self, features):
+        """Build the index.
+
+        Args:
+          features: iterable of (key, function), where function is None
+                    for a Feature without one
+        """
+        by_function = {}
+        for key, function in features:
+            if function is not None:
+                by_function.setdefault(function, []).append(key)
+        self.functions = by_function.keys()
+        self.keys = [by_function[f] for f in self.functions]
+        grams = {}
+        n = self.GRAM
+        for i, function in enumerate(self.functions):
+            for gram in set(function[j:j + n]
+                            for j in xrange(len(function) - n + 1)):
+                grams.setdefault(gram, []).append(i)
+        self._grams = {g: np.array(v, dtype=np.int32)
+                       for g, v in grams.iteritems()}
+
+    def _candidates(self, text):
+        """Positions of the functions that may contain `text`.
+        """
+        n = self.GRAM
+        if len(text) < n:
+            return xrange(len(self.functions))
+        postings = []
+        for gram in set(text[j:j + n] for j in xrange(len(text) - n + 1)):
+            if gram not in self._grams:
+                return []
+            postings.append(self._grams[gram])
+        postings.sort(key=len)
+        result = postings[0]
+        for p in postings[1:]:
+            result = np.intersect1d(result, p, assume_unique=True)
+            if result.size == 0:
+                break
+        return result
+
+    def query(self, substrings):
+        """Find the Features whose function contains any of the strings.
+
+        Args:
+          substrings: list of str
+        Returns:
+          set of the keys of matching Features
+        """
+        found = set()
+        for text in substrings:
+            for i in self._candidates(text):
+                if self.functions[i].find(text) >= 0:
+                    found.update(self.keys[i])
+        return found
+
+
+class AliasIndex(object):
+    """Map from alias to the Features that have it.
+    """
+    def __init__(self, features):
+        """Build the index.
+
+        Args:
+          features: iterable of (key, aliases), where aliases is a list
+                    (or a mapping keyed by alias), or None
+        """
+        self._aliases = {}
+        for key, aliases in features:
+            for alias in aliases or ():
+                self._aliases.setdefault(alias, []).append(key)
+
+    def query(self, aliases):
+        """Find the Features that have any of the aliases.
+
+        Args:
+          aliases: list of str
+        Returns:
+          set of the keys of matching Features
+        """
+        found = set()
+        for alias in aliases:
+            found.update(self._aliases.get(alias, ()))
+        return found
+
+
+class FeatureLookup(object):
+    """Compact form of the "feature_lookup" mapping of a GenomeAnnotation,
+    from Feature id to the Feature containers (and keys in them) that
+    hold the Feature.
+
+    Container references are stored once each. Feature ids are kept in
+    a sorted array, with the (container, key) entries of each id in
+    parallel arrays, so lookups are binary searches over the whole list
+    of ids at once. Keys are stored only when they differ from the ids.
+    """
+    def __init__(self, feature_lookup):
+        """Build the lookup.
+
+        Args:
+          feature_lookup (dict): Feature id to list of
+                                 [container reference, key]
+        """
+        ids = sorted(feature_lookup)
+        ref_index = {}
+        counts, containers, keys = [], [], []
+        same_keys = True
+        for x in ids:
+            refs = feature_lookup[x]
+            counts.append(len(refs))
+            for ref, key in refs:
+                containers.append(ref_index.setdefault(ref, len(ref_index)))
+                keys.append(key)
+                same_keys = same_keys and key == x
+        self.refs = tuple(sorted(ref_index, key=ref_index.get))
+        self._ids = np.array(ids) if ids else np.array([], dtype='U')
+        self._starts = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self._starts[1:])
+        self._containers = np.array(containers, dtype=np.int32)
+        self._keys = None if same_keys else np.array(keys)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def group(self, feature_ids):
+        """Group Feature ids by the container that holds them.
+
+        Args:
+          feature_ids (list): Feature ids
+        Returns:
+          dict of container reference to list of keys of the Features
+          in that container, in the order of `feature_ids`
+        Raises:
+          KeyError: if an id is not in the lookup
+        """
+        query = np.array(list(feature_ids))
+        if query.size == 0:
+            return {}
+        if query.dtype.kind != self._ids.dtype.kind:
+            query = query.astype(self._ids.dtype.kind)
+        if len(self._ids) == 0:
+            raise KeyError(query[0])
+        pos = np.searchsorted(self._ids, query)
+        pos[pos == len(self._ids)] = 0
+        missing = np.flatnonzero(self._ids[pos] != query)
+        if missing.size:
+            raise KeyError(query[missing[0]])
+        # all the entries of every id, in order
+        counts = self._starts[pos + 1] - self._starts[pos]
+        first = np.repeat(self._starts[pos] - np.cumsum(counts) + counts,
+                          counts)
+        entries = first + np.arange(counts.sum())
+        containers = self._containers[entries]
+        if self._keys is None:
+            keys = np.repeat(query, counts)
+        else:
+            keys = self._keys[entries]
+        order = np.argsort(containers, kind='mergesort')
+        bounds = np.flatnonzero(np.diff(containers[order])) + 1
+        result = {}
+        for part in np.split(order, bounds):
+            result[self.refs[containers[part[0]]]] = keys[part].tolist()
+        return result
+
+
+class RelationshipIndex(object):
+    """Links between the gene, mRNA and CDS Features of a genome, in both
+    directions, as recorded in the properties of each Feature.
+
+    For each kind of link, the source Features are kept in a sorted
+    array of keys, and the keys of the Features they link to in one
+    flat array with the offsets of each source (CSR form), so a query
+    for any number of Features is a single binary search.
+    """
+    #: (source type, target type) -> (properties field, field with the
+    #: link, whether the field holds a list of links)
+    LINKS = {
+        ("gene", "mRNA"): ("gene_properties", "children_mRNA", True),
+        ("gene", "CDS"): ("gene_properties", "children_CDS", True),
+        ("mRNA", "gene"): ("mRNA_properties", "parent_gene", False),
+        ("mRNA", "CDS"): ("mRNA_properties", "associated_CDS", False),
+        ("CDS", "gene"): ("CDS_properties", "parent_gene", False),
+        ("CDS", "mRNA"): ("CDS_properties", "associated_mRNA", False),
+    }
+
+    def __init__(self, features):
+        """Build the index.
+
+        Args:
+          features (dict): Feature type ("gene", "mRNA" or "CDS") to dict
+                           of Feature key to Feature, with at least
+                           "feature_id" and the properties fields. Each
+                           link is a [container reference, key] pair.
+        """
+        # type -> (sorted keys, feature ids in the same order)
+        self._sources = {}
+        # (source type, target type) -> (offsets, target keys)
+        self._links = {}
+        for source_type, by_key in features.iteritems():
+            keys = sorted(by_key)
+            ids = [by_key[k].get("feature_id", k) for k in keys]
+            self._sources[source_type] = (
+                np.array(keys) if keys else np.array([], dtype='U'),
+                None if ids == keys else ids)
+            for (source, target), (properties, field, many) in \
+                    self.LINKS.iteritems():
+                if source != source_type:
+                    continue
+                counts, targets = [], []
+                for k in keys:
+                    links = by_key[k].get(properties, {}).get(field)
+                    if links is None:
+                        links = []
+                    elif not many:
+                        links = [links]
+                    counts.append(len(links))
+                    targets.extend(link[1] for link in links)
+                starts = np.zeros(len(keys) + 1, dtype=np.int64)
+                np.cumsum(counts, out=starts[1:])
+                self._links[(source, target)] = (
+                    starts,
+                    np.array(targets) if targets else np.array([], dtype='U'))
+
+    def query(self, source, target, keys=None):
+        """Get the Features linked from some Features.
+
+        Args:
+          source (str): Type of the Features to start from
+          target (str): Type of the linked Features
+          keys (list): Keys of the Features to start from, or None for
+                       all of them; keys not in the index are left out
+        Returns:
+          dict of Feature id to list of the keys of the linked Features,
+          in the order they are recorded
+        """
+        if source not in self._sources:
+            return {}
+        all_keys, ids = self._sources[source]
+        starts, targets = self._links[(source, target)]
+        if keys is None:
+            pos = np.arange(len(all_keys))
+        else:
+            query = np.array(list(keys))
+            if query.size == 0 or all_keys.size == 0:
+                return {}
+            if query.dtype.kind != all_keys.dtype.kind:
+                query = query.astype(all_keys.dtype.kind)
+            pos = np.searchsorted(all_keys, query)
+            pos[pos == len(all_keys)] = 0
+            pos = pos[all_keys[pos] == query]
+        if ids is None:
+            names = all_keys[pos].tolist()
+        else:
+            names = [ids[p] for p in pos.tolist()]
+        first, last = starts[pos].tolist(), starts[pos + 1].tolist()
+        return dict((name, targets[i:j].tolist())
+                    for name, i, j in zip(names, first, last))
@@ -18,8 +18,9 @@ _log = logging.getLogger('.'.join([__name__, 'service']))
 class GenomeAnnotationClientConnection(service_core.BaseClientConnection):
     """Provides a client connection to the running GenomeAnnotation API service.
     """
-    def __init__(self, url="http://localhost:9103"):
-        service_core.BaseClientConnection.__init__(self, thrift_client, url)
+    def __init__(self, url="http://localhost:9103", timeout=None, key=None):
+        service_core.BaseClientConnection.__init__(self, thrift_client, url,
+                                                   timeout=timeout, key=key)
 
 
 class GenomeAnnotationService(service_core.BaseService):
@@ -213,6 +214,30 @@ class GenomeAnnotationService(service_core.BaseService):
 
         return output
 
+    @server_method
+    def get_gene_models(self, token=None, ref=None, gene_id_list=None, include_sequences=None):
+        ga_api = self._get_instance(token, ref)
+        result = ga_api.get_gene_models(gene_id_list, bool(include_sequences))
+
+        def model_feature(f):
+            return ttypes.Gene_model_feature(
+                feature_id=f["feature_id"],
+                feature_locations=[ttypes.Region(**x) for x in f["feature_locations"]],
+                feature_function=f["feature_function"],
+                feature_dna_sequence=f.get("feature_dna_sequence"))
+
+        output = {}
+        for gene_id in result:
+            model = result[gene_id]
+            output[gene_id] = ttypes.Gene_model(
+                gene=model_feature(model["gene"]),
+                mrnas=[ttypes.mRNA_model(mrna=model_feature(m["mrna"]),
+                                         cds=model_feature(m["cds"]) if m["cds"] is not None else None)
+                       for m in model["mrnas"]],
+                unassigned_cds=[model_feature(c) for c in model["unassigned_cds"]])
+
+        return output
+
     @server_method
     def get_mrna_utrs(self, token=None, ref=None, mrna_id_list=None):
         ga_api = self._get_instance(token, ref)
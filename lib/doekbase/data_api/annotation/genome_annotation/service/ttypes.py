@@ -1648,3 +1648,312 @@ class UTR_data:
 
   def __ne__(self, other):
     return not (self == other)
+
+class Gene_model_feature:
+  """
+  A Feature in a gene model.
+
+  Attributes:
+   - feature_id
+   - feature_locations
+   - feature_function
+   - feature_dna_sequence
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRING, 'feature_id', None, None, ), # 1
+    (2, TType.LIST, 'feature_locations', (TType.STRUCT,(Region, Region.thrift_spec)), None, ), # 2
+    (3, TType.STRING, 'feature_function', None, None, ), # 3
+    (4, TType.STRING, 'feature_dna_sequence', None, None, ), # 4
+  )
+
+  def __init__(self, feature_id=None, feature_locations=None, feature_function=None, feature_dna_sequence=None,):
+    self.feature_id = feature_id
+    self.feature_locations = feature_locations
+    self.feature_function = feature_function
+    self.feature_dna_sequence = feature_dna_sequence
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRING:
+          self.feature_id = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.LIST:
+          self.feature_locations = []
+          (_etype192, _size191) = iprot.readListBegin()
+          for _i193 in xrange(_size191):
+            _elem194 = Region()
+            _elem194.read(iprot)
+            self.feature_locations.append(_elem194)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      elif fid == 3:
+        if ftype == TType.STRING:
+          self.feature_function = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      elif fid == 4:
+        if ftype == TType.STRING:
+          self.feature_dna_sequence = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('Gene_model_feature')
+    if self.feature_id is not None:
+      oprot.writeFieldBegin('feature_id', TType.STRING, 1)
+      oprot.writeString(self.feature_id)
+      oprot.writeFieldEnd()
+    if self.feature_locations is not None:
+      oprot.writeFieldBegin('feature_locations', TType.LIST, 2)
+      oprot.writeListBegin(TType.STRUCT, len(self.feature_locations))
+      for iter195 in self.feature_locations:
+        iter195.write(oprot)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    if self.feature_function is not None:
+      oprot.writeFieldBegin('feature_function', TType.STRING, 3)
+      oprot.writeString(self.feature_function)
+      oprot.writeFieldEnd()
+    if self.feature_dna_sequence is not None:
+      oprot.writeFieldBegin('feature_dna_sequence', TType.STRING, 4)
+      oprot.writeString(self.feature_dna_sequence)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __hash__(self):
+    value = 17
+    value = (value * 31) ^ hash(self.feature_id)
+    value = (value * 31) ^ hash(self.feature_locations)
+    value = (value * 31) ^ hash(self.feature_function)
+    value = (value * 31) ^ hash(self.feature_dna_sequence)
+    return value
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class mRNA_model:
+  """
+  An mRNA in a gene model, with its CDS.
+
+  Attributes:
+   - mrna
+   - cds
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRUCT, 'mrna', (Gene_model_feature, Gene_model_feature.thrift_spec), None, ), # 1
+    (2, TType.STRUCT, 'cds', (Gene_model_feature, Gene_model_feature.thrift_spec), None, ), # 2
+  )
+
+  def __init__(self, mrna=None, cds=None,):
+    self.mrna = mrna
+    self.cds = cds
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRUCT:
+          self.mrna = Gene_model_feature()
+          self.mrna.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.STRUCT:
+          self.cds = Gene_model_feature()
+          self.cds.read(iprot)
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('mRNA_model')
+    if self.mrna is not None:
+      oprot.writeFieldBegin('mrna', TType.STRUCT, 1)
+      self.mrna.write(oprot)
+      oprot.writeFieldEnd()
+    if self.cds is not None:
+      oprot.writeFieldBegin('cds', TType.STRUCT, 2)
+      self.cds.write(oprot)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __hash__(self):
+    value = 17
+    value = (value * 31) ^ hash(self.mrna)
+    value = (value * 31) ^ hash(self.cds)
+    return value
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class Gene_model:
+  """
+  A gene with its mRNAs and their CDS.
+
+  Attributes:
+   - gene
+   - mrnas
+   - unassigned_cds
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRUCT, 'gene', (Gene_model_feature, Gene_model_feature.thrift_spec), None, ), # 1
+    (2, TType.LIST, 'mrnas', (TType.STRUCT,(mRNA_model, mRNA_model.thrift_spec)), None, ), # 2
+    (3, TType.LIST, 'unassigned_cds', (TType.STRUCT,(Gene_model_feature, Gene_model_feature.thrift_spec)), None, ), # 3
+  )
+
+  def __init__(self, gene=None, mrnas=None, unassigned_cds=None,):
+    self.gene = gene
+    self.mrnas = mrnas
+    self.unassigned_cds = unassigned_cds
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRUCT:
+          self.gene = Gene_model_feature()
+          self.gene.read(iprot)
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.LIST:
+          self.mrnas = []
+          (_etype197, _size196) = iprot.readListBegin()
+          for _i198 in xrange(_size196):
+            _elem199 = mRNA_model()
+            _elem199.read(iprot)
+            self.mrnas.append(_elem199)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      elif fid == 3:
+        if ftype == TType.LIST:
+          self.unassigned_cds = []
+          (_etype201, _size200) = iprot.readListBegin()
+          for _i202 in xrange(_size200):
+            _elem203 = Gene_model_feature()
+            _elem203.read(iprot)
+            self.unassigned_cds.append(_elem203)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('Gene_model')
+    if self.gene is not None:
+      oprot.writeFieldBegin('gene', TType.STRUCT, 1)
+      self.gene.write(oprot)
+      oprot.writeFieldEnd()
+    if self.mrnas is not None:
+      oprot.writeFieldBegin('mrnas', TType.LIST, 2)
+      oprot.writeListBegin(TType.STRUCT, len(self.mrnas))
+      for iter204 in self.mrnas:
+        iter204.write(oprot)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    if self.unassigned_cds is not None:
+      oprot.writeFieldBegin('unassigned_cds', TType.LIST, 3)
+      oprot.writeListBegin(TType.STRUCT, len(self.unassigned_cds))
+      for iter205 in self.unassigned_cds:
+        iter205.write(oprot)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __hash__(self):
+    value = 17
+    value = (value * 31) ^ hash(self.gene)
+    value = (value * 31) ^ hash(self.mrnas)
+    value = (value * 31) ^ hash(self.unassigned_cds)
+    return value
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
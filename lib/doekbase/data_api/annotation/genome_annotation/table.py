@@ -0,0 +1,228 @@
+"""
+Columnar view of the Features of a genome, for analysis with NumPy or
+pandas without building a dict per Feature.
+"""
+
+# Imports
+
+# stdlib
+from collections import OrderedDict
+
+# Third-party
+import numpy as np
+
+# Constants
+
+#: Columns of a FeatureTable, in order
+FEATURE_TABLE_FIELDS = ("feature_id", "type", "contig_id", "start", "length",
+                        "strand", "function", "md5")
+#: Columns stored as integer codes into a list of categories
+CATEGORICAL_FIELDS = ("type", "contig_id")
+#: Columns computed from the Feature locations
+LOCATION_FIELDS = ("contig_id", "start", "length", "strand")
+
+# Functions and classes
+
+def check_fields(fields):
+    """Check and complete a list of FeatureTable columns.
+
+    Args:
+      fields (list): Column names, or None for all of them
+    Returns:
+      tuple of column names, in table order, always with "feature_id"
+    Raises:
+      KeyError: for an unknown column name
+    """
+    if fields is None:
+        return FEATURE_TABLE_FIELDS
+    for f in fields:
+        if f not in FEATURE_TABLE_FIELDS:
+            raise KeyError("Invalid field {}, valid fields are {}".format(
+                f, list(FEATURE_TABLE_FIELDS)))
+    return tuple(f for f in FEATURE_TABLE_FIELDS
+                 if f == "feature_id" or f in fields)
+
+def _encode(values):
+    """Categorical codes (int32) and sorted categories of `values`.
+    """
+    if not values:
+        return np.zeros(0, dtype=np.int32), ()
+    categories, codes = np.unique(np.array(values, dtype=object),
+                                  return_inverse=True)
+    return codes.astype(np.int32), tuple(categories)
+
+def _spans(locations):
+    """Span of the locations of each Feature, on the contig and strand of
+    its first location, in the coordinates of the API: on "+" it covers
+    [start, start + length) and on "-" (start - length, start].
+
+    Args:
+      locations (list): Per Feature, a list of (contig_id, start, strand,
+                        length), possibly empty
+    Returns:
+      (contig ids, starts, lengths, strands); Features without locations
+      have a contig id of None, start and length 0 and strand ""
+    """
+    n = len(locations)
+    counts = np.array([len(locs) for locs in locations], dtype=np.int64)
+    flat = [loc for locs in locations for loc in locs]
+    contig_ids = [None] * n
+    strands = [""] * n
+    starts = np.zeros(n, dtype=np.int64)
+    lengths = np.zeros(n, dtype=np.int64)
+    has = np.flatnonzero(counts)
+    if not flat:
+        return contig_ids, starts, lengths, strands
+    first = np.concatenate([[0], np.cumsum(counts)[:-1]])[has]
+    for i, j in zip(has, first):
+        contig_ids[i], strands[i] = flat[j][0], flat[j][2]
+    # every location, with the Feature it belongs to
+    owner = np.repeat(np.arange(n), counts)
+    loc_start = np.array([loc[1] for loc in flat], dtype=np.int64)
+    loc_length = np.array([loc[3] for loc in flat], dtype=np.int64)
+    minus = np.array([loc[2] == "-" for loc in flat], dtype=bool)
+    same = np.array([loc[0] == contig_ids[i] and loc[2] == strands[i]
+                     for loc, i in zip(flat, owner)], dtype=bool)
+    low = np.where(minus, loc_start - loc_length + 1, loc_start)
+    high = np.where(minus, loc_start + 1, loc_start + loc_length)
+    # the first location always counts, so every group is non-empty
+    low, high, owner = low[same], high[same], owner[same]
+    bounds = np.flatnonzero(np.diff(owner)) + 1
+    bounds = np.concatenate([[0], bounds])
+    span_low = np.minimum.reduceat(low, bounds)
+    span_high = np.maximum.reduceat(high, bounds)
+    owners = owner[bounds]
+    is_minus = np.array([strands[i] == "-" for i in owners], dtype=bool)
+    starts[owners] = np.where(is_minus, span_high - 1, span_low)
+    lengths[owners] = span_high - span_low
+    return contig_ids, starts, lengths, strands
+
+
+class FeatureTable(object):
+    """Features of a genome as columns, one row per Feature.
+
+    Columns are NumPy arrays, in `columns` by name:
+
+    - feature_id: Feature identifiers (object)
+    - type: Feature type, as codes into `categories["type"]` (int32)
+    - contig_id: Contig, as codes into `categories["contig_id"]`, or -1
+      for a Feature without locations (int32)
+    - start, length: Span of the Feature locations on the contig and
+      strand of its first location, in the same coordinates as the
+      locations themselves (int64)
+    - strand: "+", "-", or "" without locations (object)
+    - function: Functional annotation, or "" (object)
+    - md5: MD5 of the uppercase DNA sequence, or "" (object)
+    """
+    def __init__(self, columns, categories):
+        """Create from columns.
+
+        Args:
+          columns (OrderedDict): Name to array, all of the same length
+          categories (dict): Name of categorical column to tuple of
+                             categories
+        """
+        self.columns = columns
+        self.categories = categories
+
+    @classmethod
+    def build(cls, fields, feature_ids, types=None, locations=None,
+              functions=None, md5s=None):
+        """Build a table from per-Feature values, in row order.
+
+        Args:
+          fields (tuple): Columns to include, from `check_fields`
+          feature_ids (list): Feature identifiers
+          types (list): Feature types, if "type" is in `fields`
+          locations (list): Lists of (contig_id, start, strand, length),
+                            if any location column is in `fields`
+          functions (list): Functions (or None), if "function" is in
+                            `fields`
+          md5s (list): MD5 strings (or None), if "md5" is in `fields`
+        Returns:
+          FeatureTable
+        """
+        columns, categories = OrderedDict(), {}
+        spans = None
+        if any(f in fields for f in LOCATION_FIELDS):
+            spans = _spans(locations)
+        for f in fields:
+            if f == "feature_id":
+                columns[f] = np.array(feature_ids, dtype=object)
+            elif f == "type":
+                columns[f], categories[f] = _encode(types)
+            elif f == "contig_id":
+                contig_ids = spans[0]
+                present = [i for i, c in enumerate(contig_ids) if c is not None]
+                codes, categories[f] = _encode([contig_ids[i] for i in present])
+                columns[f] = np.empty(len(contig_ids), dtype=np.int32)
+                columns[f].fill(-1)
+                columns[f][present] = codes
+            elif f == "start":
+                columns[f] = spans[1]
+            elif f == "length":
+                columns[f] = spans[2]
+            elif f == "strand":
+                columns[f] = np.array(spans[3], dtype=object)
+            elif f == "function":
+                columns[f] = np.array([x or "" for x in functions],
+                                      dtype=object)
+            elif f == "md5":
+                columns[f] = np.array([x or "" for x in md5s], dtype=object)
+        return cls(columns, categories)
+
+    def __len__(self):
+        return len(self.columns["feature_id"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def fields(self):
+        """Names of the columns, in order.
+        """
+        return tuple(self.columns)
+
+    def decode(self, name):
+        """Get a categorical column as its values, e.g. type names.
+
+        Args:
+          name (str): "type" or "contig_id"
+        Returns:
+          numpy object array, with None for code -1
+        """
+        values = np.array(self.categories[name] + (None,), dtype=object)
+        return values[self.columns[name]]
+
+    def select(self, rows):
+        """Get a table with some of the rows.
+
+        Args:
+          rows: Row indexes or a boolean mask
+        Returns:
+          FeatureTable, sharing the category lists
+        """
+        columns = OrderedDict((f, col[rows])
+                              for f, col in self.columns.iteritems())
+        return FeatureTable(columns, self.categories)
+
+    def to_dataframe(self):
+        """Convert to a pandas DataFrame, with categorical columns as
+        pandas Categoricals.
+
+        The column arrays are handed to pandas without copying where it
+        allows, so the frame may share memory with this table.
+
+        Returns:
+          pandas.DataFrame
+        """
+        import pandas as pd
+        data = OrderedDict()
+        for f, col in self.columns.iteritems():
+            if f in self.categories:
+                data[f] = pd.Categorical.from_codes(
+                    col, categories=list(self.categories[f]))
+            else:
+                data[f] = col
+        return pd.DataFrame(data, columns=list(data), copy=False)
+
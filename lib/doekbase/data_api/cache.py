@@ -9,16 +9,23 @@ __date__ = '9/26/15'
 ## Imports
 
 # System
+import collections
+import copy
 import hashlib
 import logging
 import os
+import threading
 import time
 import uuid
 # Third-party
 from dogpile.cache import make_region
+from dogpile.cache.api import NO_VALUE
 import redis
 # Local
-from doekbase.data_api.util import PerfCollector, get_logger
+from doekbase.data_api.util import PerfCollector, get_logger, \
+    extract_paths
+from doekbase.data_api.sequence.packed import pack_sequences, \
+    unpack_sequences
 
 _log = get_logger(__name__)
 
@@ -46,6 +53,11 @@ class NullCache(Cache):
         super(self.__class__, self).__init__()
         self.region = get_null_region()
 
+class MemoryCache(Cache):
+    def __init__(self, **kwargs):
+        super(self.__class__, self).__init__()
+        self.region = get_memory_region(**kwargs)
+
 def get_redis_region(redis_host='localhost', redis_port=6379):
     """Get a new redis cache 'region' object.
 
@@ -96,6 +108,214 @@ def get_null_region():
     """
     return make_region().configure('dogpile.cache.null')
 
+class ResponseCache(object):
+    """In-memory LRU cache of serialized service replies, bounded by
+    the total number of bytes held.
+
+    Values are byte strings (the encoded Thrift reply body). Methods
+    are individually enabled, so cheap calls don't push the expensive
+    ones out of the budget.
+    """
+    #: Default byte budget (256MB)
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, max_bytes=None, methods=None, per_token=False):
+        """Constructor.
+
+        Args:
+          max_bytes (int): Maximum total size of cached values, in bytes
+          methods (list): Names of methods whose replies may be cached.
+                          If None, all methods are enabled.
+          per_token (bool): If True, replies for non-public objects are
+                            cached under a key that includes the token.
+                            Otherwise only public objects are cached.
+        """
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        self.methods = None if methods is None else set(methods)
+        self.per_token = per_token
+        self._entries = collections.OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def is_enabled(self, method):
+        """Whether replies for `method` may be cached.
+        """
+        return self.methods is None or method in self.methods
+
+    def get(self, key):
+        """Get a cached value, or None, and mark it as recently used.
+        """
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries[key] = value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Add a value, evicting least-recently-used entries to stay
+        within the byte budget. Values larger than the whole budget
+        are not cached.
+        """
+        size = len(value)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= len(old)
+            while self._entries and self._nbytes + size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= len(evicted)
+                self.evictions += 1
+            self._entries[key] = value
+            self._nbytes += size
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(*parts):
+        """Build a fixed-size key from the string form of `parts`.
+        """
+        return hashlib.sha1('\x00'.join([str(p) for p in parts])).hexdigest()
+
+def get_memory_region(max_items=1000):
+    """Get a new in-process memory cache 'region' object, which holds
+    at most `max_items` values and drops the least-recently-used ones.
+
+    Args:
+        max_items (int): Maximum number of values in the cache
+    Returns:
+        An object, of type CacheRegion
+    """
+    region = make_region().configure(
+        'dogpile.cache.memory',
+        arguments={
+            'cache_dict': LRUDict(max_items)
+        }
+    )
+    return region
+
+class LRUDict(object):
+    """Thread-safe mapping that keeps at most `max_items` entries,
+    evicting the least-recently-used one first.
+    """
+    def __init__(self, max_items):
+        self.max_items = max_items
+        self._d = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._d.pop(key)
+            except KeyError:
+                return default
+            self._d[key] = value
+            return value
+
+    def __getitem__(self, key):
+        value = self.get(key, self)
+        if value is self:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._d.pop(key, None)
+            while len(self._d) >= self.max_items:
+                self._d.popitem(last=False)
+            self._d[key] = value
+
+    def pop(self, key, *default):
+        with self._lock:
+            return self._d.pop(key, *default)
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    def __contains__(self, key):
+        return key in self._d
+
+    def clear(self):
+        with self._lock:
+            self._d.clear()
+
+    def __len__(self):
+        return len(self._d)
+
+class MetadataCache(object):
+    """Small in-process cache of Workspace metadata (object info, type
+    translations, workspace permissions), with a time-to-live so that
+    changes on the server are picked up.
+    """
+    def __init__(self, ttl=300, max_items=100000):
+        """Constructor.
+
+        Args:
+          ttl (float): Seconds an entry stays valid
+          max_items (int): Maximum number of entries
+        """
+        self.ttl = ttl
+        self._d = LRUDict(max_items)
+
+    def get(self, key, default=None):
+        """Get value for `key`, or `default` if it is missing or expired.
+        """
+        entry = self._d.get(key)
+        if entry is not None and time.time() - entry[0] < self.ttl:
+            return entry[1]
+        return default
+
+    def put(self, key, value):
+        self._d[key] = (time.time(), value)
+
+    def get_or_create(self, key, creator):
+        """Get value for `key`, calling `creator()` if it is missing
+        or expired.
+        """
+        value = self.get(key, self)
+        if value is self:
+            value = creator()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self._d.clear()
+
+def _pack_entry(data):
+    """Make the cache entry for an object with its sequences packed: a
+    tuple of whether any sequence was packed, and the object.
+    """
+    packed = pack_sequences(data)
+    return packed is not data, packed
+
+def _unpack_entry(entry, packed, path_list=None):
+    """Get the object in a cache entry made by `_pack_entry`, or the
+    parts of it selected by `path_list`, decoding the sequences unless
+    `packed` is True.
+    """
+    has_packed, data = entry
+    if path_list is not None:
+        data = extract_paths(data, path_list)
+    if has_packed and not packed:
+        data = unpack_sequences(data)
+    return data
+
 class ObjectCache(object):
     """Caching for ObjectAPI.
 
@@ -110,6 +330,8 @@ class ObjectCache(object):
     # if those parameters are empty (None).
     cache_class = NullCache   #: Class for cache backend
     cache_params = {}         #: Constructor parameters for cache backend
+    l1_cache = None           #: Shared in-process `Cache` checked first
+    pack_sequences = False    #: Store sequences as `PackedSequence`
 
     def __init__(self, ref, stats=None, cache_class=None, cache_params=None, is_public=True):
         """Constructor.
@@ -122,6 +344,9 @@ class ObjectCache(object):
         """
         self._key = ref
         self._public = is_public
+        self._pack = self.pack_sequences
+        # keep packed and plain copies of an object apart
+        self._data_key = ref + '::packed' if self._pack else ref
         # init performance statistics
         self._stats = stats or PerfCollector(self.__class__.__name__)
         self._stats.start_event('cache.init', self._key)
@@ -129,6 +354,7 @@ class ObjectCache(object):
         cc = cache_class or self.cache_class
         cp = cache_params or self.cache_params
         self._cache = cc(**cp)  # workers of the world unite!
+        self._l1 = self.l1_cache
         self._stats.end_event('cache.init', self._key)
         _log.debug('ObjectCache.init.end cache_class={}'.format(
             cc.__name__))
@@ -136,21 +362,32 @@ class ObjectCache(object):
     def get_derived_data(self, parent_method, name):
         key = self._key + '::' + name  # store separately from 'raw' data
         self._stats.start_event('cache.get_derived_data', key)
-        data = self._cache.get_or_create(key, parent_method,
-                                         should_cache_fn=self._should_cache)
+        data = self._get_or_create(key, parent_method,
+                                   should_cache_fn=self._should_cache)
         self._stats.end_event('cache.get_derived_data', key)
         return data
 
-    def get_data(self, parent_method):
+    def get_data(self, parent_method, packed=False):
         """Get data from cache or the callee's method.
+
+        If `pack_sequences` is set, long sequences are cached as
+        :class:`doekbase.data_api.sequence.packed.PackedSequence`, and
+        decoded here unless `packed` is True.
         """
         self._stats.start_event('cache.get_data', self._key)
-        data = self._cache.get_or_create(self._key, parent_method)
+        if self._pack:
+            creator = lambda: _pack_entry(parent_method())
+            entry = self._get_or_create(self._data_key, creator)
+            data = _unpack_entry(entry, packed)
+        else:
+            data = self._get_or_create(self._key, parent_method)
         self._stats.end_event('cache.get_data', self._key)
         return data
 
-    def get_data_subset(self, parent_method, path_list=None):
+    def get_data_subset(self, parent_method, path_list=None, packed=False):
         """Get data subset from cache or the callee's method.
+
+        Sequences are packed as for `get_data`.
         """
         self._stats.start_event('cache.get_data_subset', self._key)
         # save a little time for a no-op
@@ -158,12 +395,32 @@ class ObjectCache(object):
             self._stats.end_event('cache.get_data_subset', self._key,
                                   msg='empty-path-list')
             return {}
+        # cut the subset from the whole object, if it is in memory
+        if self._l1 is not None:
+            data = self._l1.get(self._data_key)
+            if data is not NO_VALUE:
+                if self._pack:
+                    data = _unpack_entry(data, packed, path_list=path_list)
+                else:
+                    data = extract_paths(data, path_list)
+                # the subset holds parts of the shared object; copy them
+                # so that a caller changing its result cannot change the
+                # object seen by the other services
+                data = copy.deepcopy(data)
+                self._stats.end_event('cache.get_data_subset', self._key,
+                                      msg='from-full-object')
+                return data
         # create unique key for object + path
-        key = '{}:{}'.format(self._key, self.path_hash(path_list))
+        key = '{}:{}'.format(self._data_key, self.path_hash(path_list))
         # creator function, currying path_list arg.
         creator = lambda : parent_method(path_list=path_list)
         # get from cache, or create
-        data = self.cache_get_or_create(key, creator)
+        if self._pack:
+            entry = self.cache_get_or_create(key,
+                                             lambda: _pack_entry(creator()))
+            data = _unpack_entry(entry, packed)
+        else:
+            data = self.cache_get_or_create(key, creator)
         self._stats.end_event('cache.get_data_subset', self._key)
         return data
 
@@ -184,7 +441,7 @@ class ObjectCache(object):
         data, total_sleep = None, 0
         while data is None and total_sleep < self.MAX_FETCH_TIMEOUT:
             try:
-                data = self._cache.get_or_create(key, creator, **kw)
+                data = self._get_or_create(key, creator, **kw)
             except redis.BusyLoadingError:
                 _log.warn('Redis is busy, sleep for 0.1s and try again')
                 time.sleep(0.1)
@@ -194,6 +451,15 @@ class ObjectCache(object):
                                .format(key))
         return data
 
+    def _get_or_create(self, key, creator, **kw):
+        """Get from the shared L1 cache, if any, then the backend.
+        """
+        if self._l1 is None:
+            return self._cache.get_or_create(key, creator, **kw)
+        backend = lambda: self._cache.get_or_create(key, creator, **kw)
+        return self._l1.get_or_create(key, backend,
+                                      should_cache_fn=self._should_cache)
+
     def _should_cache(self, data):
         """Whether this data should be cached, or fetched new every time.
 
@@ -218,51 +484,3 @@ class ObjectCache(object):
 
 
 
-    # @staticmethod
-    # def extract_paths(data, path_list):
-    #     """Extract all matching paths from `path_list` that
-    #     are found in `data`.
-    #
-    #     Note: Not used right now, since all retrievals of data by
-    #     subset use the full path as the key (thus caching the exact
-    #     subset of data, and not needing to subset the object manually)
-    #
-    #     Args:
-    #        data (dict): Source data
-    #        path_list (list): List of path strings, which use a '/'
-    #                          separator between items of the path.
-    #     Return:
-    #        (dict) All data subsets matching the paths
-    #     """
-    #     result = {}
-    #     # Extract data for each path in path_list
-    #     for p in path_list:
-    #         extracted = {}  # create extracted path
-    #         cur_ex = extracted  # current position in extracted path
-    #         path = p.split('/')  # split path into its parts
-    #         # Traverse nodes matching path in `data`, building the
-    #         # nested dict in `extracted` as we go. Stop on missing nodes.
-    #         cur_data, had_path = data, True
-    #         # Loop over all (internal) nodes in the path
-    #         for node in path[:-1]:
-    #             # If the current node is not found, or it is a leaf,
-    #             # then this path is not in the data: stop.
-    #             if not node in cur_data or \
-    #                     not isinstance(cur_data[node], dict):
-    #                 had_path = False
-    #                 break
-    #             cur_ex[node] = {}  # create nested dict
-    #             cur_ex = cur_ex[node]  # descend in extracted path
-    #             cur_data = cur_data[node]  # descend in data
-    #         # Done with nodes, now let's look for the leaf
-    #         leaf = path[-1]
-    #         # If the full path was not in data, go to next path
-    #         if not had_path or not leaf in cur_data:
-    #             continue
-    #         cur_ex[leaf] = cur_data[leaf]  # copy leaf to extracted path
-    #         result.update(extracted)  # add extracted path to result
-    #         print("@@ update result with {}: NEW VALUE = {}".format(extracted,
-    #                                                                 result))
-    #         # Repeat this process with the next path
-    #     print("@@ return result: {}".format(result))
-    #     return result
@@ -6,16 +6,23 @@ Module for base class for Data API objects.
 
 # Stdlib
 from collections import namedtuple
+import hashlib
+import json
 import logging
 import os
+import random
 import re
 try:
     import cStringIO as StringIO
 except ImportError:
     import StringIO as StringIO
+# Third-party
+import requests
 # Local
-from doekbase.data_api.util import get_logger, log_start, log_end
-from doekbase.workspace.client import Workspace
+from doekbase.data_api.util import get_logger, log_start, log_end, \
+    check_deadline, is_versioned_ref
+from doekbase.workspace.client import Workspace, ServerError, \
+    _JSONObjectEncoder
 from doekbase.data_api.wsfile import WorkspaceFile
 from doekbase.data_api import cache
 from doekbase.data_api.util import PerfCollector, collect_performance
@@ -65,6 +72,54 @@ def get_token():
         raise Exception(
             "Missing authentication token!  Set KB_AUTH_TOKEN environment variable.")
 
+def get_ws_session(pool_size=32):
+    """Create a requests Session whose connection pool can be shared by
+    all the Workspace clients of a process (see `ObjectAPI.ws_session`).
+
+    Args:
+      pool_size (int): Maximum number of kept-alive connections per host
+    Returns:
+      requests.Session
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size,
+                                            pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+class SessionWorkspace(Workspace):
+    """Workspace client that sends its calls through a shared
+    `requests.Session`, so connections are kept alive and re-used.
+    """
+    def __init__(self, url=None, session=None, **kwargs):
+        Workspace.__init__(self, url=url, **kwargs)
+        self._session = session or get_ws_session()
+
+    def _call(self, method, params):
+        arg_hash = {'method': method,
+                    'params': params,
+                    'version': '1.1',
+                    'id': str(random.random())[2:]
+                    }
+        body = json.dumps(arg_hash, cls=_JSONObjectEncoder)
+        ret = self._session.post(self.url, data=body, headers=self._headers,
+                                 timeout=self.timeout,
+                                 verify=not self.trust_all_ssl_certificates)
+        if ret.status_code == requests.codes.server_error:
+            if ret.headers.get('content-type') == 'application/json':
+                err = json.loads(ret.text)
+                if 'error' in err:
+                    raise ServerError(**err['error'])
+                raise ServerError('Unknown', 0, ret.text)
+            raise ServerError('Unknown', 0, ret.text)
+        if ret.status_code != requests.codes.OK:
+            ret.raise_for_status()
+        resp = json.loads(ret.text)
+        if 'result' not in resp:
+            raise ServerError('Unknown', 0, 'An unknown server error occurred')
+        return resp['result']
+
 class ObjectAPI(object):
     """
     Generic Object API for basic properties and actions
@@ -79,6 +134,11 @@ class ObjectAPI(object):
     you should consider wrapping those calls in a higher-level method that is
     specific to the kind of data you want. 
     """
+    # You can set these at the class level to share them between all
+    # the objects in a process, e.g. when several services run together.
+    metadata_cache = None  #: `cache.MetadataCache` for Workspace metadata
+    ws_session = None      #: `requests.Session` for Workspace connections
+
     def __init__(self, services=None, token=None, ref=None):
         """Create new object.
  
@@ -118,16 +178,29 @@ class ObjectAPI(object):
                 self._token = token
 
             _log.debug('Connect to Workspace service at {}'.format(ws_url))
-            self.ws_client = Workspace(ws_url, token=self._token)
+            if self.ws_session is None:
+                self.ws_client = Workspace(ws_url, token=self._token)
+            else:
+                self.ws_client = SessionWorkspace(ws_url,
+                                                  session=self.ws_session,
+                                                  token=self._token)
         else:
             _log.debug('Load from Workspace file at {}'.format(ws_url))
             local_workspace = True
             self.ws_client = self._init_ws_from_files(ws_url)
 
-        info_values = self.ws_client.get_object_info_new({
+        check_deadline('workspace.get_object_info')
+        get_info = lambda: self.ws_client.get_object_info_new({
             "objects": [{"ref": self.ref}],
             "includeMetadata": 0,
             "ignoreErrors": 0})
+        if is_versioned_ref(self.ref):
+            info_values = self._get_metadata(
+                ('info', hashlib.sha1(self._token or '').hexdigest(), self.ref),
+                get_info)
+        else:
+            # the latest version may change at any time
+            info_values = get_info()
         if not info_values:
             raise ValueError("Cannot find object: {}".format(self.ref))
         oi = info_values[0]
@@ -149,8 +222,10 @@ class ObjectAPI(object):
         }
         self._id = self._info["object_id"]
         self._name = self._info["object_name"]
-        self._typestring = self.ws_client.translate_to_MD5_types(
-            [self._info["type_string"]]).values()[0]
+        self._typestring = self._get_metadata(
+            ('md5_type', self._info["type_string"]),
+            lambda: self.ws_client.translate_to_MD5_types(
+                [self._info["type_string"]]).values()[0])
         self._version = str(self._info["version"])
         self._schema = None
         self._history = None
@@ -163,10 +238,13 @@ class ObjectAPI(object):
         if local_workspace:
             global_read = True  # Local file-workspace objects are public
         else:
-            wsinfo = self.ws_client.get_workspace_info({
-                'id': self._info['workspace_id']})
+            wsinfo = self._get_metadata(
+                ('workspace_info', self._info['workspace_id']),
+                lambda: self.ws_client.get_workspace_info({
+                    'id': self._info['workspace_id']}))
             wsinfo_obj = WorkspaceInfo(*wsinfo)
             global_read = (wsinfo_obj.globalread == 'r')
+        self._public = global_read
         self._cache = cache.ObjectCache(
             self._info["object_reference_versioned"],
             is_public=global_read)
@@ -174,6 +252,14 @@ class ObjectAPI(object):
         # TODO always use a versioned reference to the data object
         #self.ref = self._info["object_reference_versioned"]
 
+    def _get_metadata(self, key, creator):
+        """Get Workspace metadata through the shared metadata cache,
+        if there is one.
+        """
+        if self.metadata_cache is None:
+            return creator()
+        return self.metadata_cache.get_or_create(key, creator)
+
     @property
     def stats(self):
         return self._stats
@@ -182,6 +268,11 @@ class ObjectAPI(object):
     def cache_stats(self):
         return self._cache.stats
 
+    @property
+    def is_public(self):
+        """Whether the object is in a globally readable workspace."""
+        return self._public
+
     def _init_ws_from_files(self, path):
         ext = '.msgpack'
         extlen = len(ext)
@@ -395,7 +486,15 @@ class ObjectAPI(object):
         
         return self._cache.get_data(self._get_data_ws)
 
+    def _get_packed_data(self):
+        """Like `get_data`, but long sequences are left packed if the
+        cache packs them (see `cache.ObjectCache.pack_sequences`), and
+        decode only when read.
+        """
+        return self._cache.get_data(self._get_data_ws, packed=True)
+
     def _get_data_ws(self):
+        check_deadline('workspace.get_objects')
         return self.ws_client.get_objects([{"ref": self.ref}])[0]["data"]
 
     @collect_performance(g_stats)
@@ -406,7 +505,9 @@ class ObjectAPI(object):
         Args:
           path_list (list): List of paths, each a string of node names
                             separated by forward slashes, e.g.
-                            ['a/bee/sea', 'd/ee/eph/gee']
+                            ['a/bee/sea', 'd/ee/eph/gee']. A node
+                            name of '[*]' matches every list element and
+                            '*' every mapping key, e.g. 'contigs/[*]/id'.
         Returns:
           dict (contents according to object type and data requested)"""
 
@@ -414,6 +515,7 @@ class ObjectAPI(object):
                                            path_list=path_list)
 
     def _get_data_subset_ws(self, path_list=None):
+        check_deadline('workspace.get_object_subset')
         return self.ws_client.get_object_subset([{"ref": self.ref, 
                         "included": path_list}])[0]["data"]
 
@@ -8,6 +8,14 @@ class ServiceError(Exception):
     def __str__(self):
         return repr(self.value)
 
+class DeadlineExceededError(ServiceError):
+    """The caller's deadline passed before the request was done.
+    `stage` names the point at which the work was abandoned.
+    """
+    def __init__(self, value, stage=None):
+        ServiceError.__init__(self, value)
+        self.stage = stage
+
 class AuthorizationError(Exception):
     def __init__(self, value):
         self.value = value
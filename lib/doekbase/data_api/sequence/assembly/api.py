@@ -7,33 +7,198 @@ and the underlying contigs (GC content, length).
 # Stdlib
 import abc
 import itertools
-import requests
 import re
 import collections
 import string
 import hashlib
-try:
-    import cStringIO as StringIO
-except ImportError:
-    import StringIO as StringIO
+
+# Third-party
+import numpy as np
 
 # Local
+from doekbase.data_api.cache import LRUDict
 from doekbase.data_api.core import ObjectAPI
 from doekbase.data_api.util import get_logger, logged, PerfCollector, collect_performance
 from doekbase.data_api import exceptions
+from doekbase.data_api import shock
+from doekbase.data_api.sequence.packed import PackedSequence
 from doekbase.data_api.taxonomy.taxon.service import ttypes
-from doekbase.handle.Client import AbstractHandle as handleClient
 
 _log = get_logger(__file__)
 
-CHUNK_SIZE = 2**30
-
 _CONTIGSET_TYPES = ['KBaseGenomes.ContigSet']
 _ASSEMBLY_TYPES = ['KBaseGenomeAnnotations.Assembly']
 TYPES = _CONTIGSET_TYPES + _ASSEMBLY_TYPES
 
 g_stats = PerfCollector('AssemblyAPI')
 
+_COMPLEMENT = string.maketrans('ACGTURYKMBVDHNacgturykmbvdhn',
+                               'TGCAAYRMKVBHDNtgcaayrmkvbhdn')
+
+def _as_bytes(sequence):
+    """Sequences decoded from JSON are unicode, and cached ones may be
+    packed; use plain bytes.
+    """
+    if isinstance(sequence, unicode):
+        return sequence.encode('ascii', 'replace')
+    if isinstance(sequence, PackedSequence):
+        return sequence.decode()
+    return sequence
+
+def reverse_complement(sequence):
+    """Reverse complement of a DNA sequence, with IUPAC ambiguity codes.
+    """
+    return _as_bytes(sequence).translate(_COMPLEMENT)[::-1]
+
+def base_counts(sequence):
+    """Count each byte value of a sequence in a single pass.
+
+    Returns:
+      numpy.ndarray: 256 counts, indexed by byte value, e.g.
+      ``counts[ord('G')]``
+    """
+    data = np.frombuffer(_as_bytes(sequence), dtype=np.uint8)
+    return np.bincount(data, minlength=256)
+
+_GC = [ord(x) for x in 'GCgc']
+_N = [ord(x) for x in 'Nn']
+_ACGT = [ord(x) for x in 'ACGTacgt']
+
+def assembly_metrics(lengths, ambiguous_bases):
+    """Compute quality metrics of an assembly from its contig lengths.
+
+    Args:
+      lengths: Length of each contig
+      ambiguous_bases (int): Number of bases other than A, C, G or T
+    Returns:
+      dict: as for :meth:`AssemblyInterface.get_assembly_metrics`
+    """
+    lengths = np.sort(np.asarray(lengths, dtype=np.int64))[::-1]
+    total = int(lengths.sum())
+    cumulative = np.cumsum(lengths)
+
+    def nx(fraction):
+        # length of the contig that takes the running total past
+        # `fraction` of the whole, and the number of contigs so far
+        if total == 0:
+            return 0, 0
+        i = int(np.searchsorted(cumulative, fraction * total))
+        return int(lengths[i]), i + 1
+
+    n50, l50 = nx(0.5)
+    n90, l90 = nx(0.9)
+    longest = int(lengths[0]) if len(lengths) else 0
+    shortest = int(lengths[-1]) if len(lengths) else 0
+    # one bin per power of 10
+    num_bins = len(str(max(longest, 1)))
+    edges = 10 ** np.arange(num_bins + 1, dtype=np.int64)
+    counts, _ = np.histogram(np.maximum(lengths, 1), bins=edges)
+    return {"num_contigs": len(lengths),
+            "dna_size": total,
+            "n50": n50, "l50": l50,
+            "n90": n90, "l90": l90,
+            "longest_contig": longest,
+            "shortest_contig": shortest,
+            "ambiguous_bases": int(ambiguous_bases),
+            "histogram_bin_edges": [int(x) for x in edges],
+            "histogram_counts": [int(x) for x in counts]}
+
+def _region_bounds(region, contig_length):
+    """Get the 0-based [begin, end) of a region on a contig.
+
+    Args:
+      region: dict with "start", "length" and "strand", as for
+              :meth:`AssemblyInterface.get_contig_subsequences`
+      contig_length: Length of the contig
+    Raises:
+      ValueError: if the strand is invalid or the region is not
+                  entirely within the contig
+    """
+    start, length, strand = region["start"], region["length"], region["strand"]
+    if strand == "+":
+        begin = start - 1
+    elif strand == "-":
+        begin = start - length
+    else:
+        raise ValueError('Invalid strand "{}" for contig "{}"'.format(
+            strand, region["contig_id"]))
+    if length < 0 or begin < 0 or begin + length > contig_length:
+        raise ValueError('Region start={:d} length={:d} strand={} is outside '
+                         'contig "{}" of length {:d}'.format(
+                             start, length, strand, region["contig_id"],
+                             contig_length))
+    return begin, begin + length
+
+def write_fasta(fileobj, records, line_width=60):
+    """Write FASTA records, wrapping the sequences to a fixed width.
+
+    Each sequence may come in any number of pieces, of any size, and is
+    written as it comes, so a whole sequence is never held in memory.
+
+    Args:
+      fileobj: Output file
+      records: iterable of (header, piece, is_last), where header is the
+               header line without the '>', piece is part of the sequence
+               and is_last is True for the final piece of a record.
+      line_width: Number of bases on each line
+    Returns:
+      int: number of records written
+    Raises:
+      ValueError: if line_width is not positive
+    """
+    if line_width <= 0:
+        raise ValueError("Invalid line width {:d}".format(line_width))
+    count, pending, in_record = 0, '', False
+    for header, piece, is_last in records:
+        if not in_record:
+            fileobj.write('>' + header + '\n')
+            in_record = True
+        pending += piece
+        full = len(pending) - len(pending) % line_width
+        if full > 0:
+            fileobj.write('\n'.join(pending[i:i + line_width]
+                                    for i in xrange(0, full, line_width)))
+            fileobj.write('\n')
+            pending = pending[full:]
+        if is_last:
+            if pending:
+                fileobj.write(pending + '\n')
+            count, pending, in_record = count + 1, '', False
+    return count
+
+def _fasta_header(contig_id, description=None):
+    if description:
+        return _as_bytes(u'{} {}'.format(contig_id, description))
+    return _as_bytes(contig_id)
+
+def _unique(ids):
+    """Items of `ids` without repeats, in the order first seen.
+    """
+    seen = set()
+    return [x for x in ids if not (x in seen or seen.add(x))]
+
+def _ascending_runs(regions):
+    """Split regions, as (key, start, num_bytes), into the fewest runs of
+    consecutive regions whose starts increase, so each run can be read
+    in one pass over the file. Regions already in file order are a
+    single run.
+    """
+    runs = []
+    for r in regions:
+        if runs and r[1] > runs[-1][-1][1]:
+            runs[-1].append(r)
+        else:
+            runs.append([r])
+    return runs
+
+def _iter_pieces(header, sequence):
+    """Split an in-memory sequence into records for :func:`write_fasta`,
+    decoding one piece at a time.
+    """
+    size = shock.STREAM_CHUNK_SIZE
+    for i in xrange(0, max(len(sequence), 1), size):
+        yield header, _as_bytes(sequence[i:i + size]), i + size >= len(sequence)
+
 class AssemblyInterface(object):
     """API for a genome Assembly associated with a Genome Annotation.
     """
@@ -83,6 +248,34 @@ class AssemblyInterface(object):
         """
         pass
 
+    @abc.abstractmethod
+    def get_assembly_metrics(self):
+        """Retrieve quality metrics for this Assembly.
+
+        Returns:
+          dict: Metrics, with the following key/value pairs:
+
+          num_contigs : int
+            number of contigs
+          dna_size : int
+            total length of all contigs
+          n50, n90 : int
+            length of the contig that brings the total length of the
+            longest contigs, longest first, to 50% or 90% of dna_size
+          l50, l90 : int
+            number of contigs needed to reach 50% or 90% of dna_size
+          longest_contig, shortest_contig : int
+            length of the longest and shortest contig
+          ambiguous_bases : int
+            number of bases other than A, C, G or T
+          histogram_bin_edges : list<int>
+            edges of the bins of contig lengths, at powers of 10;
+            bin i is [edges[i], edges[i + 1])
+          histogram_counts : list<int>
+            number of contigs in each bin
+        """
+        pass
+
     @abc.abstractmethod    
     def get_number_contigs(self):
         """Retrieve the number of contig sequences in this Assembly.
@@ -134,7 +327,8 @@ class AssemblyInterface(object):
         """Retrieve the ids for every contig sequence in this Assembly.
         
         Returns:
-          list<str>: Contig identifiers
+          list<str>: Contig identifiers, in the order the contigs are
+          stored in the Assembly
         """
         pass
 
@@ -167,6 +361,56 @@ class AssemblyInterface(object):
         """
         pass
 
+    @abc.abstractmethod
+    def get_contig_subsequences(self, region_list):
+        """Retrieve parts of contig sequences from this Assembly.
+
+        Args:
+          region_list: list<dict> of regions, each with the keys
+            "contig_id" (str), "start" (int), "length" (int) and
+            "strand" ("+" or "-"), as for Feature locations:
+            [start, start + length) for "+" strand and
+            (start - length, start] for "-" strand, where the first
+            base of a contig is at position 1.
+        Returns:
+          list<str>: sequence of each region, in the same order as
+          region_list. Regions on the "-" strand are reverse complemented.
+        """
+        pass
+
+    @abc.abstractmethod
+    def iter_contigs(self, contig_id_list=None):
+        """Iterate over contig sequences from this Assembly, without
+        holding them all in memory at once.
+
+        Args:
+          contig_id_list: list<str>, or None for all contigs
+        Returns:
+          iterator over (contig_id, contig) pairs, where contig is a dict
+          as for the values returned by :meth:`get_contigs`, in the order
+          of contig_id_list (repeats skipped), or of :meth:`get_contig_ids`
+          if it is None.
+        """
+        pass
+
+    @abc.abstractmethod
+    def export_fasta(self, fileobj, contig_id_list=None, line_width=60):
+        """Write contig sequences from this Assembly as FASTA, without
+        holding the whole Assembly, or any one contig, in memory.
+
+        Args:
+          fileobj: Output file
+          contig_id_list: list<str>, or None for all contigs
+          line_width: int, number of bases on each line
+        Returns:
+          int: number of contigs written
+        Raises:
+          ValueError: if a contig is not in this Assembly
+
+        Records are written in the same order as :meth:`iter_contigs`.
+        """
+        pass
+
 
 class AssemblyAPI(ObjectAPI, AssemblyInterface):
     def __init__(self, services, token, ref):
@@ -197,6 +441,9 @@ class AssemblyAPI(ObjectAPI, AssemblyInterface):
     def get_stats(self):
         return self.proxy.get_stats()
 
+    def get_assembly_metrics(self):
+        return self.proxy.get_assembly_metrics()
+
     def get_number_contigs(self):
         return self.proxy.get_number_contigs()
 
@@ -218,6 +465,15 @@ class AssemblyAPI(ObjectAPI, AssemblyInterface):
     def get_contigs(self, contig_id_list=None):
         return self.proxy.get_contigs(contig_id_list)
 
+    def get_contig_subsequences(self, region_list):
+        return self.proxy.get_contig_subsequences(region_list)
+
+    def iter_contigs(self, contig_id_list=None):
+        return self.proxy.iter_contigs(contig_id_list)
+
+    def export_fasta(self, fileobj, contig_id_list=None, line_width=60):
+        return self.proxy.export_fasta(fileobj, contig_id_list, line_width)
+
 
 class _KBaseGenomes_ContigSet(ObjectAPI, AssemblyInterface):
     def __init__(self, services, token, ref):
@@ -259,131 +515,189 @@ class _KBaseGenomes_ContigSet(ObjectAPI, AssemblyInterface):
         return output
 
     def get_stats(self):
-        contigs = self.get_data()["contigs"]
-
-        total_gc = 0
-        for i, c in enumerate(contigs):
-            total_gc += self._sequence_gc(i, c["sequence"])
-        
-        total_length = 0
-        
-        for x in contigs:
-            if "length" in x:
-                total_length += x["length"]
-            else:
-                total_length += len(x["sequence"])
+        stats = self._get_contig_stats()
+        total_length = int(stats["lengths"].sum())
 
         data = {}
-        data["gc_content"] = total_gc/(total_length*1.0)
+        data["gc_content"] = float(stats["gc_counts"].sum()) / total_length
         data["dna_size"] = total_length
-        data["num_contigs"] = len(contigs)            
-        
+        data["num_contigs"] = len(stats["contig_ids"])
+
         return data
 
-    def get_number_contigs(self):
-        return len(self.get_data()["contigs"])
+    def get_assembly_metrics(self):
+        return self._cache.get_derived_data(self._calc_assembly_metrics,
+                                            'assembly-metrics')
 
-    def get_gc_content(self):
-        contigs = self.get_data()["contigs"]
+    def _calc_assembly_metrics(self):
+        stats = self._get_contig_stats()
+        return assembly_metrics(stats["lengths"],
+                                stats["ambiguous_counts"].sum())
 
-        total_gc = 0
-        total_length = 0
-        for i, c in enumerate(contigs):
-            if "length" in c:
-                total_length += c["length"]
-            else:
-                total_length += len(c["sequence"])
+    def get_number_contigs(self):
+        return len(self.get_data_subset(["contigs/[*]/id"])["contigs"])
 
-            total_gc += self._sequence_gc(i, c["sequence"])
-        
-        return total_gc/(total_length*1.0)
+    def get_gc_content(self):
+        stats = self._get_contig_stats()
+        return float(stats["gc_counts"].sum()) / stats["lengths"].sum()
 
     def get_dna_size(self):
-        contigs = self.get_data()["contigs"]
-        return sum([c["length"] for c in contigs])
+        return sum(self._get_contig_length_table()["lengths"])
 
     def get_contig_lengths(self, contig_id_list=None):
-        contigs = self.get_data()["contigs"]        
-        
-        if contig_id_list is None:        
-            contig_id_list = [c["id"] for c in contigs]
+        table = self._get_contig_length_table()
+        return {c: table["lengths"][i]
+                for c, i in self._contig_indexes(table, contig_id_list)}
 
-        contig_lengths = {}
-        for c in contigs:
-            if c["id"] in contig_id_list:
-                if "length" in c:
-                    contig_lengths[c["id"]] = c["length"]
-                else:
-                    contig_lengths[c["id"]] = len(c["sequence"])
-        
-        return contig_lengths
-        
     def get_contig_gc_content(self, contig_id_list=None):
-        contigs = self.get_data()["contigs"]
-        
-        contigs_gc = {}
-        
-        if contig_id_list is None:
-            contig_id_list = [c["id"] for c in contigs]
-                    
-        for i, c in enumerate(contigs):
-            if c["id"] in contig_id_list:
-                if "length" in c:
-                    length = c["length"]
-                else:
-                    length = len(c["sequence"])
-
-                contigs_gc[c["id"]] = (1. * self._sequence_gc(i, c['sequence'])
-                                       / length)
-        
-        return contigs_gc
+        stats = self._get_contig_stats()
+        return {c: float(stats["gc_counts"][i]) / stats["lengths"][i]
+                for c, i in self._contig_indexes(stats, contig_id_list)}
+
+    @staticmethod
+    def _contig_indexes(stats, contig_id_list):
+        """Get (contig id, index) of the contigs in the list, or of all
+        contigs if the list is None.
+        """
+        wanted = None if contig_id_list is None else set(contig_id_list)
+        return [(c, i) for i, c in enumerate(stats["contig_ids"])
+                if wanted is None or c in wanted]
 
     def get_contig_ids(self):
-        contigs = self.get_data()["contigs"]
+        contigs = self.get_data_subset(["contigs/[*]/id"])["contigs"]
         return [c["id"] for c in contigs]
 
     @collect_performance(g_stats, prefix='old.')
     def get_contigs(self, contig_id_list=None):
-        contigs = {}
+        return dict(self.iter_contigs(contig_id_list))
 
-        raw_contigs = self.get_data()["contigs"]
+    def _contig_order(self, raw_contigs, contig_id_list):
+        """Indexes in `raw_contigs` of the contigs in the list, in its
+        order and without repeats, or of all contigs if the list is empty.
+        """
+        if not contig_id_list:
+            return range(len(raw_contigs))
+        index = {c["id"]: i for i, c in enumerate(raw_contigs)}
+        return [index[c] for c in _unique(contig_id_list) if c in index]
 
-        make_md5 = lambda x: hashlib.md5(x["sequence"].upper()).hexdigest()
+    def iter_contigs(self, contig_id_list=None):
+        raw_contigs = self._get_packed_data()["contigs"]
+        stats = self._get_contig_stats()
 
-        for i, c in enumerate(raw_contigs):
-            if contig_id_list and c['id'] not in contig_id_list:
-                continue
+        make_md5 = lambda x: hashlib.md5(x.upper()).hexdigest()
+
+        for i in self._contig_order(raw_contigs, contig_id_list):
+            c = raw_contigs[i]
+            sequence = _as_bytes(c['sequence'])
             cid = {'contig_id': c['id'],
-                   'sequence': c['sequence'],
-                   'length': c.get('length', None) or len(c['sequence']),
-                   'md5': c.get('md5', None) or make_md5(c),
+                   'sequence': sequence,
+                   'length': c.get('length', None) or len(sequence),
+                   'md5': c.get('md5', None) or make_md5(sequence),
                    'name': c.get('name', None),
                    'description': c.get('description', None),
                    'is_complete': c.get('complete', 0),
                    'is_circular': c.get('replicon_geometry','Unknown')
                    }
 
-            gc_count = self._sequence_gc(i, c['sequence'])
-            cid['gc_content'] = gc_count / (cid['length'] * 1.0)
-
-            contigs[c['id']] = cid
+            cid['gc_content'] = float(stats["gc_counts"][i]) / cid['length']
+
+            yield c['id'], cid
+
+    def export_fasta(self, fileobj, contig_id_list=None, line_width=60):
+        raw_contigs = self._get_packed_data()["contigs"]
+        if contig_id_list:
+            unknown = set(contig_id_list) - set(c["id"] for c in raw_contigs)
+            if unknown:
+                raise ValueError('Unknown contig "{}"'.format(unknown.pop()))
+
+        def records():
+            for i in self._contig_order(raw_contigs, contig_id_list):
+                c = raw_contigs[i]
+                header = _fasta_header(c["id"], c.get("description"))
+                for record in _iter_pieces(header, c["sequence"]):
+                    yield record
+
+        return write_fasta(fileobj, records(), line_width)
+
+    def get_contig_subsequences(self, region_list):
+        raw_contigs = self._get_packed_data()["contigs"]
+        wanted = set(r["contig_id"] for r in region_list)
+        sequences = {c["id"]: c["sequence"] for c in raw_contigs
+                     if c["id"] in wanted}
+
+        result = []
+        for r in region_list:
+            if r["contig_id"] not in sequences:
+                raise ValueError('Unknown contig "{}"'.format(r["contig_id"]))
+            sequence = sequences[r["contig_id"]]
+            begin, end = _region_bounds(r, len(sequence))
+            if r["strand"] == "-":
+                result.append(reverse_complement(sequence[begin:end]))
+            else:
+                result.append(_as_bytes(sequence[begin:end]))
+        return result
 
-        return contigs
+    def _get_contig_length_table(self):
+        """Get the id and length of every contig, without sequences.
 
-    def _sequence_gc(self, index, sequence):
-        """Get GC content for a sequence.
+        Only the "id" and "length" fields are fetched; sequences are
+        read just when some contig has no "length". The table is cached
+        as a derived record for this version of the object.
 
-            May refer to a cached value, if the cache is available.
+        Returns:
+          dict with "contig_ids" and "lengths" (lists, in object order).
         """
-        self._current_sequence = sequence
-        name = 'gc-{:d}'.format(index)
-        return self._cache.get_derived_data(self._calc_sequence_gc, name)
+        return self._cache.get_derived_data(self._calc_contig_length_table,
+                                            'contig-lengths')
+
+    def _calc_contig_length_table(self):
+        contigs = self.get_data_subset(["contigs/[*]/id",
+                                        "contigs/[*]/length"])["contigs"]
+        if not all("length" in c for c in contigs):
+            contigs = self._get_packed_data()["contigs"]
+        return {"contig_ids": [c["id"] for c in contigs],
+                "lengths": [int(c["length"]) if "length" in c
+                            else len(c["sequence"]) for c in contigs]}
 
-    def _calc_sequence_gc(self):
-        """Calculate "G+C Content" by counting G's and C's in the
-           sequence.
+    def _get_contig_stats(self):
+        """Get the length, G+C count and N count of every contig.
+
+        These are computed in one pass over each sequence and cached
+        as a single derived record for this version of the object.
+
+        Returns:
+          dict with "contig_ids" (list, in object order) and the numpy
+          arrays "lengths", "gc_counts", "n_counts" and
+          "ambiguous_counts" (bases other than A, C, G or T), in the
+          same order.
         """
-        return sum(self._current_sequence.count(x) for x in ['g','G','c','C'])
+        return self._cache.get_derived_data(self._calc_contig_stats,
+                                            'contig-stats')
+
+    def _calc_contig_stats(self):
+        contigs = self._get_packed_data()["contigs"]
+        n = len(contigs)
+        stats = {"contig_ids": [],
+                 "lengths": np.zeros(n, dtype=np.int64),
+                 "gc_counts": np.zeros(n, dtype=np.int64),
+                 "n_counts": np.zeros(n, dtype=np.int64),
+                 "ambiguous_counts": np.zeros(n, dtype=np.int64)}
+        for i, c in enumerate(contigs):
+            sequence = c["sequence"]
+            stats["contig_ids"].append(c["id"])
+            stats["lengths"][i] = c["length"] if "length" in c \
+                else len(sequence)
+            if isinstance(sequence, PackedSequence):
+                # counted without decoding
+                stats["gc_counts"][i] = sequence.gc_count()
+                stats["n_counts"][i] = sequence.exception_count('N')
+                stats["ambiguous_counts"][i] = sequence.exception_count()
+                continue
+            counts = base_counts(sequence)
+            stats["gc_counts"][i] = counts[_GC].sum()
+            stats["n_counts"][i] = counts[_N].sum()
+            stats["ambiguous_counts"][i] = counts.sum() - counts[_ACGT].sum()
+        return stats
 
 
 class _Assembly(ObjectAPI, AssemblyInterface):
@@ -423,6 +737,29 @@ class _Assembly(ObjectAPI, AssemblyInterface):
     def get_stats(self):
         return self.get_data_subset(path_list=["gc_content","dna_size","num_contigs"])            
 
+    def get_assembly_metrics(self):
+        return self._cache.get_derived_data(self._calc_assembly_metrics,
+                                            'assembly-metrics')
+
+    def _calc_assembly_metrics(self):
+        data = self.get_data()
+        contigs = data["contigs"]
+        lengths = [c["length"] for c in contigs.values()]
+
+        if "base_counts" in data:
+            ambiguous = sum(n for base, n in data["base_counts"].items()
+                            if base.upper() not in "ACGT")
+        elif all("Ncount" in c for c in contigs.values()):
+            ambiguous = sum(c["Ncount"] for c in contigs.values())
+        else:
+            # not recorded in the object, so count them
+            ambiguous = 0
+            for _, contig in self.iter_contigs():
+                counts = base_counts(contig["sequence"])
+                ambiguous += counts.sum() - counts[_ACGT].sum()
+
+        return assembly_metrics(lengths, ambiguous)
+
     def get_number_contigs(self):
         return self.get_data_subset(path_list=["num_contigs"])["num_contigs"]
 
@@ -450,101 +787,257 @@ class _Assembly(ObjectAPI, AssemblyInterface):
 
     def get_contig_ids(self):
         contigs = self.get_data()["contigs"]
-        return [contigs[c]["contig_id"] for c in contigs]
+        ordered = sorted(contigs.values(), key=lambda c: c["start_position"])
+        return [c["contig_id"] for c in ordered]
 
     @collect_performance(g_stats, prefix='new.')
     def get_contigs(self, contig_id_list=None):
+        return dict(self.iter_contigs(contig_id_list))
+
+    def iter_contigs(self, contig_id_list=None):
         data = self.get_data()
 
-        if contig_id_list is None:
-            contig_id_list = data["contigs"].keys()
-        
-        num_contigs = len(contig_id_list)
-        total_contigs = data["num_contigs"]
-        fasta_ref = data["fasta_handle_ref"]
-        contigs = data["contigs"]
+        if not contig_id_list:
+            contig_id_list = self.get_contig_ids()
+        contig_id_list = _unique(contig_id_list)
 
-        shock_node_id = None
-        try:
-            hc = handleClient(url=self.services["handle_service_url"], token=self._token)
-            handle = hc.hids_to_handles([fasta_ref])[0]
-            shock_node_id = handle["id"]
-        except Exception, e:
-            _log.debug("Failed to retrieve handle {} from {}".format(fasta_ref,
-                                                                     self.services["handle_service_url"]))
-            _log.exception(e)
-            shock_node_id = fasta_ref
+        contigs = data["contigs"]
+        shock_node_id = self._get_shock_node_id(data["fasta_handle_ref"])
 
         copy_keys = ["contig_id", "length", "gc_content", "md5", "name", "description", "is_complete", "is_circular"]
 
-        header = {}
-        header["Authorization"] = "Oauth {0}".format(self._token)
+        # each run is in file order, so each contig is complete as soon
+        # as its last byte has been read
+        regions = [(c, contigs[c]["start_position"], contigs[c]["num_bytes"])
+                   for c in contig_id_list]
+        for run in _ascending_runs(regions):
+            for c, sequence in self._iter_fasta_regions(shock_node_id,
+                                                        contigs, run):
+                contig = {k: contigs[c][k] for k in copy_keys
+                          if k in contigs[c]}
+                contig["sequence"] = sequence
+                yield c, contig
+
+    def export_fasta(self, fileobj, contig_id_list=None, line_width=60):
+        data = self.get_data()
+        contigs = data["contigs"]
 
-        def fetch_data(shock_node_id, start=0, length=0):
-            fetch_url = self.services["shock_service_url"] + "node/" + shock_node_id
+        if not contig_id_list:
+            contig_id_list = self.get_contig_ids()
+        for c in contig_id_list:
+            if c not in contigs:
+                raise ValueError('Unknown contig "{}"'.format(c))
+        shock_node_id = self._get_shock_node_id(data["fasta_handle_ref"])
 
-            subset = False
-            if start == 0 and length == 0:
-                fetch_url += "?download_raw"
-            else:
-                fetch_url += "?download&seek=" + str(start) + "&length=" + str(length)
-                subset = True
+        regions = [(c, contigs[c]["start_position"], contigs[c]["num_bytes"])
+                   for c in _unique(contig_id_list)]
+        headers = {c: _fasta_header(c, contigs[c].get("description"))
+                   for c, start, num_bytes in regions}
 
-            #Retrieve individual sequences
-            data = requests.get(fetch_url, headers=header, stream=True)
-            buffer = StringIO.StringIO()
-            try:
-                for chunk in data.iter_content(CHUNK_SIZE):
-                    if chunk:
-                        buffer.write(chunk)
+        def records():
+            for run in _ascending_runs(regions):
+                for c, piece, is_last in self._iter_fasta_pieces(
+                        shock_node_id, contigs, run):
+                    yield headers[c], piece, is_last
 
-                data = buffer.getvalue()
-            except:
-                raise
-            finally:
-                buffer.close()
+        return write_fasta(fileobj, records(), line_width)
 
-            return data
+    @collect_performance(g_stats, prefix='new.')
+    def get_contig_subsequences(self, region_list):
+        data = self.get_data()
+        contigs = data["contigs"]
 
-        if num_contigs > total_contigs/3 or num_contigs == 0:
-            try:
-                sequence_data = fetch_data(shock_node_id)
-            except Exception, e:
-                raise
+        bounds = []
+        for r in region_list:
+            if r["contig_id"] not in contigs:
+                raise ValueError('Unknown contig "{}"'.format(r["contig_id"]))
+            bounds.append(_region_bounds(r, contigs[r["contig_id"]]["length"]))
+
+        wanted = [i for i, (begin, end) in enumerate(bounds) if end > begin]
+        if not wanted:
+            return ["" for r in region_list]
+
+        shock_node_id = self._get_shock_node_id(data["fasta_handle_ref"])
+        widths = self._get_line_widths(
+            shock_node_id, contigs, set(region_list[i]["contig_id"] for i in wanted))
+
+        # byte span in the file of each region, including newlines
+        spans = {}
+        for i in wanted:
+            c = region_list[i]["contig_id"]
+            first = _byte_offset(contigs[c], widths[c], bounds[i][0])
+            last = _byte_offset(contigs[c], widths[c], bounds[i][1] - 1)
+            spans[i] = (first, last + 1)
+
+        # read each overlapping group of spans once
+        merged = []
+        for i in sorted(spans, key=lambda x: spans[x]):
+            first, end = spans[i]
+            if merged and first <= merged[-1][2]:
+                merged[-1][2] = max(merged[-1][2], end)
+                merged[-1][3].append(i)
+            else:
+                merged.append([len(merged), first, end, [i]])
+        file_regions = [(m[0], m[1], m[2] - m[1]) for m in merged]
+        data_by_span = dict(self._iter_fasta_regions(shock_node_id, contigs,
+                                                     file_regions, strip=''))
+
+        result = ["" for r in region_list]
+        for key, first, end, members in merged:
+            raw = data_by_span[key]
+            for i in members:
+                sequence = raw[spans[i][0] - first:spans[i][1] - first]
+                sequence = sequence.translate(None, string.whitespace)
+                if region_list[i]["strand"] == "-":
+                    sequence = reverse_complement(sequence)
+                result[i] = sequence
+        return result
+
+    def _get_shock_node_id(self, fasta_ref):
+        """Get the id of the Shock node holding the FASTA file.
+
+        Handles are resolved through the process-wide map in
+        :func:`doekbase.data_api.shock.resolve_handles`. A reference the
+        Handle service does not know is taken to be a node id already.
+        """
+        nodes = shock.resolve_handles(self.services["handle_service_url"],
+                                      self._token, [fasta_ref])
+        return nodes.get(fasta_ref, fasta_ref)
 
-            if num_contigs == 0:
-                contig_id_list = contigs.keys()
-                num_contigs = total_contigs
-                assert num_contigs == len(contig_id_list)
-
-            outContigs = {}
-            for i in xrange(num_contigs):
-                c = contig_id_list[i]
-                outContigs[c] = {}
-                for k in copy_keys:
-                    if k in contigs[c]:
-                        outContigs[c][k] = contigs[c][k]
-
-                outContigs[c]["sequence"] = sequence_data[contigs[c]["start_position"]:contigs[c]["start_position"] + \
-                                            contigs[c]["num_bytes"]].translate(None, string.whitespace)
+    def _iter_fasta_regions(self, shock_node_id, contigs, regions,
+                            strip=string.whitespace):
+        """Read regions of the FASTA file, from the local node cache
+        if there is one, or else from Shock.
+
+        Args:
+          shock_node_id: Shock node of the FASTA file
+          contigs: Contig information from the Assembly object
+          regions: list of (key, start, num_bytes), sorted by start
+          strip: Characters to remove from each region
+        Returns:
+          iterator over (key, data), in order of start
+        """
+        shock_url = self.services["shock_service_url"]
+
+        file_size = max(v["start_position"] + v["num_bytes"]
+                        for v in contigs.values())
+
+        mapped = None
+        node_cache = shock.get_node_cache()
+        if node_cache is not None:
+            mapped = node_cache.open(shock_url, shock_node_id, self._token,
+                                     size=file_size)
+
+        if mapped is not None:
+            # local copy of the file
+            return shock.iter_mapped_regions(mapped, regions, strip=strip)
+        elif shock.prefer_full_download(regions, file_size):
+            # stream the whole file
+            chunks = shock.iter_node(shock_url, shock_node_id, self._token)
+            return shock.iter_regions(chunks, regions, strip=strip)
         else:
-            outContigs = {}
-            sorted_contigs = sorted(contig_id_list,
-                             cmp=lambda a,b: cmp(contigs[a]["start_position"],
-                                                 contigs[b]["start_position"]))
+            # merged byte ranges, fetched in parallel
+            return shock.iter_ranges(shock_url, shock_node_id, self._token,
+                                     regions, strip=strip)
+
+    def _iter_fasta_pieces(self, shock_node_id, contigs, regions,
+                           strip=string.whitespace):
+        """Read regions of the FASTA file one chunk at a time, as for
+        :func:`doekbase.data_api.shock.iter_region_pieces`, with one
+        request at a time so that memory use does not grow with the
+        size of the file or of the regions.
+
+        Args:
+          shock_node_id, contigs, regions, strip: See `_iter_fasta_regions`
+        Returns:
+          iterator over (key, piece, is_last), in order of start
+        """
+        shock_url = self.services["shock_service_url"]
 
-            for c in sorted_contigs:
-                outContigs[c] = {}
-                for k in copy_keys:
-                    if k in contigs[c]:
-                        outContigs[c][k] = contigs[c][k]
+        file_size = max(v["start_position"] + v["num_bytes"]
+                        for v in contigs.values())
 
-                outContigs[c]["sequence"] = fetch_data(shock_node_id,
-                                                       contigs[c]["start_position"],
-                                                       contigs[c]["num_bytes"])\
-                                                       .translate(None, string.whitespace)
+        mapped = None
+        node_cache = shock.get_node_cache()
+        if node_cache is not None:
+            mapped = node_cache.open(shock_url, shock_node_id, self._token,
+                                     size=file_size)
+        try:
+            if mapped is None and shock.prefer_full_download(regions,
+                                                             file_size):
+                # stream the whole file
+                ranges = [(0, 0, regions)]
+            else:
+                ranges = shock.coalesce_regions(regions)
+            for start, num_bytes, rng_regions in ranges:
+                if mapped is not None:
+                    chunks = shock.iter_mapped_chunks(mapped, start,
+                                                      num_bytes)
+                else:
+                    chunks = shock.iter_node(shock_url, shock_node_id,
+                                             self._token, start=start,
+                                             length=num_bytes)
+                for piece in shock.iter_region_pieces(chunks, rng_regions,
+                                                      offset=start,
+                                                      strip=strip):
+                    yield piece
+        finally:
+            if mapped is not None:
+                mapped.close()
+
+    #: Bytes read from the start of a contig to find its line width
+    LINE_PROBE_BYTES = 2**12
+
+    def _get_line_widths(self, shock_node_id, contigs, contig_ids):
+        """Get the FASTA line width of some contigs, reading the start of
+        each contig to find its first line break if it is not known yet.
+
+        Returns:
+          dict of contig id to (bases per line, bytes per line break)
+        """
+        widths, todo = {}, []
+        for c in contig_ids:
+            width = _line_widths.get((shock_node_id, c))
+            if width is None:
+                todo.append(c)
+            else:
+                widths[c] = width
+
+        probe = self.LINE_PROBE_BYTES
+        while todo:
+            regions = sorted([(c, contigs[c]["start_position"],
+                               min(probe, contigs[c]["num_bytes"]))
+                              for c in todo], key=lambda r: r[1])
+            todo = []
+            for c, head in self._iter_fasta_regions(shock_node_id, contigs,
+                                                    regions, strip=''):
+                eol = head.find('\n')
+                if eol < 0 and len(head) < contigs[c]["num_bytes"]:
+                    todo.append(c)  # longer line, look further
+                    continue
+                if eol < 0:
+                    width = (contigs[c]["length"], 1)
+                elif eol > 0 and head[eol - 1] == '\r':
+                    width = (eol - 1, 2)
+                else:
+                    width = (eol, 1)
+                if width[0] <= 0:
+                    width = (max(contigs[c]["length"], 1), width[1])
+                _line_widths[(shock_node_id, c)] = width
+                widths[c] = width
+            probe *= 16
+        return widths
+
+
+def _byte_offset(contig, width, base):
+    """Offset in the FASTA file of the 0-based `base` of a contig whose
+    lines hold `width[0]` bases followed by `width[1]` newline bytes.
+    """
+    line, column = divmod(base, width[0])
+    return contig["start_position"] + line * (width[0] + width[1]) + column
 
-        return outContigs
+#: FASTA line width of contigs, by (Shock node id, contig id)
+_line_widths = LRUDict(100000)
 
 
 _as_log = get_logger('AssemblyClientAPI')
@@ -574,12 +1067,13 @@ class AssemblyClientAPI(AssemblyInterface):
         return wrapper
 
     @logged(_as_log, log_name='init')
-    def __init__(self, url=None, token=None, ref=None):
+    def __init__(self, url=None, token=None, ref=None, timeout=None):
         from doekbase.data_api.sequence.assembly.service.interface import AssemblyClientConnection
 
         # TODO add exception handling and better error messages here
         self.url = url
-        self.transport, self.client = AssemblyClientConnection(url).get_client()
+        self.transport, self.client = AssemblyClientConnection(
+            url, timeout=timeout, key=ref).get_client()
         self.ref = ref
         self._token = token
 
@@ -613,6 +1107,24 @@ class AssemblyClientAPI(AssemblyInterface):
             "gc_content": stats.gc_content
         }
 
+    @logged(_as_log)
+    @client_method
+    def get_assembly_metrics(self):
+        metrics = self.client.get_assembly_metrics(self._token, self.ref)
+        return {
+            "num_contigs": metrics.num_contigs,
+            "dna_size": metrics.dna_size,
+            "n50": metrics.n50,
+            "l50": metrics.l50,
+            "n90": metrics.n90,
+            "l90": metrics.l90,
+            "longest_contig": metrics.longest_contig,
+            "shortest_contig": metrics.shortest_contig,
+            "ambiguous_bases": metrics.ambiguous_bases,
+            "histogram_bin_edges": metrics.histogram_bin_edges,
+            "histogram_counts": metrics.histogram_counts
+        }
+
     @logged(_as_log)
     @client_method
     def get_number_contigs(self):
@@ -663,3 +1175,61 @@ class AssemblyClientAPI(AssemblyInterface):
             }
 
         return out_contigs
+
+    @logged(_as_log)
+    @client_method
+    def get_contig_subsequences(self, region_list):
+        from doekbase.data_api.sequence.assembly.service.ttypes import ContigRegion
+        regions = [ContigRegion(contig_id=r["contig_id"], start=r["start"],
+                                length=r["length"], strand=r["strand"])
+                   for r in region_list]
+        return self.client.get_contig_subsequences(self._token, self.ref, regions)
+
+    def export_fasta(self, fileobj, contig_id_list=None, line_width=60):
+        # check the contig ids before anything is written
+        batches = self._contig_batches(contig_id_list)
+
+        def records():
+            for c, contig in self._iter_contigs(batches):
+                header = _fasta_header(c, contig["description"])
+                for record in _iter_pieces(header, contig["sequence"]):
+                    yield record
+        return write_fasta(fileobj, records(), line_width)
+
+    #: Maximum total length of the contigs fetched by each call
+    #: made by :meth:`iter_contigs`
+    ITER_BATCH_SIZE = 2**26
+
+    def iter_contigs(self, contig_id_list=None):
+        return self._iter_contigs(self._contig_batches(contig_id_list))
+
+    def _contig_batches(self, contig_id_list):
+        """Split the contigs into batches of at most ITER_BATCH_SIZE bases
+        (or one contig), in the order of :meth:`iter_contigs`.
+
+        Raises:
+          ValueError: if a contig is not in this Assembly
+        """
+        lengths = self.get_contig_lengths()
+        if not contig_id_list:
+            contig_id_list = self.get_contig_ids()
+        contig_id_list = _unique(contig_id_list)
+        for c in contig_id_list:
+            if c not in lengths:
+                raise ValueError('Unknown contig "{}"'.format(c))
+        batches, batch, batch_size = [], [], 0
+        for c in contig_id_list:
+            if batch and batch_size + lengths[c] > self.ITER_BATCH_SIZE:
+                batches.append(batch)
+                batch, batch_size = [], 0
+            batch.append(c)
+            batch_size += lengths[c]
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _iter_contigs(self, batches):
+        for batch in batches:
+            contigs = self.get_contigs(batch)
+            for c in batch:
+                yield c, contigs[c]
@@ -17,8 +17,9 @@ _log = logging.getLogger('.'.join([__name__, 'service']))
 class AssemblyClientConnection(service_core.BaseClientConnection):
     """Provides a client connection to the running Assembly API service.
     """
-    def __init__(self, url="http://localhost:9102"):
-        service_core.BaseClientConnection.__init__(self, thrift_client, url)
+    def __init__(self, url="http://localhost:9102", timeout=None, key=None):
+        service_core.BaseClientConnection.__init__(self, thrift_client, url,
+                                                   timeout=timeout, key=key)
 
 class AssemblyService(service_core.BaseService):
     zope.interface.implements(thrift_service.Iface)
@@ -55,6 +56,13 @@ class AssemblyService(service_core.BaseService):
 
         return ttypes.AssemblyStats(**result)
 
+    @server_method
+    def get_assembly_metrics(self, token=None, ref=None):
+        assembly_api = self._get_instance(token, ref)
+        result = assembly_api.get_assembly_metrics()
+
+        return ttypes.AssemblyMetrics(**result)
+
     @server_method
     def get_number_contigs(self, token=None, ref=None):
         assembly_api = self._get_instance(token, ref)
@@ -116,3 +124,13 @@ class AssemblyService(service_core.BaseService):
 
         return {x: ttypes.AssemblyContig(**result[x]) for x in result}
 
+
+    @server_method
+    def get_contig_subsequences(self, token=None, ref=None, region_list=None):
+        assembly_api = self._get_instance(token, ref)
+        regions = [{"contig_id": r.contig_id, "start": r.start,
+                    "length": r.length, "strand": r.strand}
+                   for r in region_list]
+        result = assembly_api.get_contig_subsequences(regions)
+
+        return result
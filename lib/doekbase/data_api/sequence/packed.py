@@ -0,0 +1,309 @@
+"""
+Compact in-memory form of DNA sequences.
+
+A `PackedSequence` keeps A, C, G and T in 2 bits per base. Every other
+character (N, IUPAC ambiguity codes, gaps) is kept in a list of runs,
+and lowercase (soft-masked) stretches in a second list of runs, so the
+original text can always be restored exactly. Typical sequences take
+about a quarter of the memory of a plain string.
+
+Sequences are decoded only when, and as far as, they are read: slicing
+decodes just the slice, and the G+C count is taken from the packed
+bytes directly.
+
+Use `pack_sequences` and `unpack_sequences` to convert the sequences in
+a whole object, e.g. one decoded from the Workspace.
+"""
+
+# Imports
+
+# Third-party
+import numpy as np
+
+# Constants
+
+#: Keys whose string values are packed by `pack_sequences`
+SEQUENCE_KEYS = ('sequence', 'dna_sequence')
+#: Shorter sequences are not packed, as they would not get smaller
+PACK_MIN_LENGTH = 128
+
+_BASES = np.fromstring('ACGT', dtype=np.uint8)
+# byte value -> 2-bit code, or 255 if the base is not A, C, G or T
+_CODES = np.empty(256, dtype=np.uint8)
+_CODES.fill(255)
+_CODES[_BASES] = np.arange(4, dtype=np.uint8)
+# packed byte -> number of C and G codes in it
+_GC_COUNTS = np.array([sum(1 for shift in (6, 4, 2, 0)
+                           if (b >> shift) & 3 in (1, 2))
+                       for b in range(256)], dtype=np.int64)
+_LOWER_OFFSET = ord('a') - ord('A')
+
+# Functions and classes
+
+def _runs(mask, values=None):
+    """Find runs of True in a boolean array, split where `values` change.
+
+    Returns:
+      (starts, lengths) arrays
+    """
+    idx = np.flatnonzero(mask)
+    if idx.size == 0:
+        return idx, idx
+    new_run = np.ones(idx.size, dtype=bool)
+    new_run[1:] = np.diff(idx) != 1
+    if values is not None:
+        v = values[idx]
+        new_run[1:] |= v[1:] != v[:-1]
+    first = np.flatnonzero(new_run)
+    lengths = np.diff(np.append(first, idx.size))
+    return idx[first], lengths
+
+def _clip_runs(starts, lengths, start, end):
+    """Select the parts of runs that fall in [start, end).
+
+    Returns:
+      (indexes of the runs, positions relative to `start` of every
+      selected base, number of selected bases in each run)
+    """
+    lo = np.searchsorted(starts + lengths, start, side='right')
+    hi = np.searchsorted(starts, end, side='left')
+    which = np.arange(lo, hi)
+    if which.size == 0:
+        return which, which, which
+    s = np.clip(starts[which], start, end)
+    e = np.clip(starts[which] + lengths[which], start, end)
+    n = e - s
+    offsets = np.repeat(s - start - np.cumsum(n) + n, n)
+    return which, offsets + np.arange(n.sum()), n
+
+
+class PackedSequence(object):
+    """A sequence stored in 2 bits per base, with exceptions.
+
+    Behaves like a read-only string for `len`, indexing and slicing
+    (which return plain strings) and comparison. Use `str()` or
+    `decode` to get the whole sequence.
+    """
+    __slots__ = ('_length', '_packed', '_exceptions', '_exception_chars',
+                 '_lowercase')
+
+    def __init__(self, sequence):
+        """Pack a sequence.
+
+        Args:
+          sequence (str or unicode): ASCII text of the sequence
+        """
+        if isinstance(sequence, unicode):
+            sequence = sequence.encode('ascii', 'replace')
+        data = np.fromstring(sequence, dtype=np.uint8)
+        self._length = data.size
+
+        lower = (data >= ord('a')) & (data <= ord('z'))
+        upper = data - lower.astype(np.uint8) * _LOWER_OFFSET
+        codes = _CODES[upper]
+        other = codes == 255
+        codes[other] = 0
+
+        starts, lengths = _runs(other, upper)
+        self._exceptions = np.concatenate([starts, lengths]).astype(
+            np.int64).tostring()
+        self._exception_chars = upper[starts].tostring()
+        starts, lengths = _runs(lower)
+        self._lowercase = np.concatenate([starts, lengths]).astype(
+            np.int64).tostring()
+
+        codes = np.append(codes, np.zeros(-codes.size % 4, dtype=np.uint8))
+        self._packed = ((codes[0::4] << 6) | (codes[1::4] << 4) |
+                        (codes[2::4] << 2) | codes[3::4]).tostring()
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    @staticmethod
+    def _split_runs(buf):
+        runs = np.frombuffer(buf, dtype=np.int64)
+        return runs[:runs.size // 2], runs[runs.size // 2:]
+
+    def _codes(self, start, end):
+        """2-bit codes of the bases in [start, end), one per byte.
+        """
+        first, last = start // 4, (end + 3) // 4
+        packed = np.frombuffer(self._packed, dtype=np.uint8,
+                               count=last - first, offset=first)
+        codes = np.empty((packed.size, 4), dtype=np.uint8)
+        for i, shift in enumerate((6, 4, 2, 0)):
+            codes[:, i] = (packed >> shift) & 3
+        return codes.ravel()[start - first * 4:end - first * 4]
+
+    def _bounds(self, start, end):
+        start, end, _ = slice(start, end).indices(self._length)
+        return start, max(start, end)
+
+    def decode(self, start=0, end=None):
+        """Get part of the sequence as a string.
+
+        Args:
+          start (int): Offset of the first base
+          end (int): Offset after the last base, or None for the end
+        Returns:
+          str
+        """
+        start, end = self._bounds(start, end)
+        if start == end:
+            return ''
+        data = _BASES[self._codes(start, end)]
+        starts, lengths = self._split_runs(self._exceptions)
+        which, pos, n = _clip_runs(starts, lengths, start, end)
+        if pos.size:
+            chars = np.frombuffer(self._exception_chars, dtype=np.uint8)
+            data[pos] = np.repeat(chars[which], n)
+        starts, lengths = self._split_runs(self._lowercase)
+        which, pos, n = _clip_runs(starts, lengths, start, end)
+        if pos.size:
+            data[pos] += _LOWER_OFFSET
+        return data.tostring()
+
+    def gc_count(self, start=0, end=None):
+        """Count G and C bases (either case), without decoding.
+
+        Args:
+          start (int): Offset of the first base
+          end (int): Offset after the last base, or None for the end
+        Returns:
+          int
+        """
+        start, end = self._bounds(start, end)
+        # whole packed bytes, plus the partial bytes at either end
+        first, last = (start + 3) // 4, end // 4
+        if first >= last:
+            codes = self._codes(start, end)
+            return int(np.count_nonzero((codes == 1) | (codes == 2)))
+        packed = np.frombuffer(self._packed, dtype=np.uint8,
+                               count=last - first, offset=first)
+        edges = np.append(self._codes(start, first * 4),
+                          self._codes(last * 4, end))
+        return int(_GC_COUNTS[packed].sum() +
+                   np.count_nonzero((edges == 1) | (edges == 2)))
+
+    def exception_count(self, chars=None):
+        """Count the bases that are not A, C, G or T, in either case.
+
+        Args:
+          chars (str): If given, count only these (uppercase) characters,
+                       e.g. 'N'
+        Returns:
+          int
+        """
+        starts, lengths = self._split_runs(self._exceptions)
+        if chars is None:
+            return int(lengths.sum())
+        wanted = np.in1d(np.frombuffer(self._exception_chars, dtype=np.uint8),
+                         np.fromstring(chars, dtype=np.uint8))
+        return int(lengths[wanted].sum())
+
+    @property
+    def nbytes(self):
+        """Bytes held for the packed data.
+        """
+        return (len(self._packed) + len(self._exceptions) +
+                len(self._exception_chars) + len(self._lowercase))
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.step in (None, 1):
+                return self.decode(key.start, key.stop)
+            return self.decode()[key]
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError('PackedSequence index out of range')
+        return self.decode(key, key + 1)
+
+    def __getslice__(self, i, j):
+        # negative offsets have already had the length added
+        return self.decode(max(i, 0), max(j, 0))
+
+    def __str__(self):
+        return self.decode()
+
+    def __repr__(self):
+        return '<PackedSequence length={:d}>'.format(self._length)
+
+    def __eq__(self, other):
+        if isinstance(other, PackedSequence):
+            return self.__getstate__() == other.__getstate__()
+        if isinstance(other, basestring):
+            return len(other) == self._length and self.decode() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+
+def unpack(value):
+    """Decode a PackedSequence; return any other value unchanged.
+    """
+    if isinstance(value, PackedSequence):
+        return value.decode()
+    return value
+
+def pack_sequences(data, keys=SEQUENCE_KEYS, min_length=PACK_MIN_LENGTH):
+    """Replace long sequence strings in an object with PackedSequence.
+
+    Containers holding sequences are copied, so `data` is unchanged.
+
+    Args:
+      data: Object made of dicts, lists and scalars, e.g. from JSON
+      keys (tuple): Names of the dict keys whose values are sequences
+      min_length (int): Leave shorter sequences as they are
+    Returns:
+      the object with sequences packed
+    """
+    return _convert(data, keys, min_length)
+
+def unpack_sequences(data):
+    """Replace every PackedSequence in an object with a string.
+
+    Containers holding sequences are copied, so `data` is unchanged.
+    """
+    return _convert(data, None, 0)
+
+def _convert(data, keys, min_length):
+    """Pack (if `keys` is given) or unpack the sequences under `data`,
+    copying only the containers that change.
+    """
+    if isinstance(data, PackedSequence) and keys is None:
+        return data.decode()
+    if isinstance(data, dict):
+        result = None
+        for k, v in data.iteritems():
+            if keys is not None and k in keys and \
+                    isinstance(v, basestring) and len(v) >= min_length:
+                new = PackedSequence(v)
+            else:
+                new = _convert(v, keys, min_length)
+            if new is not v:
+                if result is None:
+                    result = dict(data)
+                result[k] = new
+        return data if result is None else result
+    if isinstance(data, list):
+        result = None
+        for i, v in enumerate(data):
+            new = _convert(v, keys, min_length)
+            if new is not v:
+                if result is None:
+                    result = list(data)
+                result[i] = new
+        return data if result is None else result
+    return data
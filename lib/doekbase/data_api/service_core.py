@@ -8,24 +8,45 @@ __date__ = '12/24/15'
 # -------
 
 # Stdlib
+import bisect
+import collections
+import errno
 import functools
+import hashlib
+import httplib
+import itertools
 import logging
+import math
 import os
 import signal
+import socket
+import sys
+import threading
 import time
 import traceback
 
 # Third party
 import twisted.internet
+import twisted.internet.defer
+import twisted.python.failure
 import twisted.web
+import twisted.web.http
+import twisted.web.resource
+import twisted.web.server
 from thrift.transport import THttpClient
 from thrift.transport import TTransport
 from thrift.protocol import TBinaryProtocol
 from thrift.transport import TTwisted
+from thrift.Thrift import TMessageType, TType
 
 # Local
 from doekbase.data_api import exceptions, util
 
+try:
+    import cStringIO as StringIO
+except ImportError:
+    import StringIO
+
 # Global constants and variables
 # ------------------------------
 DEFAULT_WS_URL = 'https://ci.kbase.us/services/ws/'
@@ -34,6 +55,15 @@ DEFAULT_SHOCK_URL = 'https://ci.kbase.us/services/shock-api/'
 SERVICES_DICT = {'workspace_service_url': DEFAULT_WS_URL,
                  'shock_service_url'    : DEFAULT_SHOCK_URL}
 
+#: HTTP header with the seconds the client will wait for a reply
+DEADLINE_HEADER = 'X-Data-API-Timeout'
+
+#: Count of calls abandoned after their deadline, by method and by stage
+#: (as 'stage:<name>'), i.e. work that was not done for nobody
+abandoned_calls = collections.Counter()
+# calls may be abandoned by several scheduler workers at once
+_abandoned_lock = threading.Lock()
+
 # Functions and classes
 # ---------------------
 
@@ -46,11 +76,17 @@ def server_method(func):
     1. ttypes (module): Thrift type module, containing exception classes
     2. log (logging.Logger): Logger instance
 
+    If the class also has a non-empty `scheduler` attribute, the call
+    is queued on that :class:`FairScheduler` and a Deferred is returned.
+
+    If the request has a deadline (see :func:`util.set_deadline`), the
+    call is abandoned with a ServiceException once it has passed.
+
     Args:
         func (function): Function being wrapped
     """
 
-    def wrapper(self, token, ref, *args, **kwargs):
+    def call(self, token, ref, *args, **kwargs):
         assert hasattr(self, 'log'), 'Method in wrapped class must have "log" ' \
                                      'attribute'
         assert hasattr(self, 'ttypes'), 'Method in wrapped class must have ' \
@@ -63,7 +99,17 @@ def server_method(func):
                                args=args, kw=kwargs))
         t0 = time.time()
         try:
+            util.check_deadline('start')
             result = func(self, token, ref, *args, **kwargs)
+            util.check_deadline('reply')
+        except exceptions.DeadlineExceededError, e:
+            error = e
+            with _abandoned_lock:
+                abandoned_calls[func.__name__] += 1
+                abandoned_calls['stage:' + e.stage] += 1
+            raise self.ttypes.ServiceException(str(e.value),
+                                               traceback.format_exc(),
+                                               {"ref": str(ref)})
         except AttributeError, e:
             error = e
             raise self.ttypes.AttributeException(str(e.message),
@@ -102,8 +148,32 @@ def server_method(func):
                                        t=time.time() - t0))
         return result
 
+    def wrapper(self, token, ref, *args, **kwargs):
+        scheduler = getattr(self, 'scheduler', None)
+        if scheduler is None:
+            return call(self, token, ref, *args, **kwargs)
+        return scheduler.submit(func.__name__, token, functools.partial(
+            _call_with_deadline, util.get_deadline(),
+            call, self, token, ref, *args, **kwargs))
+
     return wrapper
 
+def _set_timeout(transport, timeout):
+    """Set reply timeout of a THttpClient, and send it to the service.
+    """
+    if timeout is not None:
+        transport.setTimeout(timeout * 1000)
+        transport.setCustomHeaders({DEADLINE_HEADER: '{:.3f}'.format(timeout)})
+
+def _call_with_deadline(deadline, func, *args, **kwargs):
+    """Call `func` with the current thread's deadline set to `deadline`.
+    """
+    util.set_deadline(deadline)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        util.set_deadline(None)
+
 class BaseService(object):
     """Base class for Data API service classes, which will be defined
     in the 'interface' module of the appropriate API subdirectory.
@@ -111,6 +181,8 @@ class BaseService(object):
     Takes care of some boilerplate logging and error-checking, as well
     as setting up instance variables for the @server_method decorator.
     """
+    #: If set to a `FairScheduler`, server methods run on its workers
+    scheduler = None
 
     def __init__(self, log, ttypes_module, api_class, services=None):
         """Constructor.
@@ -154,7 +226,19 @@ class BaseClientConnection(object):
     in the data_api.<api.path>.service.interface module.
     """
 
-    def __init__(self, thrift_client, url):
+    def __init__(self, thrift_client, url, timeout=None, key=None):
+        """Constructor.
+
+        Args:
+            thrift_client: Thrift generated client module
+            url (str|list): Service URL, or a list of URLs of replicas
+                            of the service. For a list, each call is routed
+                            to a replica chosen by `key` (see `ReplicaRouter`).
+            timeout (float): If given, seconds to wait for each reply. This
+                             is also sent to the service, which will stop
+                             working on a call that is no longer awaited.
+            key (str): Routing key for replicas, normally the object ref
+        """
         if not hasattr(thrift_client, 'Client') or not callable(
                 thrift_client.Client):
             raise AttributeError('Invalid "thrift_client" argument')
@@ -163,7 +247,12 @@ class BaseClientConnection(object):
         self.protocol = None
 
         try:
-            self.transport = THttpClient.THttpClient(url)
+            if isinstance(url, (list, tuple)):
+                self.transport = RoutedHttpClient(url, key=key,
+                                                  timeout=timeout)
+            else:
+                self.transport = THttpClient.THttpClient(url)
+                _set_timeout(self.transport, timeout)
             self.protocol = TBinaryProtocol.TBinaryProtocol(self.transport)
             self.client = thrift_client.Client(self.protocol)
         except AssertionError:
@@ -176,10 +265,620 @@ class BaseClientConnection(object):
     def get_client(self):
         return self.transport, self.client
 
+class ThriftResource(TTwisted.ThriftResource):
+    """Thrift resource that sets the deadline of each call from the
+    DEADLINE_HEADER of its request, if present, while the call is
+    being processed.
+    """
+    def render_POST(self, request):
+        request.content.seek(0, 0)
+        data = request.content.read()
+        tmo = TTransport.TMemoryBuffer()
+        d = self._process(request, data, tmo)
+        d.addCallback(self._cbProcess, request, tmo)
+        return twisted.web.server.NOT_DONE_YET
+
+    def _process(self, request, data, tmo):
+        """Process the call in `data`, writing the reply to `tmo`.
+
+        Returns:
+            Deferred fired when the reply is written
+        """
+        iprot = self.inputProtocolFactory.getProtocol(
+            TTransport.TMemoryBuffer(data))
+        oprot = self.outputProtocolFactory.getProtocol(tmo)
+        util.set_deadline(self._get_deadline(request))
+        try:
+            return self.processor.process(iprot, oprot)
+        finally:
+            util.set_deadline(None)
+
+    @staticmethod
+    def _get_deadline(request):
+        value = request.getHeader(DEADLINE_HEADER)
+        if value is None:
+            return None
+        try:
+            return time.time() + float(value)
+        except ValueError:
+            return None
+
+class CachingThriftResource(ThriftResource):
+    """Thrift resource that keeps the serialized replies of successful
+    calls in a :class:`doekbase.data_api.cache.ResponseCache`, and
+    writes them straight back out on a repeat call.
+
+    The cache key is (service, method, versioned object reference,
+    normalized arguments, protocol). The token is not part of the key, except for
+    non-public objects when the cache is `per_token`; otherwise
+    non-public objects are never cached. The stored value is the reply
+    without its message header, so that the header can be re-written
+    with the sequence id of the current call.
+
+    Resolving an object reference takes a Workspace call, so it is done
+    with `defer_to_thread` (by default, in the reactor's thread pool)
+    under the deadline of the request. Only references that name a
+    version are remembered, for REF_TTL seconds; any other reference
+    may move to a new version, so it is resolved on every call.
+    """
+    #: Seconds to remember how a versioned object reference was resolved
+    REF_TTL = 60
+    #: Maximum number of resolved object references to remember
+    REF_MAX_ITEMS = 10000
+
+    def __init__(self, processor, inputProtocolFactory,
+                 outputProtocolFactory=None, response_cache=None,
+                 services=None, log=None, defer_to_thread=None):
+        from doekbase.data_api import cache
+        ThriftResource.__init__(self, processor, inputProtocolFactory,
+                                outputProtocolFactory)
+        self.response_cache = response_cache
+        self.services = services or SERVICES_DICT
+        self.log = log or logging.getLogger(__name__)
+        if defer_to_thread is None:
+            import twisted.internet.threads
+            defer_to_thread = twisted.internet.threads.deferToThread
+        self.defer_to_thread = defer_to_thread
+        self._thrift_module = sys.modules[processor.__class__.__module__]
+        self._protocol_name = self.outputProtocolFactory.__class__.__name__
+        self._refs = cache.MetadataCache(ttl=self.REF_TTL,
+                                         max_items=self.REF_MAX_ITEMS)
+
+    def render_POST(self, request):
+        if self.response_cache is None:
+            return ThriftResource.render_POST(self, request)
+        request.content.seek(0, 0)
+        data = request.content.read()
+        try:
+            name, seqid, args = self._decode_call(data)
+        except Exception as err:
+            self.log.debug('msg="response cache bypassed" error="{}"'
+                           .format(err))
+            name, seqid, args = None, None, None
+        if args is None:
+            self._respond(None, request, data, name, seqid)
+            return twisted.web.server.NOT_DONE_YET
+        resolved = self._refs.get(self._ref_key(args.token, args.ref))
+        if resolved is not None:
+            self._respond(self._make_key(name, args, resolved), request,
+                          data, name, seqid)
+            return twisted.web.server.NOT_DONE_YET
+        d = self.defer_to_thread(_call_with_deadline,
+                                 self._get_deadline(request),
+                                 self._resolve_ref, args.token, args.ref)
+        d.addCallback(self._cbResolved, args)
+        d.addCallback(lambda resolved: self._make_key(name, args, resolved))
+        d.addErrback(self._ebKey)
+        d.addCallback(self._respond, request, data, name, seqid)
+        return twisted.web.server.NOT_DONE_YET
+
+    def _respond(self, key, request, data, name, seqid):
+        """Write the cached reply for `key`, or else process the call and
+        store its reply under `key`, unless that is None.
+        """
+        if key is not None:
+            body = self.response_cache.get(key)
+            if body is not None:
+                request.setResponseCode(twisted.web.http.OK)
+                request.setHeader('content-type', 'application/x-thrift')
+                request.write(self._reply_header(name, seqid))
+                request.write(body)
+                request.finish()
+                return
+        tmo = TTransport.TMemoryBuffer()
+        d = self._process(request, data, tmo)
+        if key is not None:
+            d.addCallback(self._cbStore, name, seqid, key, tmo)
+        d.addCallback(self._cbProcess, request, tmo)
+
+    def _cbResolved(self, resolved, args):
+        """Remember how a versioned reference was resolved.
+        """
+        if util.is_versioned_ref(args.ref):
+            self._refs.put(self._ref_key(args.token, args.ref), resolved)
+        return resolved
+
+    def _ebKey(self, failure):
+        self.log.debug('msg="response cache bypassed" error="{}"'
+                       .format(failure.getErrorMessage()))
+        return None
+
+    def _decode_call(self, data):
+        """Decode the call in `data`.
+
+        Returns:
+            (name, seqid, args) where args is None if the reply to this
+            call should not be cached.
+        """
+        iprot = self.inputProtocolFactory.getProtocol(
+            TTransport.TMemoryBuffer(data))
+        name, mtype, seqid = iprot.readMessageBegin()
+        if mtype != TMessageType.CALL or \
+                not self.response_cache.is_enabled(name):
+            return name, seqid, None
+        args_class = getattr(self._thrift_module, name + '_args', None)
+        result_class = getattr(self._thrift_module, name + '_result', None)
+        if args_class is None or result_class is None:
+            return name, seqid, None
+        args = args_class()
+        args.read(iprot)
+        return name, seqid, args
+
+    def _make_key(self, name, args, resolved):
+        """Build the cache key of a call, from its decoded `args` and
+        the (versioned reference, public flag) of its object.
+
+        Returns:
+            key, or None if the reply should not be cached
+        """
+        vref, is_public = resolved
+        if is_public:
+            owner = ''
+        elif self.response_cache.per_token:
+            owner = hashlib.sha1(args.token).hexdigest()
+        else:
+            return None
+        # replies that are maps do not depend on the order of list args
+        result_class = getattr(self._thrift_module, name + '_result')
+        unordered = result_class.thrift_spec[0][1] == TType.MAP
+        norm_args = []
+        for spec in args.thrift_spec[1:]:
+            if spec is None or spec[2] in ('token', 'ref'):
+                continue
+            value = getattr(args, spec[2])
+            if unordered and isinstance(value, list):
+                value = sorted(set(value))
+            norm_args.append((spec[2], value))
+        return self.response_cache.make_key(self._thrift_module.__name__,
+                                            name, vref, repr(norm_args),
+                                            self._protocol_name, owner)
+
+    @staticmethod
+    def _ref_key(token, ref):
+        return hashlib.sha1(token or '').hexdigest(), ref
+
+    def _resolve_ref(self, token, ref):
+        """Get versioned reference and public flag for `ref`.
+        """
+        from doekbase.data_api.core import ObjectAPI
+        obj = ObjectAPI(self.services, token=token, ref=ref)
+        return obj.get_info()['object_reference_versioned'], obj.is_public
+
+    def _reply_header(self, name, seqid):
+        tmo = TTransport.TMemoryBuffer()
+        oprot = self.outputProtocolFactory.getProtocol(tmo)
+        oprot.writeMessageBegin(name, TMessageType.REPLY, seqid)
+        return tmo.getvalue()
+
+    def _cbStore(self, value, name, seqid, key, tmo):
+        """Store a successful reply, without its header, in the cache.
+
+        Only the message and first field headers are read: a reply holds
+        field 0 ("success") when the call succeeded, and the field of
+        the exception when it raised one.
+        """
+        msg = tmo.getvalue()
+        iprot = self.inputProtocolFactory.getProtocol(
+            TTransport.TMemoryBuffer(msg))
+        mtype = iprot.readMessageBegin()[1]
+        if mtype != TMessageType.REPLY:
+            return value
+        iprot.readStructBegin()
+        ftype, fid = iprot.readFieldBegin()[1:]
+        if ftype != TType.STOP and fid == 0:
+            header_len = len(self._reply_header(name, seqid))
+            self.response_cache.put(key, msg[header_len:])
+        return value
+
+class FairScheduler(object):
+    """Run service calls on worker threads, sharing the workers fairly
+    between callers.
+
+    Calls are queued per auth token (by a hash of it) and dispatched in
+    weighted fair queueing order: each token is charged for the time its
+    calls take, divided by its weight, and the token that has been
+    charged least goes next. So one caller with a long loop of expensive
+    calls gets its share of the workers, but cannot starve the others.
+
+    Cheap methods (see `DEFAULT_FAST_METHODS`) go in a separate first-come
+    first-served lane, with its own workers, so they do not wait behind
+    expensive calls at all. The other workers also take from the fast
+    lane first.
+
+    The time each call waits in the queue is recorded as the
+    'queue_wait' event in `stats`.
+    """
+    DEFAULT_FAST_METHODS = ('get_info', 'get_taxon', 'get_assembly',
+                            'get_feature_types')
+    #: Initial guess at the duration of a call, in seconds
+    DEFAULT_COST = 0.1
+    #: Weight of the newest sample in the running average of call durations
+    COST_ALPHA = 0.2
+
+    def __init__(self, workers=4, fast_workers=1, fast_methods=None,
+                 weights=None, stats=None, call_from_thread=None):
+        """Constructor.
+
+        Args:
+            workers (int): Number of threads for the normal lane
+            fast_workers (int): Number of threads for the fast lane only
+            fast_methods (list): Names of methods in the fast lane
+            weights (dict): Weight for a token hash (see `token_hash`),
+                            default is 1. A higher weight gets a bigger share.
+            stats (PerfCollector): Where to record queue wait times
+            call_from_thread (function): Used to deliver results to the
+                 caller; default is `twisted.internet.reactor.callFromThread`
+        """
+        assert workers > 0, 'Need at least one worker'
+        self.num_workers, self.num_fast_workers = workers, fast_workers
+        if fast_methods is None:
+            fast_methods = self.DEFAULT_FAST_METHODS
+        self.fast_methods = set(fast_methods)
+        self.weights = weights or {}
+        self.stats = stats or util.PerfCollector(self.__class__.__name__)
+        self._call_from_thread = call_from_thread
+        self._cond = threading.Condition()
+        self._fast = collections.deque()
+        self._queues = {}     # token hash -> deque of jobs
+        self._charged = {}    # token hash -> virtual time charged
+        self._vtime = 0.0     # virtual time of most recently dispatched job
+        self._cost = {}       # method name -> average duration
+        self._ids = itertools.count()
+        self._threads = []
+        self._running = False
+
+    @staticmethod
+    def token_hash(token):
+        return hashlib.sha1(token or '').hexdigest()
+
+    def is_fast(self, method):
+        return method in self.fast_methods
+
+    def set_lane(self, method, fast):
+        """Put `method` in the fast lane, or take it out.
+        """
+        if fast:
+            self.fast_methods.add(method)
+        else:
+            self.fast_methods.discard(method)
+
+    def start(self):
+        """Start the worker threads.
+        """
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        lanes = [False] * self.num_workers + [True] * self.num_fast_workers
+        for i, fast_only in enumerate(lanes):
+            t = threading.Thread(target=self._work, args=(fast_only,),
+                                 name='FairScheduler-{:d}'.format(i))
+            t.daemon = True
+            t.start()
+            self._threads.append(t)
+
+    def stop(self):
+        """Stop the worker threads, after their current call.
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join()
+        self._threads = []
+
+    def submit(self, method, token, func):
+        """Queue a call.
+
+        Args:
+            method (str): Name of service method
+            token (str): Auth token of caller
+            func (function): Called with no arguments, in a worker thread
+        Returns:
+            (twisted.internet.defer.Deferred) Fired with the result
+        """
+        job_id = next(self._ids)
+        d = twisted.internet.defer.Deferred()
+        th = self.token_hash(token)
+        fast = self.is_fast(method)
+        job = (method, th, func, d, job_id, fast)
+        self.stats.start_event('queue_wait', job_id)
+        with self._cond:
+            if fast:
+                self._fast.append(job)
+            else:
+                if th not in self._queues:
+                    self._queues[th] = collections.deque()
+                self._queues[th].append(job)
+            # wake all: a fast-only worker cannot take a normal job
+            self._cond.notify_all()
+        return d
+
+    def queue_length(self):
+        with self._cond:
+            return len(self._fast) + sum(map(len, self._queues.values()))
+
+    def _next_job(self, fast_only):
+        """Take the next job (with the lock held), or None.
+        """
+        if self._fast:
+            return self._fast.popleft()
+        if fast_only or not self._queues:
+            return None
+        # token that has been charged least goes next
+        th = min(self._queues, key=lambda t: max(self._vtime,
+                                                 self._charged.get(t, 0)))
+        queue = self._queues[th]
+        job = queue.popleft()
+        if not queue:
+            del self._queues[th]
+        start = max(self._vtime, self._charged.get(th, 0))
+        self._vtime = start
+        # charge the expected cost now, correct it when the call is done
+        self._charged[th] = start + self._expected_cost(job[0], th)
+        return job
+
+    def _expected_cost(self, method, th):
+        return self._cost.get(method, self.DEFAULT_COST) / \
+            self.weights.get(th, 1.0)
+
+    def _done(self, job, duration):
+        method, th = job[0], job[1]
+        with self._cond:
+            expected = self._expected_cost(method, th)
+            avg = self._cost.get(method, self.DEFAULT_COST)
+            self._cost[method] = avg + self.COST_ALPHA * (duration - avg)
+            if not job[5]:
+                actual = duration / self.weights.get(th, 1.0)
+                self._charged[th] = self._charged.get(th, 0) + \
+                                    actual - expected
+            # forget idle tokens that are behind, they start fresh anyway
+            for t in [t for t, v in self._charged.items()
+                      if v <= self._vtime and t not in self._queues]:
+                del self._charged[t]
+
+    def _work(self, fast_only):
+        call_from_thread = self._call_from_thread or \
+            twisted.internet.reactor.callFromThread
+        while True:
+            with self._cond:
+                job = self._next_job(fast_only)
+                while job is None and self._running:
+                    self._cond.wait()
+                    job = self._next_job(fast_only)
+                if job is None:
+                    return
+            method, th, func, d, job_id, fast = job
+            self.stats.end_event('queue_wait', job_id, method=method,
+                                 lane='fast' if fast else 'normal')
+            t0 = time.time()
+            try:
+                result = func()
+            except Exception:
+                call_from_thread(d.errback, twisted.python.failure.Failure())
+            else:
+                call_from_thread(d.callback, result)
+            self._done(job, time.time() - t0)
+
+class ReplicaRouter(object):
+    """Choose among replicas of a service so that each object is handled
+    by the same replica, whose caches then already hold it.
+
+    Keys (object refs) are placed on a consistent-hash ring with
+    `vnodes` points per replica, so adding or removing a replica only
+    moves the keys next to it. To keep a hot key from overloading its
+    replica, this uses consistent hashing with bounded loads: a replica
+    with more than `load_factor` times the mean number of calls in
+    flight is passed over for the next one on the ring. A replica that
+    fails is skipped for `cooldown` seconds.
+
+    The loads are those of the calls made by this process; use
+    :func:`get_router` to share one router between all connections to
+    the same replicas.
+    """
+    def __init__(self, urls, vnodes=64, load_factor=1.25, cooldown=30):
+        """Constructor.
+
+        Args:
+            urls (list): Replica URLs
+            vnodes (int): Points on the ring for each replica
+            load_factor (float): Maximum load relative to the mean, > 1
+            cooldown (float): Seconds to skip a replica after it fails
+        """
+        assert len(urls) > 0, 'No replica URLs'
+        assert load_factor > 1, 'The "load_factor" must be above 1'
+        self.urls = list(urls)
+        self.load_factor = load_factor
+        self.cooldown = cooldown
+        ring = sorted((self._hash('{}#{:d}'.format(url, i)), url)
+                      for url in self.urls for i in xrange(vnodes))
+        self._points = [p for p, _ in ring]
+        self._owners = [url for _, url in ring]
+        self._load = dict.fromkeys(self.urls, 0)
+        self._dead_until = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash(value):
+        return int(hashlib.md5(value).hexdigest()[:15], 16)
+
+    def candidates(self, key):
+        """Replica URLs to try for `key`, best first.
+
+        Live replicas under the load bound come first, in ring order
+        starting at the key, then overloaded ones, then those that
+        recently failed (as a last resort).
+        """
+        n = len(self.urls)
+        if key is None:
+            start = 0
+        else:
+            start = bisect.bisect(self._points, self._hash(key))
+        ordered, seen = [], set()
+        for i in xrange(len(self._owners)):
+            url = self._owners[(start + i) % len(self._owners)]
+            if url not in seen:
+                seen.add(url)
+                ordered.append(url)
+                if len(ordered) == n:
+                    break
+        now = time.time()
+        with self._lock:
+            alive = [u for u in ordered if self._dead_until.get(u, 0) <= now]
+            dead = [u for u in ordered if u not in alive]
+            total = sum(self._load[u] for u in alive)
+            bound = math.ceil(self.load_factor * (total + 1) /
+                              max(1, len(alive)))
+            under = [u for u in alive if self._load[u] < bound]
+            over = [u for u in alive if self._load[u] >= bound]
+        return under + over + dead
+
+    def acquire(self, url):
+        with self._lock:
+            self._load[url] += 1
+
+    def release(self, url):
+        with self._lock:
+            self._load[url] -= 1
+
+    def mark_dead(self, url):
+        with self._lock:
+            self._dead_until[url] = time.time() + self.cooldown
+
+    def mark_alive(self, url):
+        with self._lock:
+            self._dead_until.pop(url, None)
+
+_routers = {}
+_routers_lock = threading.Lock()
+
+def get_router(urls, **kwargs):
+    """Get the shared `ReplicaRouter` for this list of URLs, creating it
+    with `kwargs` if needed.
+    """
+    rkey = tuple(urls)
+    with _routers_lock:
+        if rkey not in _routers:
+            _routers[rkey] = ReplicaRouter(urls, **kwargs)
+        return _routers[rkey]
+
+#: Socket errors raised when a replica cannot be reached at all, so a
+#: call can safely be sent to another replica
+_CONNECT_ERRNOS = (errno.ECONNREFUSED, errno.EHOSTUNREACH, errno.ENETUNREACH,
+                   errno.EHOSTDOWN, errno.ENETDOWN)
+
+def _is_connect_error(err):
+    """Whether `err` shows that a call never reached the server.
+    """
+    if isinstance(err, socket.gaierror):
+        return True
+    return isinstance(err, socket.error) and \
+        not isinstance(err, socket.timeout) and \
+        err.errno in _CONNECT_ERRNOS
+
+class RoutedHttpClient(TTransport.TTransportBase):
+    """Thrift HTTP transport that sends each call to one of several
+    replicas of a service, chosen by a `ReplicaRouter` from the routing
+    key, and fails over to the next replica if one cannot be reached.
+
+    Only a call that never reached a replica is sent to the next one.
+    A call that timed out or failed once sent may have run, so it
+    raises a `TTransportException` (TIMED_OUT for a timeout) instead.
+    """
+    def __init__(self, urls, key=None, timeout=None, router=None):
+        self.router = router or get_router(urls)
+        self.key = key
+        self._transports = {}
+        for url in urls:
+            transport = THttpClient.THttpClient(url)
+            _set_timeout(transport, timeout)
+            self._transports[url] = transport
+        self._wbuf = StringIO.StringIO()
+        self._current = None
+        self._open = False
+
+    def open(self):
+        self._open = True
+
+    def isOpen(self):
+        return self._open
+
+    def close(self):
+        if self._current is not None and self._current.isOpen():
+            self._current.close()
+        self._current = None
+        self._open = False
+
+    def write(self, buf):
+        self._wbuf.write(buf)
+
+    def read(self, sz):
+        return self._current.read(sz)
+
+    def flush(self):
+        data = self._wbuf.getvalue()
+        self._wbuf = StringIO.StringIO()
+        error = None
+        for url in self.router.candidates(self.key):
+            transport = self._transports[url]
+            self.router.acquire(url)
+            try:
+                transport.write(data)
+                transport.flush()
+                if transport.code >= 500:
+                    raise httplib.HTTPException('HTTP status {:d}'
+                                                .format(transport.code))
+            except socket.timeout as err:
+                if transport.isOpen():
+                    transport.close()
+                raise TTransport.TTransportException(
+                    TTransport.TTransportException.TIMED_OUT,
+                    'Call to {} timed out: {}'.format(url, err))
+            except (socket.error, httplib.HTTPException,
+                    TTransport.TTransportException) as err:
+                error = err
+                self.router.mark_dead(url)
+                if transport.isOpen():
+                    transport.close()
+                if _is_connect_error(err):
+                    continue
+                raise TTransport.TTransportException(
+                    TTransport.TTransportException.UNKNOWN,
+                    'Call to {} failed: {}'.format(url, err))
+            finally:
+                self.router.release(url)
+            self.router.mark_alive(url)
+            self._current = transport
+            return
+        raise TTransport.TTransportException(
+            TTransport.TTransportException.NOT_OPEN,
+            'No replica could be reached, last error: {}'.format(error))
+
 # For service drivers
 
 def start_service(api_class, service_class, log,
-                  services=None, host='localhost', port=9100, killprocgrp=False):
+                  services=None, host='localhost', port=9100, killprocgrp=False,
+                  response_cache=None, scheduler=None):
     """Start a Data API service.
 
     Args:
@@ -192,12 +891,11 @@ def start_service(api_class, service_class, log,
         host (str): Service host (will default to 'localhost')
         port (int): Service port, e.g. 9101
         killprocgrp (bool): if True, kill process group on exit
+        response_cache (doekbase.data_api.cache.ResponseCache): If given,
+                         cache serialized replies in this object.
+        scheduler (FairScheduler): If given, run calls on its workers
     """
-    assert issubclass(api_class, BaseService), \
-        'Invalid "api_class": must be a subclass of ' \
-        'doekbase.data_api.service_core.BaseService'
-    assert hasattr(service_class, 'Processor'), 'Invalid "service_class": ' \
-                                                'missing "Processor" attribute'
+    _check_service(api_class, service_class)
     assert isinstance(port, int), 'The "port" must be an integer'
 
     svc_t0 = util.log_start(log, 'start_service',
@@ -205,11 +903,97 @@ def start_service(api_class, service_class, log,
 
     # Create server
     services = services or SERVICES_DICT
+    resource = _make_resource(api_class, service_class, log, services,
+                              response_cache, scheduler)
+    _run_site(twisted.web.server.Site(resource=resource), api_class.__name__,
+              log, host, port, killprocgrp)
+
+    util.log_end(log, svc_t0, 'start_service',
+                            kvp=dict(host=host, port=port))
+    return 0
+
+def start_services(mounts, log, services=None, host='localhost', port=9100,
+                   killprocgrp=False, response_cache=None, scheduler=None,
+                   l1_max_items=1000, metadata_ttl=300):
+    """Start several Data API services in one process, on one port.
+
+    Each service is mounted at its own URL path, e.g.
+    `http://localhost:9100/assembly`. The services share one in-process
+    L1 object cache, one Workspace metadata cache, and one Workspace
+    connection pool, so an object fetched for one service is
+    not fetched again for another.
+
+    Args:
+        mounts (list): List of tuples (path, api_class, service_class),
+                       where the last two are as for `start_service`.
+        log (logging.Logger): Logging object
+        services (dict): Service configuration dictionary
+        host (str): Service host (will default to 'localhost')
+        port (int): Service port
+        killprocgrp (bool): if True, kill process group on exit
+        response_cache (doekbase.data_api.cache.ResponseCache): If given,
+                         cache serialized replies in this object.
+        scheduler (FairScheduler): If given, run calls of all services
+                         on its workers
+        l1_max_items (int): Maximum number of values in the L1 cache
+        metadata_ttl (float): Seconds to keep Workspace metadata
+    """
+    from doekbase.data_api import cache, core
+    assert len(mounts) > 0, 'No services to start'
+    for _, api_class, service_class in mounts:
+        _check_service(api_class, service_class)
+    assert isinstance(port, int), 'The "port" must be an integer'
+
+    paths = [m[0] for m in mounts]
+    svc_t0 = util.log_start(log, 'start_services',
+                            kvp=dict(host=host, port=port,
+                                     paths=','.join(paths)))
+
+    # Share caches and connections between all services
+    cache.ObjectCache.l1_cache = cache.MemoryCache(max_items=l1_max_items)
+    core.ObjectAPI.metadata_cache = cache.MetadataCache(ttl=metadata_ttl)
+    core.ObjectAPI.ws_session = core.get_ws_session()
+
+    # Create server
+    services = services or SERVICES_DICT
+    root = twisted.web.resource.Resource()
+    for path, api_class, service_class in mounts:
+        resource = _make_resource(api_class, service_class, log, services,
+                                  response_cache, scheduler)
+        root.putChild(path, resource)
+    _run_site(twisted.web.server.Site(resource=root), ','.join(paths),
+              log, host, port, killprocgrp)
+
+    util.log_end(log, svc_t0, 'start_services',
+                 kvp=dict(host=host, port=port, paths=','.join(paths)))
+    return 0
+
+def _check_service(api_class, service_class):
+    assert issubclass(api_class, BaseService), \
+        'Invalid "api_class": must be a subclass of ' \
+        'doekbase.data_api.service_core.BaseService'
+    assert hasattr(service_class, 'Processor'), 'Invalid "service_class": ' \
+                                                'missing "Processor" attribute'
+
+def _make_resource(api_class, service_class, log, services, response_cache,
+                   scheduler):
+    """Create the Twisted resource for one service.
+    """
     handler = api_class(services)
+    if scheduler is not None:
+        handler.scheduler = scheduler
+        scheduler.start()
     processor = service_class.Processor(handler)
     pfactory = TBinaryProtocol.TBinaryProtocolFactory()
-    resource = TTwisted.ThriftResource(processor, pfactory, pfactory)
-    site = twisted.web.server.Site(resource=resource)
+    if response_cache is None:
+        return ThriftResource(processor, pfactory, pfactory)
+    return CachingThriftResource(processor, pfactory, pfactory,
+                                 response_cache=response_cache,
+                                 services=services, log=log)
+
+def _run_site(site, sname, log, host, port, killprocgrp):
+    """Listen on `port` with `site`, and run the reactor.
+    """
     twisted.internet.reactor.listenTCP(port, site, interface=host)
 
     # Kill entire process group on shutdown
@@ -220,7 +1004,6 @@ def start_service(api_class, service_class, log,
                                                            log=log))
 
     # Run server
-    sname = api_class.__name__
     shost = host or 'localhost'
     util.log_start(log, 'server', kvp=dict(name=sname, host=shost, port=port))
     t0 = util.log_start(log, 'twisted.internet.reactor.run',
@@ -235,10 +1018,6 @@ def start_service(api_class, service_class, log,
     finally:
         util.log_end(log, t0, 'twisted.internet.reactor.run')
 
-    util.log_end(log, svc_t0, 'start_service',
-                            kvp=dict(host=host, port=port))
-    return 0
-
 def stop_service():
     twisted.internet.reactor.stop()
 
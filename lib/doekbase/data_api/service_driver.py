@@ -0,0 +1,39 @@
+"""
+Service driver for the Taxon, Assembly and GenomeAnnotation APIs
+running together in one process.
+
+Each service is mounted at its own URL path on the same port, e.g.
+`http://localhost:9104/genome_annotation`.
+"""
+
+# Imports
+# -------
+# Local
+from doekbase.data_api import service_core
+from doekbase.data_api.annotation.genome_annotation.service import \
+    thrift_service as genome_annotation_thrift_service
+from doekbase.data_api.annotation.genome_annotation.service.interface import \
+    GenomeAnnotationService
+from doekbase.data_api.sequence.assembly.service import \
+    thrift_service as assembly_thrift_service
+from doekbase.data_api.sequence.assembly.service.interface import \
+    AssemblyService
+from doekbase.data_api.taxonomy.taxon.service import \
+    thrift_service as taxon_thrift_service
+from doekbase.data_api.taxonomy.taxon.service.interface import TaxonService
+from doekbase.data_api.util import get_logger
+
+_log = get_logger(__name__)
+
+#: URL path, service class, and Thrift module for each service
+MOUNTS = [
+    ('taxon', TaxonService, taxon_thrift_service),
+    ('assembly', AssemblyService, assembly_thrift_service),
+    ('genome_annotation', GenomeAnnotationService,
+     genome_annotation_thrift_service)
+]
+
+def start_service(**kw):
+    return service_core.start_services(MOUNTS, _log, **kw)
+
+stop_service = service_core.stop_service
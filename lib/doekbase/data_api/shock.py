@@ -0,0 +1,525 @@
+"""
+Helpers for reading data from the Shock file service.
+
+Node contents are streamed in modest chunks, so large files (e.g. the
+FASTA file of an Assembly) never need to be held in memory whole.
+Sets of byte ranges are merged into fewer requests, which are made in
+parallel over a pool of kept-alive connections.
+
+Whole node files can also be kept on local disk by a `NodeFileCache`
+(see `set_node_cache`), and read through `mmap`.
+
+Handle ids are mapped to Shock node ids by `resolve_handles`, which
+asks the Handle service once per batch and remembers the answers for
+the life of the process.
+"""
+
+# Imports
+
+# Stdlib
+import collections
+import errno
+import mmap
+import os
+import re
+import string
+import tempfile
+import threading
+# Third-party
+import requests
+# Local
+from doekbase.data_api.cache import LRUDict
+from doekbase.data_api.util import get_logger, check_deadline, \
+    get_deadline, set_deadline, get_thread_pool
+from doekbase.handle.Client import AbstractHandle, ServerError
+
+_log = get_logger(__name__)
+
+#: Bytes read from the network at a time
+STREAM_CHUNK_SIZE = 2**20
+
+#: Byte ranges closer than this are fetched with one request
+MAX_GAP = 2**16
+#: Ranges are not merged beyond this size
+MAX_RANGE_BYTES = 2**26
+#: Number of concurrent range requests
+WORKERS = 8
+
+# Cost model for choosing between ranges and a download of the whole file
+#: Seconds of overhead per request
+REQUEST_LATENCY = 0.05
+#: Bytes per second from Shock
+BANDWIDTH = 50 * 2**20
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Get the process-wide requests Session used for Shock, which keeps
+    up to WORKERS connections alive per host.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=WORKERS,
+                                                    pool_maxsize=WORKERS)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+_node_cache = None
+
+def set_node_cache(node_cache):
+    """Set the process-wide local cache of node files.
+
+    Args:
+        node_cache (NodeFileCache): The cache, or None to disable it
+    """
+    global _node_cache
+    _node_cache = node_cache
+
+def get_node_cache():
+    """Get the cache set by `set_node_cache`, or None.
+    """
+    return _node_cache
+
+#: Number of handle id to node id mappings remembered
+MAX_HANDLES = 100000
+
+# (handle service URL, handle id) -> Shock node id. A handle never
+# points at another node, so entries do not expire.
+_handle_nodes = LRUDict(MAX_HANDLES)
+
+def resolve_handles(handle_service_url, token, hids):
+    """Get the Shock node ids for a list of handle ids.
+
+    Ids not seen before in this process are looked up together, with
+    one `hids_to_handles` call. If the Handle service rejects the batch,
+    the ids are retried one at a time so one bad id does not hide the
+    rest. Ids that still cannot be resolved are logged, left out of the
+    result, and looked up again next time.
+
+    Args:
+        handle_service_url (str): Handle service URL
+        token (str): Authorization token
+        hids (list): Handle ids
+    Returns:
+        dict of handle id to Shock node id
+    Raises:
+        requests.RequestException: if the Handle service cannot be reached
+    """
+    result, missing = {}, []
+    for hid in hids:
+        node_id = _handle_nodes.get((handle_service_url, hid))
+        if node_id is None:
+            missing.append(hid)
+        else:
+            result[hid] = node_id
+    if not missing:
+        return result
+    client = AbstractHandle(url=handle_service_url, token=token)
+    batches = [missing]
+    while batches:
+        batch = batches.pop()
+        check_deadline('handle.hids_to_handles')
+        try:
+            handles = client.hids_to_handles(batch)
+        except ServerError as err:
+            if len(batch) > 1:
+                batches.extend([hid] for hid in batch)
+            else:
+                _log.warn('Cannot resolve handle {} from {}: {}'.format(
+                    batch[0], handle_service_url, err))
+            continue
+        for handle in handles:
+            _handle_nodes[(handle_service_url, handle['hid'])] = handle['id']
+            result[handle['hid']] = handle['id']
+    return result
+
+def node_url(shock_url, node_id):
+    """URL of a Shock node.
+    """
+    if not shock_url.endswith('/'):
+        shock_url += '/'
+    return shock_url + 'node/' + node_id
+
+def iter_node(shock_url, node_id, token, start=0, length=0,
+              chunk_size=STREAM_CHUNK_SIZE):
+    """Stream the contents of a Shock node.
+
+    Args:
+        shock_url (str): Shock service URL
+        node_id (str): Shock node identifier
+        token (str): Authorization token
+        start (int): Offset of first byte to read
+        length (int): Number of bytes to read; if both this and `start`
+                      are 0, read the whole file.
+        chunk_size (int): Maximum size of each chunk
+    Returns:
+        iterator over chunks (str) of the data
+    Raises:
+        requests.HTTPError: if Shock returns an error status
+    """
+    url = node_url(shock_url, node_id)
+    if start == 0 and length == 0:
+        url += '?download_raw'
+    else:
+        url += '?download&seek={:d}&length={:d}'.format(start, length)
+    check_deadline('shock.download')
+    headers = {'Authorization': 'Oauth {0}'.format(token)}
+    response = get_session().get(url, headers=headers, stream=True)
+    try:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size):
+            if chunk:
+                yield chunk
+    finally:
+        response.close()
+
+def iter_regions(chunks, regions, offset=0, strip=string.whitespace):
+    """Cut regions out of a stream of chunks, emitting each region as
+    soon as its last byte has arrived.
+
+    Args:
+        chunks (iterable): Chunks (str) of the data
+        regions (list): Tuples (key, start, num_bytes), where start is
+                        the offset of the region in the data. Must be
+                        sorted by start, and not overlap.
+        offset (int): Offset in the data of the first chunk
+        strip (str): Characters to remove from each region, e.g. newlines
+    Returns:
+        iterator over tuples (key, region_data)
+    """
+    pieces = []
+    for key, piece, is_last in iter_region_pieces(chunks, regions,
+                                                  offset=offset, strip=strip):
+        pieces.append(piece)
+        if is_last:
+            yield key, ''.join(pieces)
+            pieces = []
+
+def iter_region_pieces(chunks, regions, offset=0, strip=string.whitespace):
+    """Cut regions out of a stream of chunks, as `iter_regions` does, but
+    emit the part of each region in each chunk as it arrives, so that no
+    region is ever held whole.
+
+    Args:
+        chunks, regions, offset, strip: See `iter_regions`
+    Returns:
+        iterator over tuples (key, piece, is_last), where is_last is True
+        for the final (possibly empty) piece of a region.
+    """
+    regions = iter(regions)
+    cur = next(regions, None)
+    for chunk in chunks:
+        chunk_end = offset + len(chunk)
+        while cur is not None:
+            key, start, num_bytes = cur
+            end = start + num_bytes
+            if start >= chunk_end:
+                break
+            piece = chunk[max(start - offset, 0):min(end, chunk_end) - offset]
+            if strip:
+                piece = piece.translate(None, strip)
+            if end > chunk_end:
+                if piece:
+                    yield key, piece, False
+                break
+            yield key, piece, True
+            cur = next(regions, None)
+        if cur is None:
+            return
+        offset = chunk_end
+    if cur is not None:
+        raise ValueError('Data ended at offset {:d} before region "{}"'
+                         .format(offset, cur[0]))
+
+def iter_mapped_chunks(data, start=0, length=0,
+                       chunk_size=STREAM_CHUNK_SIZE):
+    """Read part of a mapped node file in chunks, like `iter_node`.
+
+    Args:
+        data (mmap.mmap): Contents of the node, from `NodeFileCache.open`.
+                          It is not closed.
+        start (int): Offset of first byte to read
+        length (int): Number of bytes to read; if both this and `start`
+                      are 0, read the whole file.
+        chunk_size (int): Maximum size of each chunk
+    Returns:
+        iterator over chunks (str) of the data
+    """
+    end = len(data) if start == 0 and length == 0 \
+        else min(start + length, len(data))
+    for pos in xrange(start, end, chunk_size):
+        yield data[pos:min(pos + chunk_size, end)]
+
+def coalesce_regions(regions, max_gap=MAX_GAP, max_bytes=MAX_RANGE_BYTES):
+    """Merge regions that are close together into larger byte ranges.
+
+    Args:
+        regions (list): Tuples (key, start, num_bytes), sorted by start
+        max_gap (int): Merge regions with at most this many bytes between
+        max_bytes (int): Don't grow a merged range beyond this size
+    Returns:
+        list of tuples (start, num_bytes, regions_in_range)
+    """
+    ranges = []
+    for region in regions:
+        start, end = region[1], region[1] + region[2]
+        if ranges:
+            r_start, r_end, r_regions = ranges[-1]
+            if start - r_end <= max_gap and end - r_start <= max_bytes:
+                ranges[-1] = (r_start, max(r_end, end), r_regions + [region])
+                continue
+        ranges.append((start, end, [region]))
+    return [(start, end - start, rr) for start, end, rr in ranges]
+
+def prefer_full_download(regions, file_size, max_gap=MAX_GAP,
+                         workers=WORKERS):
+    """Estimate whether downloading the whole file is faster than
+    fetching just the given regions.
+
+    Args:
+        regions (list): Tuples (key, start, num_bytes), sorted by start
+        file_size (int): Size of the whole file, in bytes
+    Returns:
+        (bool) True if the whole file should be downloaded
+    """
+    ranges = coalesce_regions(regions, max_gap=max_gap)
+    range_bytes = sum(r[1] for r in ranges)
+    rounds = (len(ranges) + workers - 1) // workers
+    ranges_cost = rounds * REQUEST_LATENCY + range_bytes * 1.0 / BANDWIDTH
+    full_cost = REQUEST_LATENCY + file_size * 1.0 / BANDWIDTH
+    return full_cost <= ranges_cost
+
+def iter_ranges(shock_url, node_id, token, regions, max_gap=MAX_GAP,
+                workers=WORKERS, strip=string.whitespace):
+    """Fetch regions of a Shock node with a few parallel range requests.
+
+    Args:
+        shock_url (str): Shock service URL
+        node_id (str): Shock node identifier
+        token (str): Authorization token
+        regions (list): Tuples (key, start, num_bytes), sorted by start
+        max_gap (int): See `coalesce_regions`
+        workers (int): Maximum number of requests at a time
+        strip (str): Characters to remove from each region, e.g. newlines
+    Returns:
+        iterator over tuples (key, region_data), in order of `regions`,
+        as for `iter_regions`.
+    """
+    ranges = coalesce_regions(regions, max_gap=max_gap)
+    pool = get_thread_pool('shock', WORKERS)
+    deadline = get_deadline()
+
+    def fetch(rng):
+        start, num_bytes, rng_regions = rng
+        set_deadline(deadline)
+        try:
+            chunks = iter_node(shock_url, node_id, token, start=start,
+                               length=num_bytes)
+            return list(iter_regions(chunks, rng_regions, offset=start,
+                                     strip=strip))
+        finally:
+            set_deadline(None)
+
+    # keep at most `workers` requests going, and yield in order
+    pending = collections.deque()
+    ranges = iter(ranges)
+    for rng in ranges:
+        pending.append(pool.apply_async(fetch, (rng,)))
+        if len(pending) >= workers:
+            break
+    while pending:
+        result = pending.popleft().get()
+        rng = next(ranges, None)
+        if rng is not None:
+            pending.append(pool.apply_async(fetch, (rng,)))
+        for item in result:
+            yield item
+
+def iter_mapped_regions(data, regions, strip=string.whitespace):
+    """Cut regions out of a mapped node file.
+
+    The mapping is closed when the iterator is exhausted or discarded.
+
+    Args:
+        data (mmap.mmap): Contents of the node, from `NodeFileCache.open`
+        regions (list): Tuples (key, start, num_bytes)
+        strip (str): Characters to remove from each region, e.g. newlines
+    Returns:
+        iterator over tuples (key, region_data)
+    Raises:
+        ValueError: if a region is past the end of the file
+    """
+    try:
+        size = len(data)
+        for key, start, num_bytes in regions:
+            if start + num_bytes > size:
+                raise ValueError('Data ended at offset {:d} before region '
+                                 '"{}"'.format(size, key))
+            piece = data[start:start + num_bytes]
+            yield key, piece.translate(None, strip) if strip else piece
+    finally:
+        data.close()
+
+
+class NodeFileCache(object):
+    """Host-local cache of whole Shock node files, keyed by node id,
+    with least-recently-used files removed to stay within a disk budget.
+
+    Files are downloaded to a temporary name and renamed into place, so
+    several processes can share one directory and never see a partial
+    file. Each read updates the file's modification time, which orders
+    the files for eviction.
+
+    No access check is made on a hit: callers must only ask for nodes
+    that the token could already see, e.g. a node found through a handle
+    of a Workspace object that was read with the same token.
+    """
+    SUFFIX = '.node'
+    #: Number of locks shared by all node ids, so that downloads of the
+    #: same node wait for each other without a lock per node
+    LOCK_STRIPES = 64
+    _valid_id = re.compile(r'^[\w-]+$')
+
+    def __init__(self, directory, max_bytes):
+        """Create cache.
+
+        Args:
+            directory (str): Where to keep the files; created if missing
+            max_bytes (int): Disk budget for all files in the directory
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._node_locks = [threading.Lock()
+                            for _ in range(self.LOCK_STRIPES)]
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def path(self, node_id):
+        """Local path of the file for a node.
+        """
+        if not self._valid_id.match(node_id):
+            raise ValueError('Bad Shock node id: {}'.format(node_id))
+        return os.path.join(self.directory, node_id + self.SUFFIX)
+
+    def open(self, shock_url, node_id, token, size=None):
+        """Map the file of a node into memory, downloading it on a miss.
+
+        Args:
+            shock_url (str): Shock service URL
+            node_id (str): Shock node identifier
+            token (str): Authorization token, used only on a miss
+            size (int): Expected file size, if known. Nodes larger than
+                        the whole budget are not cached.
+        Returns:
+            (mmap.mmap) read-only contents, or None if the node is too
+            large to cache. The caller must close it.
+        Raises:
+            requests.HTTPError: if Shock returns an error status
+        """
+        if size is not None and size > self.max_bytes:
+            return None
+        path = self.path(node_id)
+        f = self._open(path)
+        if f is None:
+            with self._node_lock(node_id):
+                # another thread may have downloaded it while we waited
+                f = self._open(path)
+                if f is None:
+                    self.misses += 1
+                    if not self._download(shock_url, node_id, token, path):
+                        return None
+                    f = self._open(path)
+                    if f is None:
+                        return None
+                else:
+                    self.hits += 1
+        else:
+            self.hits += 1
+        try:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            f.close()
+
+    def nbytes(self):
+        """Total size of the cached files.
+        """
+        return sum(size for _, size, _ in self._list_files())
+
+    def _node_lock(self, node_id):
+        return self._node_locks[hash(node_id) % len(self._node_locks)]
+
+    @staticmethod
+    def _open(path):
+        """Open file and mark it as used, or return None if missing.
+        """
+        try:
+            f = open(path, 'rb')
+        except IOError as err:
+            if err.errno == errno.ENOENT:
+                return None
+            raise
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass  # evicted by another process; the open file is still good
+        return f
+
+    def _download(self, shock_url, node_id, token, path):
+        """Download node to `path`. Returns False if it is too large.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            nbytes = 0
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in iter_node(shock_url, node_id, token):
+                    nbytes += len(chunk)
+                    if nbytes > self.max_bytes:
+                        _log.info('Shock node {} is larger than the node '
+                                  'cache'.format(node_id))
+                        return False
+                    f.write(chunk)
+            self._evict(self.max_bytes - nbytes)
+            os.rename(tmp_path, path)
+            tmp_path = None
+        finally:
+            if tmp_path is not None:
+                os.unlink(tmp_path)
+        return True
+
+    def _list_files(self):
+        """Get (path, size, mtime) of cached files, oldest first.
+        """
+        result = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            result.append((path, st.st_size, st.st_mtime))
+        result.sort(key=lambda x: x[2])
+        return result
+
+    def _evict(self, max_bytes):
+        """Remove oldest files until at most `max_bytes` remain.
+        """
+        files = self._list_files()
+        total = sum(f[1] for f in files)
+        for path, size, _ in files:
+            if total <= max_bytes:
+                break
+            try:
+                os.unlink(path)
+                self.evictions += 1
+            except OSError:
+                pass  # removed by another process
+            total -= size
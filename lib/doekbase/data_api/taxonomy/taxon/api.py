@@ -360,12 +360,13 @@ class TaxonClientAPI(TaxonInterface):
         return wrapper
 
     @logged(_tc_log, log_name='init')
-    def __init__(self, url=None, token=None, ref=None):
+    def __init__(self, url=None, token=None, ref=None, timeout=None):
         from doekbase.data_api.taxonomy.taxon.service.interface import TaxonClientConnection
 
         #TODO add exception handling and better error messages here
         self.url = url
-        self.transport, self.client = TaxonClientConnection(url).get_client()
+        self.transport, self.client = TaxonClientConnection(
+            url, timeout=timeout, key=ref).get_client()
         self.ref = ref
         self._token = token
 
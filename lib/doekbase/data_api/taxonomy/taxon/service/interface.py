@@ -17,8 +17,9 @@ _log = logging.getLogger('.'.join([__name__, 'service']))
 class TaxonClientConnection(service_core.BaseClientConnection):
     """Provides a client connection to the running Taxon API service.
     """
-    def __init__(self, url="http://localhost:9101"):
-        service_core.BaseClientConnection.__init__(self, thrift_client, url)
+    def __init__(self, url="http://localhost:9101", timeout=None, key=None):
+        service_core.BaseClientConnection.__init__(self, thrift_client, url,
+                                                   timeout=timeout, key=key)
 
 
 class TaxonService(service_core.BaseService):
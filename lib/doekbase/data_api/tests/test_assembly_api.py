@@ -2,6 +2,7 @@
 Unit tests for assembly
 """
 import logging
+import StringIO
 from unittest import skipUnless
 
 from . import shared
@@ -10,6 +11,7 @@ from doekbase.data_api.sequence.assembly.api import AssemblyAPI
 from doekbase.data_api.sequence.assembly.api import AssemblyClientAPI
 from doekbase.data_api.sequence.assembly.api import _KBaseGenomes_ContigSet
 from doekbase.data_api.sequence.assembly.api import _Assembly
+from doekbase.data_api.sequence.assembly.api import reverse_complement
 
 _log = logging.getLogger(__name__)
 
@@ -171,6 +173,79 @@ def test_get_contigs_new():
     assert isinstance(contigs_c, dict) and len(contigs_c) > 0
 
 
+def _check_metrics(api):
+    metrics = api.get_assembly_metrics()
+    _log.info("Output {}".format(metrics))
+    lengths = sorted(api.get_contig_lengths().values(), reverse=True)
+    assert metrics["num_contigs"] == len(lengths)
+    assert metrics["dna_size"] == sum(lengths)
+    assert metrics["longest_contig"] == lengths[0]
+    assert metrics["shortest_contig"] == lengths[-1]
+    assert sum(lengths[:metrics["l50"]]) * 2 >= sum(lengths)
+    assert sum(lengths[:metrics["l50"] - 1]) * 2 < sum(lengths)
+    assert metrics["n50"] == lengths[metrics["l50"] - 1]
+    assert sum(metrics["histogram_counts"]) == len(lengths)
+    return metrics
+
+
+@skipUnless(shared.can_connect, 'Cannot connect to workspace')
+def test_get_assembly_metrics_new():
+    _log.info("Input {}".format(assembly_new))
+    metrics = _check_metrics(t_new)
+    assert _check_metrics(t_new_e) == metrics
+    assert _check_metrics(t_client_new) == metrics
+
+
+def _check_subsequences(api):
+    lengths = api.get_contig_lengths()
+    contig_id = max(lengths, key=lengths.get)
+    sequence = api.get_contigs([contig_id])[contig_id]["sequence"]
+    n = min(lengths[contig_id], 500)
+    regions = [{"contig_id": contig_id, "start": 1, "length": n, "strand": "+"},
+               {"contig_id": contig_id, "start": lengths[contig_id], "length": n, "strand": "-"},
+               {"contig_id": contig_id, "start": n // 2, "length": n // 3, "strand": "+"}]
+    result = api.get_contig_subsequences(regions)
+    _log.info("Output {}".format([len(x) for x in result]))
+    assert result[0] == sequence[:n]
+    assert result[1] == reverse_complement(sequence[-n:])
+    assert result[2] == sequence[n // 2 - 1:n // 2 - 1 + n // 3]
+    return result
+
+
+@skipUnless(shared.can_connect and not g_skip_shock, 'Cannot connect to workspace')
+def test_get_contig_subsequences_new():
+    _log.info("Input {}".format(assembly_new))
+    result = _check_subsequences(t_new)
+    assert _check_subsequences(t_new_e) == result
+    assert _check_subsequences(t_client_new) == result
+
+
+def _check_export_fasta(api):
+    lengths = api.get_contig_lengths()
+    contig_ids = sorted(lengths, key=lengths.get)[:3]
+    contigs = api.get_contigs(contig_ids)
+    out = StringIO.StringIO()
+    assert api.export_fasta(out, contig_ids, line_width=7) == len(contig_ids)
+    records = out.getvalue().split('>')[1:]
+    _log.info("Output {:d} records".format(len(records)))
+    assert len(records) == len(contig_ids)
+    for rec in records:
+        lines = rec.rstrip('\n').split('\n')
+        contig_id = lines[0].split(' ')[0]
+        assert all(len(x) == 7 for x in lines[1:-1])
+        assert 0 < len(lines[-1]) <= 7
+        assert ''.join(lines[1:]) == contigs[contig_id]["sequence"]
+    return out.getvalue()
+
+
+@skipUnless(shared.can_connect and not g_skip_shock, 'Cannot connect to workspace')
+def test_export_fasta_new():
+    _log.info("Input {}".format(assembly_new))
+    result = _check_export_fasta(t_new)
+    assert _check_export_fasta(t_new_e) == result
+    assert _check_export_fasta(t_client_new) == result
+
+
 ###### Old Assembly Type tests
 
 
@@ -303,4 +378,28 @@ def test_get_contigs_old():
     contigs_e = t_old_e.get_contigs()
     assert isinstance(contigs_e, dict) and len(contigs_e) > 0
     contigs_c = t_client_old.get_contigs()
-    assert isinstance(contigs_c, dict) and len(contigs_c) > 0
\ No newline at end of file
+    assert isinstance(contigs_c, dict) and len(contigs_c) > 0
+
+
+@skipUnless(shared.can_connect, 'Cannot connect to workspace')
+def test_get_contig_subsequences_old():
+    _log.info("Input {}".format(assembly_old))
+    result = _check_subsequences(t_old)
+    assert _check_subsequences(t_old_e) == result
+    assert _check_subsequences(t_client_old) == result
+
+
+@skipUnless(shared.can_connect, 'Cannot connect to workspace')
+def test_get_assembly_metrics_old():
+    _log.info("Input {}".format(assembly_old))
+    metrics = _check_metrics(t_old)
+    assert _check_metrics(t_old_e) == metrics
+    assert _check_metrics(t_client_old) == metrics
+
+
+@skipUnless(shared.can_connect, 'Cannot connect to workspace')
+def test_export_fasta_old():
+    _log.info("Input {}".format(assembly_old))
+    result = _check_export_fasta(t_old)
+    assert _check_export_fasta(t_old_e) == result
+    assert _check_export_fasta(t_client_old) == result
@@ -0,0 +1,154 @@
+"""
+Test the Assembly API against a local (file) workspace, with a local
+HTTP server standing in for the Shock and Handle services.
+"""
+
+# stdlib
+import BaseHTTPServer
+import StringIO
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest as ut
+import urlparse
+# third-party
+import msgpack
+# local
+from doekbase.data_api.sequence.assembly import api as assembly_api
+
+ASSEMBLY_REF = '9200/1/1'
+# contigs in file order, which differs from the order of their ids
+CONTIGS = [('c2', 'ACGTACGTAC' * 7), ('c1', 'GGGCCC'), ('c3', 'TTTTAAAA' * 5)]
+
+def make_fasta(contigs, width=60):
+    """FASTA text, and the (start, num_bytes) of each sequence in it.
+    """
+    parts, positions, pos = [], {}, 0
+    for contig_id, sequence in contigs:
+        header = '>{}\n'.format(contig_id)
+        lines = ''.join(sequence[i:i + width] + '\n'
+                        for i in range(0, len(sequence), width))
+        positions[contig_id] = (pos + len(header), len(lines))
+        parts.append(header + lines)
+        pos += len(header) + len(lines)
+    return ''.join(parts), positions
+
+FASTA, POSITIONS = make_fasta(CONTIGS)
+
+
+class ServiceHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Serve FASTA for any Shock node, and resolve every handle to a
+    node of the same name.
+    """
+    def do_GET(self):
+        query = urlparse.parse_qs(urlparse.urlparse(self.path).query,
+                                  keep_blank_values=True)
+        start = int(query.get('seek', ['0'])[0])
+        length = int(query.get('length', [len(FASTA)])[0])
+        self._reply(FASTA[start:start + length])
+
+    def do_POST(self):
+        call = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        hids = call['params'][0]
+        self._reply(json.dumps({'result': [[{'hid': h, 'id': h}
+                                             for h in hids]]}))
+
+    def _reply(self, body):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def save_object(path, ref, type_string, data):
+    """Write an object in the form read by `wsfile.WorkspaceFile`.
+    """
+    name = ref.replace('/', '_')
+    with open(os.path.join(path, name + '.msgpack'), 'wb') as f:
+        msgpack.dump({'ref': ref, 'type': type_string, 'name': 'obj' + name,
+                      'links': [], 'data': data, 'metadata': {}}, f)
+
+def save_assembly(path):
+    contigs = {}
+    for contig_id, sequence in CONTIGS:
+        start, num_bytes = POSITIONS[contig_id]
+        contigs[contig_id] = {
+            'contig_id': contig_id, 'length': len(sequence),
+            'gc_content': 0.5, 'md5': '', 'name': contig_id,
+            'description': '', 'is_complete': 1, 'is_circular': 0,
+            'start_position': start, 'num_bytes': num_bytes}
+    save_object(path, ASSEMBLY_REF, 'KBaseGenomeAnnotations.Assembly-1.0',
+                {'assembly_id': 'assembly', 'contigs': contigs,
+                 'fasta_handle_ref': 'node1', 'num_contigs': len(contigs),
+                 'dna_size': sum(len(s) for _, s in CONTIGS)})
+
+
+class LocalAssemblyTestCase(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.path = tempfile.mkdtemp()
+        save_assembly(cls.path)
+        cls.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0),
+                                               ServiceHandler)
+        thr = threading.Thread(target=cls.server.serve_forever)
+        thr.daemon = True
+        thr.start()
+        url = 'http://127.0.0.1:{:d}/'.format(cls.server.server_port)
+        cls.services = {'workspace_service_url': cls.path,
+                        'shock_service_url': url,
+                        'handle_service_url': url}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        shutil.rmtree(cls.path)
+
+    def setUp(self):
+        self.api = assembly_api.AssemblyAPI(self.services, None, ASSEMBLY_REF)
+
+
+class TestContigs(LocalAssemblyTestCase):
+    def test_repeated_ids(self):
+        ids = [c for c, _ in
+               self.api.proxy.iter_contigs(['c3', 'c1', 'c3', 'c1'])]
+        self.assertEqual(sorted(ids), ['c1', 'c3'])
+        contigs = self.api.get_contigs(['c2', 'c2'])
+        self.assertEqual(contigs.keys(), ['c2'])
+        self.assertEqual(contigs['c2']['sequence'], dict(CONTIGS)['c2'])
+
+    def test_contig_order(self):
+        self.assertEqual(self.api.get_contig_ids(), ['c2', 'c1', 'c3'])
+        ids = [c for c, _ in self.api.proxy.iter_contigs(['c3', 'c2', 'c3'])]
+        self.assertEqual(ids, ['c3', 'c2'])
+        ids = [c for c, _ in self.api.proxy.iter_contigs()]
+        self.assertEqual(ids, ['c2', 'c1', 'c3'])
+
+
+class TestExportFasta(LocalAssemblyTestCase):
+    def headers(self, contig_id_list=None):
+        out = StringIO.StringIO()
+        self.api.export_fasta(out, contig_id_list)
+        return [line[1:] for line in out.getvalue().splitlines()
+                if line.startswith('>')]
+
+    def test_order(self):
+        self.assertEqual(self.headers(), ['c2', 'c1', 'c3'])
+        self.assertEqual(self.headers(['c3', 'c1', 'c2']), ['c3', 'c1', 'c2'])
+        self.assertEqual(self.headers(['c1', 'c3', 'c1']), ['c1', 'c3'])
+
+    def test_sequences(self):
+        out = StringIO.StringIO()
+        self.assertEqual(self.api.export_fasta(out, ['c3', 'c2']), 2)
+        expected, _ = make_fasta([CONTIGS[2], CONTIGS[0]])
+        self.assertEqual(out.getvalue(), expected)
+
+    def test_unknown_contig(self):
+        out = StringIO.StringIO()
+        self.assertRaises(ValueError, self.api.export_fasta, out,
+                          ['c1', 'nope'])
+        self.assertEqual(out.getvalue(), '')
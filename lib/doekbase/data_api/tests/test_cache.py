@@ -5,15 +5,21 @@ __author__ = 'Dan Gunter <dkgunter@lbl.gov>'
 __date__ = '9/30/15'
 
 # System
+import hashlib
 import os
+import shutil
+import tempfile
 import threading
 import time
 import unittest
 # Third-party
 from dogpile.cache.api import NO_VALUE
+import msgpack
 # Local
 from doekbase.data_api import cache
+from doekbase.data_api.sequence.packed import PackedSequence
 from doekbase.data_api import util
+from doekbase.data_api import wsfile
 from doekbase.data_api.core import ObjectAPI
 from . import shared
 
@@ -189,20 +195,6 @@ class TestCachedObjectAPI(unittest.TestCase):
         self.new_object = ObjectAPI(services=services,
                                     ref=self.genome_new)
 
-    # def test_extract_paths(self):
-    #     data = {'a1': {'b1': {'c1': 1, 'c2': 2}, 'b2': {'d1': 3}}}
-    #     paths = ['a1/b1', 'a1/b1/c2', 'a1/b2/d1', 'a1/b1/N', 'N', 'a1/N']
-    #     r = cache.ObjectCache.extract_paths(data, paths)
-    #     assert len(r) == 3, 'Wrong number of results, got {:d} expected {:d}'.\
-    #         format(len(r), 3)
-    #     msg = 'Invalid result "{r}" for path "{p}"'
-    #     assert r['a1/b1'] == {'a1': {'b1': {'c1': 1, 'c2': 2}}}, \
-    #         msg.format(r=r[0], p=paths[0])
-    #     assert r['a1/b1/c2'] == {'a1': {'b1': {'c2': 2}}}, msg.format(r=r[1],
-    #                                                            p=paths[1])
-    #     assert r['a1/b2/d1'] == {'a1': {'b2':{'d1': 3}}}, msg.format(r=r[2],
-    #                                                           p=paths[2])
-
     def test_get_new_data(self):
         self.new_object.get_data()
         event = self.new_object.cache_stats.get_last()
@@ -231,3 +223,132 @@ class TestCachedObjectAPI(unittest.TestCase):
             assert method in g.stats.get_last().event
             _log.info('New genome {:20s}  {:.3f} seconds'.format(
                 method, g.stats.get_last().duration))
+
+class TestSharedCaches(unittest.TestCase):
+    """Test the in-process caches shared by services in one process.
+    """
+    def tearDown(self):
+        cache.ObjectCache.l1_cache = None
+        cache.ObjectCache.pack_sequences = False
+
+    def test_lru_dict(self):
+        d = cache.LRUDict(2)
+        d['a'], d['b'] = 1, 2
+        self.assertEqual(d['a'], 1)  # now 'b' is oldest
+        d['c'] = 3
+        self.assertFalse('b' in d)
+        self.assertEqual(len(d), 2)
+        self.assertRaises(KeyError, d.__getitem__, 'b')
+
+    def test_metadata_ttl(self):
+        calls = []
+        creator = lambda: calls.append(1) or len(calls)
+        mc = cache.MetadataCache(ttl=60)
+        self.assertEqual(mc.get_or_create('k', creator), 1)
+        self.assertEqual(mc.get_or_create('k', creator), 1)
+        mc.ttl = 0
+        self.assertEqual(mc.get_or_create('k', creator), 2)
+
+    def test_l1_shared(self):
+        cache.ObjectCache.l1_cache = cache.MemoryCache(max_items=10)
+        calls = []
+        creator = lambda: calls.append(1) or {'x': 1}
+        for public in (True, True):
+            c = cache.ObjectCache('1/2/3', is_public=public)
+            self.assertEqual(c.get_data(creator), {'x': 1})
+        self.assertEqual(len(calls), 1)
+        # private objects are not kept in L1
+        for i in range(2):
+            c = cache.ObjectCache('1/2/4', is_public=False)
+            c.get_data(creator)
+        self.assertEqual(len(calls), 3)
+
+    def test_subset_from_l1(self):
+        cache.ObjectCache.l1_cache = cache.MemoryCache(max_items=10)
+        data = {'contigs': [{'id': 'c1', 'length': 3, 'sequence': 'ACG'}]}
+        calls = []
+        creator = lambda path_list=None: calls.append(path_list) or {}
+        c = cache.ObjectCache('1/2/3')
+        c.get_data(lambda: data)
+        r = c.get_data_subset(creator, path_list=['contigs/[*]/length'])
+        self.assertEqual(r, {'contigs': [{'length': 3}]})
+        self.assertEqual(calls, [])
+
+    def test_subset_copied_from_l1(self):
+        cache.ObjectCache.l1_cache = cache.MemoryCache(max_items=10)
+        data = {'features': {'f1': {'aliases': ['a']}}}
+        c = cache.ObjectCache('1/2/3')
+        c.get_data(lambda: data)
+        r = c.get_data_subset(None, path_list=['features/f1'])
+        r['features']['f1']['aliases'].append('b')
+        self.assertEqual(data['features']['f1']['aliases'], ['a'])
+
+    def test_unversioned_info(self):
+        # only info for a fixed version of an object is remembered
+        self.assertTrue(util.is_versioned_ref('93/111124/2'))
+        self.assertFalse(util.is_versioned_ref('93/111124'))
+        self.assertFalse(util.is_versioned_ref('ws/obj'))
+        path = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(path, '9400_1_1.msgpack'), 'wb') as f:
+                msgpack.dump({'ref': '9400/1/1', 'name': 'obj9400',
+                              'type': 'KBaseGenomes.Genome-8.0',
+                              'links': [], 'metadata': {},
+                              'data': {'features': []}}, f)
+            ObjectAPI.metadata_cache = cache.MetadataCache()
+            services = {'workspace_service_url': path}
+            token_hash = hashlib.sha1('').hexdigest()
+            ObjectAPI(services, None, '9400/1/1')
+            # stands for the latest version
+            loaded = wsfile.WorkspaceFile._loaded
+            loaded['9400/1'] = loaded['9400/1/1']
+            for ref, cached in (('9400/1', False), ('9400/1/1', True)):
+                ObjectAPI(services, None, ref)
+                info = ObjectAPI.metadata_cache.get(('info', token_hash, ref))
+                self.assertEqual(info is not None, cached)
+        finally:
+            ObjectAPI.metadata_cache = None
+            shutil.rmtree(path)
+
+    def test_pack_sequences(self):
+        cache.ObjectCache.l1_cache = cache.MemoryCache(max_items=10)
+        cache.ObjectCache.pack_sequences = True
+        data = {'contigs': [{'id': 'c1', 'sequence': 'ACGT' * 100}]}
+        c = cache.ObjectCache('1/2/3')
+        self.assertEqual(c.get_data(lambda: data), data)
+        packed = c.get_data(None, packed=True)['contigs'][0]['sequence']
+        self.assertTrue(isinstance(packed, PackedSequence))
+        r = c.get_data_subset(None, path_list=['contigs/[*]/sequence'])
+        self.assertEqual(r, {'contigs': [{'sequence': 'ACGT' * 100}]})
+
+    def test_packed_genome_features(self):
+        # Feature methods of an old Genome decode only what they return
+        from doekbase.data_api.annotation.genome_annotation.api import \
+            GenomeAnnotationAPI
+        cache.ObjectCache.l1_cache = cache.MemoryCache(max_items=10)
+        cache.ObjectCache.pack_sequences = True
+        features = [{'id': 'f{:d}'.format(i), 'type': 'CDS',
+                     'location': [['contig1', 1, '+', 400]],
+                     'dna_sequence': 'ACGT' * 100, 'md5': '',
+                     'dna_sequence_length': 400} for i in range(3)]
+        path = tempfile.mkdtemp()
+        unpack_sequences = cache.unpack_sequences
+        unpacked = []
+        cache.unpack_sequences = lambda data: unpacked.append(data) or \
+            unpack_sequences(data)
+        try:
+            with open(os.path.join(path, '9300_1_1.msgpack'), 'wb') as f:
+                msgpack.dump({'ref': '9300/1/1', 'name': 'genome',
+                              'type': 'KBaseGenomes.Genome-8.0',
+                              'links': [], 'metadata': {},
+                              'data': {'features': features}}, f)
+            genome = GenomeAnnotationAPI(
+                {'workspace_service_url': path}, None, '9300/1/1')
+            result = genome.get_features(['f0', 'f2'])
+            self.assertEqual(result['f2']['feature_dna_sequence'],
+                             'ACGT' * 100)
+            self.assertEqual(genome.get_feature_type_counts(), {'CDS': 3})
+            self.assertEqual(unpacked, [])
+        finally:
+            cache.unpack_sequences = unpack_sequences
+            shutil.rmtree(path)
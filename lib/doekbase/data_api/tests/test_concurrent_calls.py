@@ -0,0 +1,149 @@
+"""
+Test API calls made from several threads at once, against a local
+(file) workspace.
+"""
+
+# stdlib
+import os
+import shutil
+import tempfile
+import threading
+import unittest as ut
+# third-party
+import msgpack
+# local
+from doekbase.data_api import service_core
+from doekbase.data_api.annotation.genome_annotation import api as ga_api
+from doekbase.data_api.annotation.genome_annotation.service import \
+    interface as ga_interface
+
+GENOME_REF = '9100/1/1'
+FEATURE_TYPES = ('gene', 'mRNA', 'CDS', 'misc_feature')
+FEATURES_PER_TYPE = 20
+
+def save_object(path, ref, type_string, data):
+    """Write an object in the form read by `wsfile.WorkspaceFile`.
+    """
+    name = ref.replace('/', '_')
+    with open(os.path.join(path, name + '.msgpack'), 'wb') as f:
+        msgpack.dump({'ref': ref, 'type': type_string, 'name': 'obj' + name,
+                      'links': [], 'data': data, 'metadata': {}}, f)
+
+def save_genome(path):
+    """Write a GenomeAnnotation with one Feature container per type.
+    """
+    containers, lookup = {}, {}
+    for i, feature_type in enumerate(FEATURE_TYPES):
+        ref = '9100/{:d}/1'.format(i + 2)
+        features = {}
+        for j in range(FEATURES_PER_TYPE):
+            feature_id = '{}{:d}'.format(feature_type, j)
+            features[feature_id] = {
+                'feature_id': feature_id, 'type': feature_type,
+                'locations': [['contig1', j * 100 + 1, '+', 50]],
+                'function': 'function {:d}'.format(j), 'md5': '',
+                'aliases': ['alias{:d}'.format(j)],
+                'dna_sequence': 'ACGT', 'dna_sequence_length': 4}
+            lookup[feature_id] = [[ref, feature_id]]
+        save_object(path, ref, 'KBaseGenomeAnnotations.FeatureContainer-1.0',
+                    {'features': features})
+        containers[feature_type] = ref
+    save_object(path, GENOME_REF,
+                'KBaseGenomeAnnotations.GenomeAnnotation-1.0',
+                {'feature_container_references': containers,
+                 'feature_lookup': lookup})
+
+def run_threads(fn, num_threads=4):
+    """Run `fn` in several threads at once.
+
+    Returns:
+      list of exceptions raised
+    """
+    errors = []
+
+    def run():
+        try:
+            fn()
+        except Exception as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=run) for _ in range(num_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+class LocalGenomeTestCase(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.path = tempfile.mkdtemp()
+        save_genome(cls.path)
+        cls.services = {'workspace_service_url': cls.path}
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.path)
+
+
+class TestConcurrentContainers(LocalGenomeTestCase):
+    def setUp(self):
+        self.workers = ga_api.CONTAINER_WORKERS
+        ga_api.CONTAINER_WORKERS = 4
+
+    def tearDown(self):
+        ga_api.CONTAINER_WORKERS = self.workers
+
+    def test_get_feature_ids(self):
+        def get_feature_ids():
+            for _ in range(5):
+                genome = ga_api.GenomeAnnotationAPI(self.services, None,
+                                                    GENOME_REF)
+                by_type = genome.get_feature_ids()['by_type']
+                self.assertEqual(sorted(by_type), sorted(FEATURE_TYPES))
+                for ids in by_type.values():
+                    self.assertEqual(len(ids), FEATURES_PER_TYPE)
+
+        self.assertEqual(run_threads(get_feature_ids), [])
+
+
+class TestScheduledCalls(LocalGenomeTestCase):
+    def setUp(self):
+        self.sched = service_core.FairScheduler(
+            workers=4, fast_workers=1, call_from_thread=lambda fn, x: fn(x))
+        self.sched.start()
+        self.service = ga_interface.GenomeAnnotationService(self.services)
+        self.service.scheduler = self.sched
+
+    def tearDown(self):
+        self.sched.stop()
+
+    def test_concurrent_calls(self):
+        results, errors = [], []
+        done = threading.Semaphore(0)
+
+        def deliver(fn):
+            def callback(value):
+                fn(value)
+                done.release()
+            return callback
+
+        num_calls = 8
+        for i in range(num_calls // 2):
+            token = 'token{:d}'.format(i % 2)
+            d = self.service.get_feature_ids(token, GENOME_REF, None, 'type')
+            d.addCallbacks(deliver(results.append), deliver(errors.append))
+            d = self.service.get_features(token, GENOME_REF,
+                                          ['gene1', 'mRNA2', 'CDS3'])
+            d.addCallbacks(deliver(results.append), deliver(errors.append))
+        for i in range(num_calls):
+            done.acquire()
+
+        self.assertEqual(errors, [])
+        for result in results:
+            if hasattr(result, 'by_type'):
+                self.assertEqual(sum(len(v) for v in result.by_type.values()),
+                                 FEATURES_PER_TYPE * len(FEATURE_TYPES))
+            else:
+                self.assertEqual(sorted(result), ['CDS3', 'gene1', 'mRNA2'])
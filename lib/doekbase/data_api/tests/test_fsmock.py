@@ -35,7 +35,11 @@ def foo_datum(n):
                 'kermit': 'Jim Henson',
                 'animal': 'Frank Oz',
             }
-        }}
+        },
+        'songs': [
+            {'title': 'Rainbow Connection', 'year': 1979},
+            {'title': 'Mahna Mahna', 'year': 1969, 'live': True}
+        ]}
     return json.dumps(d)
 
 TEST_DATA = [
@@ -139,6 +143,14 @@ def test_get_object_subset():
         assert 'actors' in d['muppets']
         assert 'colors' in d['muppets']
 
+    # wildcards for list items and mapping keys
+    r = _mock.get_object_subset([{'ref': '10/1', 'included': [
+        'songs/[*]/title', 'songs/[*]/live', 'muppets/*/kermit']}])
+    d = r[0]['data']
+    assert d['songs'] == [{'title': 'Rainbow Connection'},
+                          {'title': 'Mahna Mahna', 'live': True}]
+    assert d['muppets'] == {'colors': {'kermit': 'green'},
+                            'actors': {'kermit': 'Jim Henson'}}
 
 
 def test_get_objects():
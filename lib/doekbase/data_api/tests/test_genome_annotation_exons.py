@@ -0,0 +1,58 @@
+"""
+Test doekbase.data_api.annotation.genome_annotation.exons module
+"""
+
+from doekbase.data_api.annotation.genome_annotation import exons
+
+import unittest as ut
+
+class TestMRNAExons(ut.TestCase):
+    def setUp(self):
+        self.exons = exons.MRNAExons(
+            ['p', 'm', 'x'],
+            [[['c', 100, '+', 50], ['c', 200, '+', 50], ['c', 300, '+', 20]],
+             [['c', 500, '-', 50], ['c', 400, '-', 50]],
+             []])
+        self.sequences = {'p': 'A' * 50 + 'C' * 50 + 'G' * 20,
+                          'm': 'T' * 50 + 'G' * 50}
+
+    def test_exons(self):
+        e = self.exons
+        self.assertEqual(len(e), 5)
+        self.assertEqual(list(e.starts), [0, 3, 5, 5])
+        self.assertEqual(list(e.columns['ordinal']), [0, 1, 2, 0, 1])
+        self.assertEqual(list(e.columns['offset']), [0, 50, 100, 0, 50])
+        result = e.exon_dicts(self.sequences)
+        self.assertEqual(result['x'], [])
+        self.assertEqual(result['m'][1],
+                         {'exon_location': {'contig_id': 'c', 'start': 400,
+                                            'strand': '-', 'length': 50},
+                          'exon_dna_sequence': 'G' * 50,
+                          'exon_ordinal': 1})
+
+    def test_utrs(self):
+        # CDS spans [120, 215] on "+" and [375, 480] on "-"
+        utrs = self.exons.utrs([
+            [['c', 120, '+', 10], ['c', 210, '+', 5]],
+            [['c', 480, '-', 10], ['c', 380, '-', 5]],
+            None])
+        result = self.exons.utr_dicts(utrs, self.sequences)
+        self.assertEqual(result['x'], {})
+        p = result['p']
+        self.assertEqual(p["5'UTR"]['utr_locations'],
+                         [{'contig_id': 'c', 'start': 100, 'strand': '+',
+                           'length': 20}])
+        self.assertEqual(p["5'UTR"]['utr_dna_sequence'], 'A' * 20)
+        self.assertEqual([(r['start'], r['length'])
+                          for r in p["3'UTR"]['utr_locations']],
+                         [(216, 35), (300, 20)])
+        self.assertEqual(p["3'UTR"]['utr_dna_sequence'], 'C' * 35 + 'G' * 20)
+        m = result['m']
+        self.assertEqual([(r['start'], r['length'])
+                          for r in m["5'UTR"]['utr_locations']], [(500, 20)])
+        self.assertEqual([(r['start'], r['length'])
+                          for r in m["3'UTR"]['utr_locations']], [(374, 25)])
+
+    def test_bad_strand(self):
+        self.assertRaises(ValueError, self.exons.utrs,
+                          [[['c', 120, '?', 10]], None, None])
@@ -0,0 +1,157 @@
+"""
+Test doekbase.data_api.annotation.genome_annotation.index module
+"""
+
+from doekbase.data_api.annotation.genome_annotation import index
+
+import pickle
+import random
+import unittest as ut
+
+def overlaps(locations, regions):
+    """Region filter of get_feature_ids, one Feature at a time.
+    """
+    for loc in locations:
+        for r in regions:
+            if r["contig_id"] == loc[0] and loc[2] == r["strand"]:
+                if loc[2] == "+" and max(loc[1], r["start"]) <= \
+                        min(loc[1] + loc[3], r["start"] + r["length"]):
+                    return True
+                elif loc[2] == "-" and max(loc[1] - loc[3], r["start"] - r["length"]) <= \
+                        min(loc[1], r["start"]):
+                    return True
+    return False
+
+class TestRegionIndex(ut.TestCase):
+    def setUp(self):
+        self.features = [
+            ('a', [['c1', 100, '+', 50]]),
+            ('b', [['c1', 400, '-', 50], ['c1', 500, '-', 10]]),
+            ('c', [['c2', 100, '+', 50000]]),
+            ('d', [])]
+        self.index = index.RegionIndex(self.features)
+
+    def region(self, contig_id, start, strand, length):
+        return {'contig_id': contig_id, 'start': start, 'strand': strand,
+                'length': length}
+
+    def test_query(self):
+        q = self.index.query
+        self.assertEqual(q([self.region('c1', 140, '+', 5)]), set(['a']))
+        # touching counts, other strand does not
+        self.assertEqual(q([self.region('c1', 150, '+', 5)]), set(['a']))
+        self.assertEqual(q([self.region('c1', 140, '-', 5)]), set())
+        self.assertEqual(q([self.region('c1', 495, '-', 1),
+                            self.region('c2', 40000, '+', 1)]),
+                         set(['b', 'c']))
+        self.assertEqual(q([self.region('c3', 1, '+', 10)]), set())
+
+    def test_random(self):
+        rand = random.Random(1)
+        features = [(i, [[rand.choice('xy'), rand.randint(1, 10000),
+                          rand.choice('+-'), rand.choice([10, 100, 3000])]
+                         for _ in range(rand.randint(0, 3))])
+                    for i in range(500)]
+        idx = pickle.loads(pickle.dumps(index.RegionIndex(features), 2))
+        for _ in range(100):
+            regions = [self.region(rand.choice('xy'), rand.randint(1, 10000),
+                                   rand.choice('+-'), rand.randint(0, 500))]
+            expected = set(k for k, locs in features if overlaps(locs, regions))
+            self.assertEqual(idx.query(regions), expected)
+
+class TestFunctionIndex(ut.TestCase):
+    def setUp(self):
+        self.index = index.FunctionIndex([
+            ('a', 'hypothetical protein'),
+            ('b', 'DNA polymerase III'),
+            ('c', 'hypothetical protein'),
+            ('d', None)])
+
+    def test_query(self):
+        q = self.index.query
+        self.assertEqual(q(['hypothetical']), set(['a', 'c']))
+        self.assertEqual(q(['merase', 'nothing']), set(['b']))
+        # short strings and the empty string are checked directly
+        self.assertEqual(q(['II']), set(['b']))
+        self.assertEqual(q(['']), set(['a', 'b', 'c']))
+        # substring search is case-sensitive
+        self.assertEqual(q(['dna']), set())
+
+    def test_random(self):
+        rand = random.Random(2)
+        words = ['kinase', 'protein', 'DNA', 'putative', 'transporter', 'ase']
+        features = [(i, ' '.join(rand.choice(words)
+                                 for _ in range(rand.randint(1, 3)))
+                     if rand.random() < 0.9 else None)
+                    for i in range(300)]
+        idx = pickle.loads(pickle.dumps(index.FunctionIndex(features), 2))
+        for _ in range(100):
+            word = rand.choice(words)
+            start = rand.randint(0, len(word) - 1)
+            text = word[start:start + rand.randint(1, 8)]
+            expected = set(k for k, f in features
+                           if f is not None and f.find(text) >= 0)
+            self.assertEqual(idx.query([text]), expected)
+
+class TestAliasIndex(ut.TestCase):
+    def test_query(self):
+        idx = index.AliasIndex([
+            ('a', ['thrL', 'b0001']),
+            ('b', {'thrA': ['source'], 'b0002': []}),
+            ('c', None)])
+        self.assertEqual(idx.query(['b0001', 'thrA']), set(['a', 'b']))
+        self.assertEqual(idx.query(['thr']), set())
+
+class TestFeatureLookup(ut.TestCase):
+    def setUp(self):
+        self.lookup = index.FeatureLookup({
+            u'g1': [[u'1/2/1', u'g1']],
+            u'm1': [[u'1/3/1', u'm1']],
+            u'x': [[u'1/2/1', u'x'], [u'1/3/1', u'x']]})
+
+    def test_group(self):
+        self.assertEqual(self.lookup.refs, (u'1/2/1', u'1/3/1'))
+        self.assertEqual(self.lookup.group(['m1', 'g1', 'x']),
+                         {u'1/2/1': [u'g1', u'x'], u'1/3/1': [u'm1', u'x']})
+        self.assertEqual(self.lookup.group([]), {})
+        # prefixes and extensions of ids are not ids
+        self.assertRaises(KeyError, self.lookup.group, ['g'])
+        self.assertRaises(KeyError, self.lookup.group, ['g1x'])
+        self.assertRaises(KeyError, index.FeatureLookup({}).group, ['g1'])
+
+    def test_keys(self):
+        lookup = index.FeatureLookup({u'g1': [[u'1/2/1', u'k1']]})
+        lookup = pickle.loads(pickle.dumps(lookup, 2))
+        self.assertEqual(lookup.group([u'g1']), {u'1/2/1': [u'k1']})
+
+class TestRelationshipIndex(ut.TestCase):
+    def setUp(self):
+        self.index = index.RelationshipIndex({
+            'gene': {
+                u'g1': {'feature_id': u'g1', 'gene_properties': {
+                    'children_mRNA': [[u'1/3/1', u'm1'], [u'1/3/1', u'm2']],
+                    'children_CDS': [[u'1/4/1', u'c1']]}},
+                u'g2': {'feature_id': u'g2'}},
+            'mRNA': {
+                u'm1': {'feature_id': u'm1', 'mRNA_properties': {
+                    'parent_gene': [u'1/2/1', u'g1'],
+                    'associated_CDS': [u'1/4/1', u'c1']}},
+                u'm2': {'feature_id': u'm2', 'mRNA_properties': {
+                    'parent_gene': [u'1/2/1', u'g1']}}},
+            'CDS': {
+                u'c1': {'feature_id': u'c1', 'CDS_properties': {
+                    'parent_gene': [u'1/2/1', u'g1'],
+                    'associated_mRNA': [u'1/3/1', u'm1']}}}})
+
+    def test_query(self):
+        idx = pickle.loads(pickle.dumps(self.index, 2))
+        self.assertEqual(idx.query('gene', 'mRNA'),
+                         {u'g1': [u'm1', u'm2'], u'g2': []})
+        self.assertEqual(idx.query('gene', 'CDS', ['g2', 'g1', 'g3']),
+                         {u'g1': [u'c1'], u'g2': []})
+        self.assertEqual(idx.query('mRNA', 'CDS'),
+                         {u'm1': [u'c1'], u'm2': []})
+        self.assertEqual(idx.query('mRNA', 'gene', ['m2']), {u'm2': [u'g1']})
+        self.assertEqual(idx.query('CDS', 'mRNA', ['c1']), {u'c1': [u'm1']})
+        self.assertEqual(idx.query('CDS', 'gene', []), {})
+        self.assertEqual(index.RelationshipIndex({}).query('gene', 'CDS'), {})
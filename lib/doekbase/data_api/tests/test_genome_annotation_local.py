@@ -0,0 +1,78 @@
+"""
+Test the Genome Annotation API against a local (file) workspace.
+"""
+
+# stdlib
+import shutil
+import tempfile
+import unittest as ut
+# local
+from doekbase.data_api.annotation.genome_annotation import api as ga_api
+from doekbase.data_api.tests.test_concurrent_calls import save_genome, \
+    save_object, GENOME_REF, FEATURE_TYPES, FEATURES_PER_TYPE
+
+OLD_GENOME_REF = '9101/1/1'
+
+def save_old_genome(path):
+    """Write a KBaseGenomes.Genome with the same Features as
+    `save_genome`.
+    """
+    features = [{'id': '{}{:d}'.format(feature_type, j), 'type': feature_type,
+                 'location': [['contig1', j * 100 + 1, '+', 50]],
+                 'function': 'function {:d}'.format(j),
+                 'aliases': ['alias{:d}'.format(j)]}
+                for feature_type in FEATURE_TYPES
+                for j in range(FEATURES_PER_TYPE)]
+    save_object(path, OLD_GENOME_REF, 'KBaseGenomes.Genome-8.0',
+                {'features': features})
+
+
+class LocalGenomeTestCase(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.path = tempfile.mkdtemp()
+        save_genome(cls.path)
+        save_old_genome(cls.path)
+        cls.services = {'workspace_service_url': cls.path}
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.path)
+
+    def setUp(self):
+        self.genome = ga_api.GenomeAnnotationAPI(self.services, None,
+                                                 GENOME_REF)
+
+
+class TestFeatureIds(LocalGenomeTestCase):
+    def test_no_full_object(self):
+        # only the container references are read from the genome
+        def get_data():
+            raise AssertionError('whole object fetched')
+        self.genome.proxy.get_data = get_data
+        by_type = self.genome.get_feature_ids()['by_type']
+        self.assertEqual(sorted(by_type), sorted(FEATURE_TYPES))
+        self.assertEqual(len(by_type['gene']), FEATURES_PER_TYPE)
+
+    def test_filters(self):
+        region = {'contig_id': 'contig1', 'start': 1, 'length': 150,
+                  'strand': '+'}
+        for ref in (GENOME_REF, OLD_GENOME_REF):
+            genome = ga_api.GenomeAnnotationAPI(self.services, None, ref)
+            by_type = genome.get_feature_ids(
+                {'region_list': [region]})['by_type']
+            self.assertEqual(sorted(by_type['mRNA']), ['mRNA0', 'mRNA1'])
+            by_type = genome.get_feature_ids(
+                {'region_list': [region], 'function_list': ['function 1'],
+                 'type_list': ['gene', 'CDS']})['by_type']
+            self.assertEqual(by_type, {'gene': ['gene1'], 'CDS': ['CDS1']})
+            by_alias = genome.get_feature_ids(
+                {'alias_list': ['alias3']}, group_by='alias')['by_alias']
+            self.assertEqual(sorted(by_alias['alias3']),
+                             sorted(t + '3' for t in FEATURE_TYPES))
+            by_type = genome.get_feature_ids(
+                {'function_list': ['function 1'],
+                 'alias_list': ['alias2']})['by_type']
+            self.assertEqual(by_type, {})
+            self.assertRaises(TypeError, genome.get_feature_ids,
+                              {'function_list': []})
@@ -0,0 +1,57 @@
+"""
+Test doekbase.data_api.annotation.genome_annotation.table module
+"""
+
+from doekbase.data_api.annotation.genome_annotation import table
+
+import unittest as ut
+
+try:
+    import pandas
+    have_pandas = True
+except ImportError:
+    have_pandas = False
+
+class TestFeatureTable(ut.TestCase):
+    def setUp(self):
+        self.table = table.FeatureTable.build(
+            table.FEATURE_TABLE_FIELDS,
+            ['a', 'b', 'c'],
+            types=['gene', 'CDS', 'gene'],
+            locations=[[['c1', 100, '+', 50]],
+                       # span of the locations on c2 "-" only
+                       [['c2', 500, '-', 10], ['c2', 480, '-', 5],
+                        ['c1', 1, '+', 1]],
+                       []],
+            functions=['kinase', None, ''],
+            md5s=['x', 'y', None])
+
+    def test_columns(self):
+        t = self.table
+        self.assertEqual(len(t), 3)
+        self.assertEqual(t.fields, table.FEATURE_TABLE_FIELDS)
+        self.assertEqual(t.categories['type'], ('CDS', 'gene'))
+        self.assertEqual(list(t['type']), [1, 0, 1])
+        self.assertEqual(list(t.decode('contig_id')), ['c1', 'c2', None])
+        self.assertEqual(list(t['start']), [100, 500, 0])
+        self.assertEqual(list(t['length']), [50, 25, 0])
+        self.assertEqual(list(t['strand']), ['+', '-', ''])
+        self.assertEqual(list(t['function']), ['kinase', '', ''])
+        self.assertEqual(list(t['md5']), ['x', 'y', ''])
+
+    def test_select(self):
+        t = self.table.select([2, 0])
+        self.assertEqual(list(t['feature_id']), ['c', 'a'])
+        self.assertEqual(list(t.decode('type')), ['gene', 'gene'])
+
+    def test_check_fields(self):
+        self.assertEqual(table.check_fields(['md5', 'type']),
+                         ('feature_id', 'type', 'md5'))
+        self.assertRaises(KeyError, table.check_fields, ['sequence'])
+
+    @ut.skipUnless(have_pandas, 'pandas is not installed')
+    def test_to_dataframe(self):
+        df = self.table.to_dataframe()
+        self.assertEqual(list(df.columns), list(table.FEATURE_TABLE_FIELDS))
+        self.assertEqual(list(df['type']), ['gene', 'CDS', 'gene'])
+        self.assertEqual(list(df['start']), [100, 500, 0])
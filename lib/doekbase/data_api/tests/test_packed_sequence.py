@@ -0,0 +1,63 @@
+"""
+Test doekbase.data_api.sequence.packed module
+"""
+
+from doekbase.data_api.sequence.packed import PackedSequence, \
+    pack_sequences, unpack_sequences
+
+import pickle
+import unittest as ut
+
+# soft-masked, with runs of N, IUPAC codes and a gap
+SEQUENCE = 'ACGTTGCAacgtNNNNNNGGCCRYKMacnnT-TTAGC' * 5 + 'A'
+
+class TestPackedSequence(ut.TestCase):
+    def setUp(self):
+        self.packed = PackedSequence(SEQUENCE)
+
+    def test_roundtrip(self):
+        self.assertEqual(str(self.packed), SEQUENCE)
+        self.assertEqual(len(self.packed), len(SEQUENCE))
+        self.assertEqual(str(PackedSequence(unicode(SEQUENCE))), SEQUENCE)
+        self.assertEqual(str(PackedSequence('')), '')
+
+    def test_slice(self):
+        n = len(SEQUENCE)
+        for i, j in ((0, n), (3, 17), (11, 12), (-9, -2), (5, n + 10),
+                     (20, 10)):
+            self.assertEqual(self.packed[i:j], SEQUENCE[i:j])
+        self.assertEqual(self.packed[-1], SEQUENCE[-1])
+        self.assertEqual(self.packed[::-3], SEQUENCE[::-3])
+        self.assertRaises(IndexError, self.packed.__getitem__, n)
+
+    def test_counts(self):
+        for i, j in ((0, None), (1, 2), (3, 42), (5, 100)):
+            expected = sum(SEQUENCE[i:j].count(c) for c in 'GCgc')
+            self.assertEqual(self.packed.gc_count(i, j), expected)
+        self.assertEqual(self.packed.exception_count('N'),
+                         SEQUENCE.upper().count('N'))
+        self.assertEqual(self.packed.exception_count(),
+                         sum(1 for c in SEQUENCE if c not in 'ACGTacgt'))
+
+    def test_size(self):
+        plain = 'ACGT' * 10000
+        self.assertTrue(PackedSequence(plain).nbytes <= len(plain) / 4)
+
+    def test_pickle(self):
+        for protocol in (0, 2):
+            copy = pickle.loads(pickle.dumps(self.packed, protocol))
+            self.assertEqual(copy, self.packed)
+            self.assertEqual(copy, SEQUENCE)
+
+    def test_object(self):
+        data = {'contigs': [{'id': 'a', 'sequence': SEQUENCE},
+                            {'id': 'b', 'sequence': 'ACGT'}],
+                'source': 'x'}
+        packed = pack_sequences(data, min_length=10)
+        self.assertTrue(isinstance(packed['contigs'][0]['sequence'],
+                                   PackedSequence))
+        # short sequences, and containers without sequences, are shared
+        self.assertTrue(packed['contigs'][1] is data['contigs'][1])
+        self.assertEqual(data['contigs'][0]['sequence'], SEQUENCE)
+        self.assertEqual(unpack_sequences(packed), data)
+        self.assertTrue(unpack_sequences(data) is data)
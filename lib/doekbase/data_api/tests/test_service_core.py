@@ -5,6 +5,9 @@ __author__ = 'Dan Gunter <dkgunter@lbl.gov>'
 __date__ = '12/27/15'
 
 from twisted import internet
+from thrift.protocol import TBinaryProtocol
+from thrift.transport import TTransport
+from doekbase.data_api import cache
 from doekbase.data_api import service_core as sc
 from doekbase.data_api import exceptions as dapi_exc
 from doekbase.data_api.taxonomy.taxon.service import ttypes as tax_ttypes
@@ -13,10 +16,16 @@ from doekbase.data_api.taxonomy.taxon.service import thrift_service as \
 from  doekbase.data_api.taxonomy.taxon.service.interface import TaxonService
 from doekbase.data_api.tests.shared import in_travis
 
+import BaseHTTPServer
 import logging
 import os
 import signal
+import socket
+import StringIO
+import threading
+import time
 import unittest as ut
+import zope.interface
 
 _log = logging.getLogger(__name__)
 
@@ -144,6 +153,369 @@ class TestStartService(ut.TestCase):
         self.assertRaises(RuntimeError, sc.start_service, *args)
         sc.twisted.internet.reactor = orig_reactor # set it back
 
+class TestDeadline(ut.TestCase):
+    def tearDown(self):
+        sc.util.set_deadline(None)
+
+    def test_abandoned(self):
+        # call after deadline raises ServiceException, and is counted
+        x = Complete()
+        count = sc.abandoned_calls['wrapped']
+        sc.util.set_deadline(time.time() - 1)
+        self.assertRaises(tax_ttypes.ServiceException, x.wrapped,
+                          'token', 'ref')
+        self.assertEqual(sc.abandoned_calls['wrapped'], count + 1)
+        sc.util.set_deadline(time.time() + 60)
+        self.assertEqual(x.wrapped('token', 'ref'), 'Hello')
+
+    def test_check_deadline(self):
+        sc.util.check_deadline('no-deadline')
+        sc.util.set_deadline(time.time() - 1)
+        try:
+            sc.util.check_deadline('fetch')
+            self.fail('DeadlineExceededError not raised')
+        except dapi_exc.DeadlineExceededError as err:
+            self.assertEqual(err.stage, 'fetch')
+
+    def test_header(self):
+        request = TestCachingThriftResource.Request(
+            '', headers={sc.DEADLINE_HEADER: '2.5'})
+        deadline = sc.ThriftResource._get_deadline(request)
+        self.assertAlmostEqual(deadline, time.time() + 2.5, places=1)
+        request.headers[sc.DEADLINE_HEADER] = 'soon'
+        self.assertIsNone(sc.ThriftResource._get_deadline(request))
+
+class TestReplicaRouter(ut.TestCase):
+    urls = ['http://replica{:d}:9103'.format(i) for i in range(4)]
+
+    def test_consistent(self):
+        # same key, same replica; keys spread over all replicas;
+        # removing a replica only moves its own keys
+        router = sc.ReplicaRouter(self.urls)
+        keys = ['1/{:d}/1'.format(i) for i in range(400)]
+        home = dict((k, router.candidates(k)[0]) for k in keys)
+        self.assertEqual(home['1/7/1'], router.candidates('1/7/1')[0])
+        self.assertEqual(set(home.values()), set(self.urls))
+        smaller = sc.ReplicaRouter(self.urls[:3])
+        for k in keys:
+            if home[k] != self.urls[3]:
+                self.assertEqual(smaller.candidates(k)[0], home[k])
+
+    def test_bounded_load(self):
+        router = sc.ReplicaRouter(self.urls, load_factor=1.5)
+        key = '1/2/3'
+        first = router.candidates(key)[0]
+        for i in range(3):
+            router.acquire(first)
+        # 3 in flight on one replica is over 1.5 x mean: spill over
+        second = router.candidates(key)[0]
+        self.assertNotEqual(second, first)
+        self.assertEqual(router.candidates(key)[1:].count(first), 1)
+        for i in range(3):
+            router.release(first)
+        self.assertEqual(router.candidates(key)[0], first)
+
+    def test_dead(self):
+        router = sc.ReplicaRouter(self.urls)
+        first = router.candidates('1/2/3')[0]
+        router.mark_dead(first)
+        self.assertEqual(router.candidates('1/2/3')[-1], first)
+        router.mark_alive(first)
+        self.assertEqual(router.candidates('1/2/3')[0], first)
+
+class TestRoutedHttpClient(ut.TestCase):
+    class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+        calls = []
+        def do_POST(self):
+            self.calls.append(self.path)
+            self.rfile.read(int(self.headers['Content-Length']))
+            self.send_response(200)
+            self.send_header('Content-Length', '5')
+            self.end_headers()
+            self.wfile.write('reply')
+        def log_message(self, *args):
+            pass
+
+    def setUp(self):
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), self.Handler)
+        self.server.timeout = 5  # don't hang if the test never calls
+        self.thread = threading.Thread(target=self.server.handle_request)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.server_close()
+        self.thread.join()
+
+    def test_failover(self):
+        # closed port
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        dead_url = 'http://127.0.0.1:{:d}/'.format(sock.getsockname()[1])
+        sock.close()
+        live_url = 'http://127.0.0.1:{:d}/'.format(self.server.server_port)
+        router = sc.ReplicaRouter([dead_url, live_url])
+        # find a key whose home is the dead replica
+        key = [k for k in ('1/{:d}'.format(i) for i in range(100))
+               if router.candidates(k)[0] == dead_url][0]
+        transport = sc.RoutedHttpClient([dead_url, live_url], key=key,
+                                        router=router)
+        transport.open()
+        transport.write('call')
+        transport.flush()
+        self.assertEqual(transport.read(5), 'reply')
+        transport.close()
+        self.assertEqual(router.candidates(key)[0], live_url)
+
+    def test_timeout(self):
+        # a call that timed out is not sent again to another replica
+        class SlowHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_POST(self):
+                time.sleep(0.5)
+            def log_message(self, *args):
+                pass
+        slow = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), SlowHandler)
+        thread = threading.Thread(target=slow.handle_request)
+        thread.start()
+        slow_url = 'http://127.0.0.1:{:d}/'.format(slow.server_port)
+        live_url = 'http://127.0.0.1:{:d}/'.format(self.server.server_port)
+        router = sc.ReplicaRouter([slow_url, live_url])
+        key = [k for k in ('1/{:d}'.format(i) for i in range(100))
+               if router.candidates(k)[0] == slow_url][0]
+        calls = len(self.Handler.calls)
+        try:
+            transport = sc.RoutedHttpClient([slow_url, live_url], key=key,
+                                            timeout=0.1, router=router)
+            transport.write('call')
+            try:
+                transport.flush()
+                self.fail('TTransportException not raised')
+            except TTransport.TTransportException as err:
+                self.assertEqual(err.type,
+                                 TTransport.TTransportException.TIMED_OUT)
+            self.assertEqual(len(self.Handler.calls), calls)
+            self.assertEqual(router.candidates(key)[0], slow_url)
+        finally:
+            thread.join()
+            slow.server_close()
+        # the live replica is still there for the next call
+        transport = sc.RoutedHttpClient([live_url])
+        transport.write('call')
+        transport.flush()
+        self.assertEqual(transport.read(5), 'reply')
+
+class TestResponseCache(ut.TestCase):
+    def test_budget(self):
+        # least-recently-used entries are evicted to stay in budget
+        rc = cache.ResponseCache(max_bytes=10)
+        rc.put('a', 'x' * 4)
+        rc.put('b', 'x' * 4)
+        self.assertEqual(rc.get('a'), 'x' * 4)  # now 'b' is oldest
+        rc.put('c', 'x' * 4)
+        self.assertIsNone(rc.get('b'))
+        self.assertEqual(rc.get('a'), 'x' * 4)
+        self.assertEqual(rc.nbytes, 8)
+        self.assertEqual(rc.evictions, 1)
+        # too big for the whole budget
+        self.assertFalse(rc.put('d', 'x' * 11))
+
+    def test_methods(self):
+        rc = cache.ResponseCache(methods=['get_contigs'])
+        self.assertTrue(rc.is_enabled('get_contigs'))
+        self.assertFalse(rc.is_enabled('get_stats'))
+        self.assertTrue(cache.ResponseCache().is_enabled('get_stats'))
+
+class TestCachingThriftResource(ut.TestCase):
+    class Handler(object):
+        zope.interface.implements(taxon_thrift_service.Iface)
+        def __init__(self):
+            self.calls = 0
+        def get_scientific_name(self, token, ref):
+            self.calls += 1
+            if ref == 'bad':
+                raise tax_ttypes.ServiceException(message='bad')
+            return 'Escherichia coli'
+
+    class Request(object):
+        def __init__(self, data, headers=None):
+            self.content = StringIO.StringIO(data)
+            self.headers = headers or {}
+            self.body = []
+        def getHeader(self, name):
+            return self.headers.get(name)
+        def setResponseCode(self, code):
+            pass
+        def setHeader(self, name, value):
+            pass
+        def write(self, data):
+            self.body.append(data)
+        def finish(self):
+            pass
+
+    def setUp(self):
+        self.handler = self.Handler()
+        processor = taxon_thrift_service.Processor(self.handler)
+        pfactory = TBinaryProtocol.TBinaryProtocolFactory()
+        self.public = True
+        self.resolved = []
+        self.resource = sc.CachingThriftResource(
+            processor, pfactory, pfactory,
+            response_cache=cache.ResponseCache(),
+            defer_to_thread=self._defer_to_thread)
+        self.resource._resolve_ref = self._resolve_ref
+
+    def _defer_to_thread(self, fn, *args):
+        return internet.defer.maybeDeferred(fn, *args)
+
+    def _resolve_ref(self, token, ref):
+        self.resolved.append(sc.util.get_deadline())
+        return '1/2/3', self.public
+
+    def _call(self, seqid, token='token', ref='1/2', headers=None):
+        tmo = TTransport.TMemoryBuffer()
+        client = taxon_thrift_service.Client(
+            tmo, TBinaryProtocol.TBinaryProtocolFactory())
+        client._seqid = seqid
+        client.send_get_scientific_name(token, ref)
+        request = self.Request(tmo.getvalue(), headers=headers)
+        self.resource.render_POST(request)
+        iprot = TBinaryProtocol.TBinaryProtocol(
+            TTransport.TMemoryBuffer(''.join(request.body)))
+        _, _, rseqid = iprot.readMessageBegin()
+        result = taxon_thrift_service.get_scientific_name_result()
+        result.read(iprot)
+        return rseqid, result.success
+
+    def test_hit(self):
+        self.assertEqual(self._call(1), (1, 'Escherichia coli'))
+        self.assertEqual(self._call(2, token='other'), (2, 'Escherichia coli'))
+        self.assertEqual(self.handler.calls, 1)
+
+    def test_private(self):
+        self.public = False
+        self._call(1)
+        self._call(2)
+        self.assertEqual(self.handler.calls, 2)
+        self.resource.response_cache.per_token = True
+        self._call(3)
+        self._call(4)
+        self._call(5, token='other')
+        self.assertEqual(self.handler.calls, 4)
+
+    def test_resolve_deadline(self):
+        # references are resolved with the deadline of the request
+        self._call(1, headers={sc.DEADLINE_HEADER: '2.5'})
+        self.assertAlmostEqual(self.resolved[0], time.time() + 2.5, places=1)
+        self.assertIsNone(sc.util.get_deadline())
+
+    def test_resolve_remembered(self):
+        # only versioned references are resolved once
+        self._call(1, ref='1/2/3')
+        self._call(2, ref='1/2/3')
+        self.assertEqual(len(self.resolved), 1)
+        self._call(3)
+        self._call(4)
+        self.assertEqual(len(self.resolved), 3)
+        self.assertEqual(self.handler.calls, 1)
+
+    def test_resolve_error(self):
+        # the call is still answered, without the cache
+        def fail(token, ref):
+            raise dapi_exc.DeadlineExceededError('late', stage='get_info')
+        self.resource._resolve_ref = fail
+        self.assertEqual(self._call(1), (1, 'Escherichia coli'))
+        self.assertEqual(self._call(2), (2, 'Escherichia coli'))
+        self.assertEqual(self.handler.calls, 2)
+
+    def test_error_not_stored(self):
+        self.assertEqual(self._call(1, ref='bad'), (1, None))
+        self.assertEqual(self._call(2, ref='bad'), (2, None))
+        self.assertEqual(self.handler.calls, 2)
+        self.assertEqual(len(self.resource.response_cache), 0)
+
+class TestFairScheduler(ut.TestCase):
+    def setUp(self):
+        self.order, self.results = [], []
+        self.gate = threading.Event()
+        self.sched = sc.FairScheduler(workers=1, fast_workers=1,
+                                      call_from_thread=self._deliver)
+        self.sched.start()
+
+    def tearDown(self):
+        self.gate.set()
+        self.sched.stop()
+
+    def _deliver(self, fn, value):
+        fn(value)
+
+    def _job(self, name, wait=False):
+        def run():
+            if wait:
+                self.gate.wait()
+            self.order.append(name)
+            return name
+        return run
+
+    def _submit(self, method, token, name, wait=False):
+        d = self.sched.submit(method, token, self._job(name, wait=wait))
+        d.addCallback(self.results.append)
+        return d
+
+    def _wait_for(self, n):
+        for i in range(500):
+            if len(self.results) >= n:
+                return
+            threading.Event().wait(0.01)
+        self.fail('Timeout waiting for {:d} results'.format(n))
+
+    def test_fair_order(self):
+        # busy token does not starve a token that arrives later
+        self._submit('get_features', 'a', 'a0', wait=True)
+        for i in range(1, 4):
+            self._submit('get_features', 'a', 'a{:d}'.format(i))
+        self._submit('get_features', 'b', 'b0')
+        self.gate.set()
+        self._wait_for(5)
+        self.assertEqual(self.order, ['a0', 'b0', 'a1', 'a2', 'a3'])
+        self.assertEqual(self.sched.queue_length(), 0)
+
+    def test_fast_lane(self):
+        self._submit('get_features', 'a', 'slow', wait=True)
+        # wait until the slow call is taken, so its queue_wait comes first
+        for i in range(500):
+            if self.sched.stats.get_last() is not None:
+                break
+            threading.Event().wait(0.01)
+        self._submit('get_info', 'b', 'fast')
+        self._wait_for(1)
+        self.assertEqual(self.results, ['fast'])
+        event = self.sched.stats.get_last()
+        self.assertEqual(event.event, 'FairScheduler.queue_wait')
+        self.assertEqual(event['lane'], 'fast')
+        self.gate.set()
+        self._wait_for(2)
+
+    def test_lanes_configurable(self):
+        self.assertTrue(self.sched.is_fast('get_taxon'))
+        self.sched.set_lane('get_taxon', False)
+        self.sched.set_lane('get_dna_size', True)
+        self.assertFalse(self.sched.is_fast('get_taxon'))
+        self.assertTrue(self.sched.is_fast('get_dna_size'))
+
+    def test_server_method(self):
+        # wrapped methods return a Deferred, and map exceptions as usual
+        x = Complete()
+        x.scheduler = self.sched
+        errors = []
+        x.wrapped('token', 'ref').addCallback(self.results.append)
+        x.wrapped_type_error('token', 'ref').addErrback(errors.append)
+        self._wait_for(1)
+        for i in range(500):
+            if errors:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(self.results, ['Hello'])
+        self.assertTrue(errors[0].check(tax_ttypes.TypeException))
+
 class MockOSModule(object):
     """Fake OS module for testing the process group killing, without
     actually killing the process group.
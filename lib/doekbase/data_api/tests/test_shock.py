@@ -0,0 +1,276 @@
+"""
+Test doekbase.data_api.shock module
+"""
+
+from doekbase.data_api import shock
+
+import BaseHTTPServer
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest as ut
+import urlparse
+
+FASTA = '>a\nACGT\nAC\n>b\nGG\n>c\nTTTT\nTTTT\nT\n'
+
+def regions_for(fasta, ids):
+    """Make (key, start, num_bytes) for each record of a FASTA string.
+    """
+    result, pos = [], 0
+    for i, rec in enumerate(fasta.split('>')[1:]):
+        header, _, seq = rec.partition('\n')
+        start = pos + 1 + len(header) + 1
+        result.append((ids[i], start, len(seq)))
+        pos = start + len(seq)
+    return result
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+class TestIterRegions(ut.TestCase):
+    def setUp(self):
+        self.regions = regions_for(FASTA, ['a', 'b', 'c'])
+        self.expected = [('a', 'ACGTAC'), ('b', 'GG'), ('c', 'TTTTTTTTT')]
+
+    def test_chunk_sizes(self):
+        # same result however the data is split
+        for size in (1, 2, 3, 7, len(FASTA)):
+            result = list(shock.iter_regions(chunked(FASTA, size),
+                                             self.regions))
+            self.assertEqual(result, self.expected, 'chunk size {:d}'
+                             .format(size))
+
+    def test_subset(self):
+        regions = [self.regions[0], self.regions[2]]
+        result = list(shock.iter_regions(chunked(FASTA, 4), regions))
+        self.assertEqual(result, [self.expected[0], self.expected[2]])
+
+    def test_offset(self):
+        # data that starts at the region, as from a ranged request
+        key, start, num_bytes = self.regions[2]
+        data = FASTA[start:start + num_bytes]
+        result = list(shock.iter_regions(chunked(data, 5), [self.regions[2]],
+                                         offset=start))
+        self.assertEqual(result, [self.expected[2]])
+
+    def test_incremental(self):
+        # a region is emitted before later chunks are read
+        chunks = iter(chunked(FASTA, 4))
+        first = next(shock.iter_regions(chunks, self.regions))
+        self.assertEqual(first, self.expected[0])
+        self.assertTrue(len(list(chunks)) > 0)
+
+    def test_truncated(self):
+        gen = shock.iter_regions(chunked(FASTA[:-5], 4), self.regions)
+        self.assertRaises(ValueError, list, gen)
+
+    def test_pieces(self):
+        # no piece is larger than the chunk it came from
+        pieces = list(shock.iter_region_pieces(chunked(FASTA, 3),
+                                               self.regions))
+        self.assertTrue(all(len(p) <= 3 for key, p, is_last in pieces))
+        self.assertEqual([key for key, p, is_last in pieces if is_last],
+                         ['a', 'b', 'c'])
+        joined = {}
+        for key, p, is_last in pieces:
+            joined[key] = joined.get(key, '') + p
+        self.assertEqual(sorted(joined.items()), self.expected)
+
+
+class TestCoalesceRegions(ut.TestCase):
+    def test_merge(self):
+        regions = [('a', 0, 10), ('b', 12, 5), ('c', 100, 5)]
+        ranges = shock.coalesce_regions(regions, max_gap=2)
+        self.assertEqual(ranges, [(0, 17, regions[:2]), (100, 5, regions[2:])])
+
+    def test_gap(self):
+        regions = [('a', 0, 10), ('b', 13, 5)]
+        self.assertEqual(len(shock.coalesce_regions(regions, max_gap=2)), 2)
+        self.assertEqual(len(shock.coalesce_regions(regions, max_gap=3)), 1)
+
+    def test_max_bytes(self):
+        regions = [('a', 0, 10), ('b', 10, 10), ('c', 20, 10)]
+        ranges = shock.coalesce_regions(regions, max_gap=0, max_bytes=20)
+        self.assertEqual([r[:2] for r in ranges], [(0, 20), (20, 10)])
+
+    def test_prefer_full_download(self):
+        # one small region of a big file: ranges
+        regions = [('a', 0, 100)]
+        self.assertFalse(shock.prefer_full_download(regions, 2**30))
+        # most of the file, in many pieces: download it all
+        regions = [(i, i * (2**20 + 2**10), 2**20) for i in range(100)]
+        self.assertTrue(shock.prefer_full_download(regions,
+                                                   100 * (2**20 + 2**10),
+                                                   max_gap=0))
+        # many scattered small regions: one request beats many
+        regions = [(i, i * 10**4, 100) for i in range(1000)]
+        self.assertTrue(shock.prefer_full_download(regions, 1000 * 10**4,
+                                                   max_gap=0))
+
+
+class RangeHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    data = FASTA
+    requests = []
+
+    def do_GET(self):
+        query = urlparse.parse_qs(urlparse.urlparse(self.path).query,
+                                  keep_blank_values=True)
+        self.requests.append(query)
+        start = int(query.get('seek', ['0'])[0])
+        length = int(query.get('length', [len(self.data)])[0])
+        body = self.data[start:start + length]
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HandleHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Handle service whose handle 'KBH_<n>' points at node 'node<n>'.
+    """
+    requests = []
+
+    def do_POST(self):
+        call = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        hids = call['params'][0]
+        self.requests.append(hids)
+        if any(not h.startswith('KBH_') for h in hids):
+            self.send_response(500)
+            body = {'error': {'name': 'JSONRPCError', 'code': -32500,
+                              'message': 'Unknown handle'}}
+        else:
+            self.send_response(200)
+            body = {'result': [[{'hid': h, 'id': 'node' + h[4:]}
+                                for h in hids]]}
+        body = json.dumps(body)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ShockServerTestCase(ut.TestCase):
+    """Run a local HTTP server that serves FASTA for any node.
+    """
+    handler = RangeHandler
+
+    def setUp(self):
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), self.handler)
+        self.server.timeout = 5
+        thr = threading.Thread(target=self.server.serve_forever)
+        thr.daemon = True
+        thr.start()
+        self.url = 'http://127.0.0.1:{:d}/'.format(self.server.server_port)
+        self.handler.requests = []
+        self.regions = regions_for(FASTA, ['a', 'b', 'c'])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestIterRanges(ShockServerTestCase):
+    def test_merged(self):
+        regions = [self.regions[0], self.regions[2]]
+        result = list(shock.iter_ranges(self.url, 'node', 'token', regions,
+                                        max_gap=100))
+        self.assertEqual(result, [('a', 'ACGTAC'), ('c', 'TTTTTTTTT')])
+        self.assertEqual(len(RangeHandler.requests), 1)
+
+    def test_parallel(self):
+        result = list(shock.iter_ranges(self.url, 'node', 'token',
+                                        self.regions, max_gap=0, workers=2))
+        self.assertEqual(result, [('a', 'ACGTAC'), ('b', 'GG'),
+                                  ('c', 'TTTTTTTTT')])
+        self.assertEqual(len(RangeHandler.requests), 3)
+
+
+class TestNodeFileCache(ShockServerTestCase):
+    def setUp(self):
+        ShockServerTestCase.setUp(self)
+        self.dir = tempfile.mkdtemp()
+        self.cache = shock.NodeFileCache(self.dir, 3 * len(FASTA))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        ShockServerTestCase.tearDown(self)
+
+    def read(self, node_id, regions):
+        mapped = self.cache.open(self.url, node_id, 'token')
+        return list(shock.iter_mapped_regions(mapped, regions))
+
+    def test_miss_then_hit(self):
+        expected = [('a', 'ACGTAC'), ('c', 'TTTTTTTTT')]
+        regions = [self.regions[0], self.regions[2]]
+        self.assertEqual(self.read('node1', regions), expected)
+        self.assertEqual(self.read('node1', regions), expected)
+        self.assertEqual(len(RangeHandler.requests), 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        # only the finished file is in the directory
+        self.assertEqual(os.listdir(self.dir), ['node1.node'])
+
+    def test_evict(self):
+        for i in range(4):
+            self.read('node{:d}'.format(i), self.regions)
+            os.utime(self.cache.path('node{:d}'.format(i)), (i, i))
+        self.read('node1', self.regions)  # most recently used
+        self.read('node4', self.regions)
+        self.assertEqual(self.cache.evictions, 2)
+        self.assertTrue(self.cache.nbytes() <= self.cache.max_bytes)
+        self.assertEqual(sorted(os.listdir(self.dir)),
+                         ['node1.node', 'node3.node', 'node4.node'])
+
+    def test_locks_bounded(self):
+        # locks do not pile up as nodes come and go
+        for i in range(10):
+            self.read('node{:d}'.format(i), self.regions)
+        self.assertEqual(len(self.cache._node_locks),
+                         shock.NodeFileCache.LOCK_STRIPES)
+        self.assertTrue(self.cache._node_lock('node1') is
+                        self.cache._node_lock('node1'))
+
+    def test_too_large(self):
+        self.assertEqual(self.cache.open(self.url, 'node1', 'token',
+                                         size=self.cache.max_bytes + 1), None)
+        small = shock.NodeFileCache(self.dir, len(FASTA) - 1)
+        self.assertEqual(small.open(self.url, 'node1', 'token'), None)
+        self.assertEqual(os.listdir(self.dir), [])
+
+    def test_mapped_chunks(self):
+        mapped = self.cache.open(self.url, 'node1', 'token')
+        key, start, num_bytes = self.regions[2]
+        chunks = list(shock.iter_mapped_chunks(mapped, start, num_bytes,
+                                               chunk_size=4))
+        mapped.close()
+        self.assertEqual(chunks, chunked(FASTA[start:start + num_bytes], 4))
+
+    def test_bad_node_id(self):
+        self.assertRaises(ValueError, self.cache.path, '../etc/passwd')
+
+
+class TestResolveHandles(ShockServerTestCase):
+    handler = HandleHandler
+
+    def test_batched_and_cached(self):
+        hids = ['KBH_1', 'KBH_2', 'KBH_3']
+        expected = {'KBH_1': 'node1', 'KBH_2': 'node2', 'KBH_3': 'node3'}
+        self.assertEqual(shock.resolve_handles(self.url, 'token', hids),
+                         expected)
+        self.assertEqual(shock.resolve_handles(self.url, 'token', hids[:2]),
+                         {'KBH_1': 'node1', 'KBH_2': 'node2'})
+        self.assertEqual(HandleHandler.requests, [hids])
+
+    def test_bad_handle(self):
+        result = shock.resolve_handles(self.url, 'token', ['KBH_4', 'bad'])
+        self.assertEqual(result, {'KBH_4': 'node4'})
+        # not remembered, so asked again
+        shock.resolve_handles(self.url, 'token', ['bad'])
+        self.assertEqual(len(HandleHandler.requests), 4)
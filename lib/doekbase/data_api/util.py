@@ -6,6 +6,10 @@ Includes:
 - Logging initialization helper: get_logger()
 - Logging decorators: @logged, @collect_performance
 - Logging functions log_start(), log_end(), and log_event()
+- Request deadlines: set_deadline(), get_deadline(), check_deadline()
+- Shared worker threads: get_thread_pool()
+- Workspace-style object subsets: extract_paths()
+- Workspace object references: is_versioned_ref()
 
 """
 __author__ = 'Dan Gunter <dkgunter@lbl.gov>'
@@ -14,6 +18,7 @@ __date__ = '8/4/15'
 # stdlib
 from collections import deque, namedtuple
 from datetime import datetime
+import itertools
 import logging
 import logging.config
 import os
@@ -24,6 +29,9 @@ import time
 # 3rd party
 import psutil
 
+# local
+from doekbase.data_api.exceptions import DeadlineExceededError
+
 # Message formats without/with timestamp
 _KVSEP = '#'
 _MESSAGE_FORMATS = [
@@ -210,6 +218,9 @@ def get_auth_token():
 
 class PerfCollector(object):
     """Collector of multiple performance events.
+
+    Safe to share between threads, as long as concurrent events have
+    different keys.
     """
     MAX_SIZE = 1000  # max number events in history
     EVENT_WILDCARD = '*'
@@ -221,6 +232,7 @@ class PerfCollector(object):
         self._make_key = lambda e, k: '{e}::{k}'.format(e=e, k=k)
         self._observers = {}
         self._meta = {}
+        self._lock = threading.Lock()
 
     def add_observer(self, event, start_fn, end_fn):
         """Add observer functions for an event.
@@ -251,17 +263,18 @@ class PerfCollector(object):
     def start_event(self, event, key):
         timestamp = time.time()
         ekey = self._make_key(event, key)
-        self._cur[ekey] = timestamp
+        with self._lock:
+            self._cur[ekey] = timestamp
         self._broadcast(event, 0, key, timestamp)
 
     def end_event(self, event, key, **meta):
         timestamp = time.time()
         ekey = self._make_key(event, key)
-        if not ekey in self._cur:
-            raise KeyError('No current event found for key "{}"'
-                           .format(ekey))
-        t0 = self._cur[ekey]
-        del self._cur[ekey]
+        with self._lock:
+            if not ekey in self._cur:
+                raise KeyError('No current event found for key "{}"'
+                               .format(ekey))
+            t0 = self._cur.pop(ekey)
         if self._ns:
             full_event = '{}.{}'.format(self._ns, event)
         else:
@@ -272,6 +285,13 @@ class PerfCollector(object):
         self._history.append(pevent)
         self._broadcast(event, 1, pevent)
 
+    def discard_event(self, event, key):
+        """Forget a started event without recording it, e.g. after an
+        error. Does nothing if the event is not current.
+        """
+        with self._lock:
+            self._cur.pop(self._make_key(event, key), None)
+
     def get_last(self):
         if not self._history:
             return None
@@ -371,6 +391,9 @@ class PerfEvent(object):
                   'dur'      : self.duration})
         return d
 
+# Source of unique keys for `collect_performance` events
+_perf_keys = itertools.count()
+
 def collect_performance(perf_collector, prefix='', suffix=''):
     """Decorator that simplifies the use of the `PerfCollector` class
     to collect and log performance for a single method.
@@ -395,12 +418,17 @@ def collect_performance(perf_collector, prefix='', suffix=''):
 
     def real_decorator(method):
         event = prefix + method.__name__ + suffix
-        key = str(time.time())
 
         # create wrapper
         def method_wrapper(self, *args, **kwds):
+            # unique per call, so that concurrent calls do not collide
+            key = '{:f}#{:d}'.format(time.time(), next(_perf_keys))
             perf_collector.start_event(event, key)
-            returnval = method(self, *args, **kwds)
+            try:
+                returnval = method(self, *args, **kwds)
+            except:
+                perf_collector.discard_event(event, key)
+                raise
             for i, a in enumerate(args):
                 kwds['_{:d}'.format(i)] = str(a)
             perf_collector.end_event(event, key, **kwds)
@@ -411,6 +439,114 @@ def collect_performance(perf_collector, prefix='', suffix=''):
 
     return real_decorator
 
+# Deadline of the request being handled by the current thread
+_request_context = threading.local()
+
+def set_deadline(deadline):
+    """Set deadline for the work done by the current thread.
+
+    Args:
+        deadline (float): Seconds since the epoch, or None for no deadline
+    """
+    _request_context.deadline = deadline
+
+def get_deadline():
+    """Get deadline set by `set_deadline` in this thread, or None.
+    """
+    return getattr(_request_context, 'deadline', None)
+
+def check_deadline(stage):
+    """Call this before starting a costly stage of work (e.g., a
+    Workspace or Shock fetch) to give up once nobody is waiting
+    for the result.
+
+    Args:
+        stage (str): Name of the stage, for reporting
+    Raises:
+        DeadlineExceededError: if the current thread's deadline has passed
+    """
+    deadline = get_deadline()
+    if deadline is not None and time.time() > deadline:
+        raise DeadlineExceededError('Deadline exceeded {:.3f}s before {}'
+                                    .format(time.time() - deadline, stage),
+                                    stage=stage)
+
+# Thread pools shared within the process, by name
+_thread_pools = {}
+_thread_pools_lock = threading.Lock()
+
+def get_thread_pool(name, size):
+    """Get a process-wide pool of worker threads.
+
+    All callers with the same `name` share one pool, so the total number
+    of threads for that kind of work stays bounded. Do not submit work to
+    a pool from a task running in the same pool.
+
+    Args:
+        name (str): Name of the pool
+        size (int): Number of threads, used only when the pool is created
+    Returns:
+        multiprocessing.pool.ThreadPool
+    """
+    from multiprocessing.pool import ThreadPool
+    with _thread_pools_lock:
+        if name not in _thread_pools:
+            _thread_pools[name] = ThreadPool(size)
+        return _thread_pools[name]
+
+def is_versioned_ref(ref):
+    """Whether `ref` names one version of an object, e.g. '93/111124/2',
+    so that what it refers to cannot change.
+    """
+    parts = ref.split('/') if ref else []
+    return len(parts) == 3 and parts[2].isdigit()
+
+def extract_paths(data, path_list):
+    """Extract the parts of an object selected by a list of paths, as the
+    Workspace does for `get_object_subset`.
+
+    Each path is a string of keys separated by '/'. The part '*' matches
+    every key of a mapping, and '[*]' matches every item of a list.
+    Paths that select items of the same list are merged item by item,
+    e.g. ['contigs/[*]/id', 'contigs/[*]/length'] gives a list of
+    dicts with 'id' and 'length'. Missing keys are skipped.
+
+    Args:
+        data (dict): Source object
+        path_list (list): Path strings
+    Returns:
+        (dict) the selected parts of `data`, in the same structure
+    """
+    result = {}
+    for path in path_list:
+        result = _extract_path(data, path.split('/'), result)
+    return result
+
+def _extract_path(data, parts, dest):
+    """Copy the part of `data` at the path `parts` into `dest`, which
+    has the same structure (or is None), and return `dest`.
+    """
+    key, rest = parts[0], parts[1:]
+    if key == '[*]':
+        if not isinstance(data, list):
+            return dest
+        if dest is None:
+            dest = [None] * len(data)
+        for i, item in enumerate(data):
+            dest[i] = item if not rest else _extract_path(item, rest, dest[i])
+        return dest
+    if not isinstance(data, dict):
+        return dest
+    if dest is None:
+        dest = {}
+    keys = data.keys() if key == '*' else [key] if key in data else []
+    for k in keys:
+        if rest:
+            dest[k] = _extract_path(data[k], rest, dest.get(k))
+        else:
+            dest[k] = data[k]
+    return dest
+
 def get_msgpack_object_ref(path):
     """Get object-id ref for object in messagepack-encoded file.
 
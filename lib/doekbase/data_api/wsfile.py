@@ -21,7 +21,8 @@ import sys
 # Third-party
 import mongomock as mm
 # Local
-from doekbase.data_api.util import get_logger, log_start, log_end
+from doekbase.data_api.util import get_logger, log_start, log_end, \
+    extract_paths
 from doekbase.workspace.client import ServerError
 
 # Logging
@@ -239,29 +240,9 @@ class WorkspaceFile(object):
             records = self._find_ref(ref)
             # add to result
             for r in records:
-                extracted = {} # all extracted paths
-                for p in paths:
-                    d = r['data'] # alias
-                    parts = p.split('/')
-
-                    # Look for value matching path in 'd'
-                    e = extracted
-                    for i in xrange(len(parts) - 1):
-                        if parts[i] in d:
-                            d = d[parts[i]]
-
-                            if parts[i] not in e and isinstance(d, dict):
-                                e[parts[i]] = {}
-
-                            if isinstance(e[parts[i]], dict):
-                                e = e[parts[i]]
-                        else:
-                            break
-                    else:
-                        if parts[-1] in d:
-                            e[parts[-1]] = d[parts[-1]]
-
-                    _log.debug(extracted)
+                # all extracted paths, with '*' and '[*]' wildcards
+                extracted = extract_paths(r['data'], paths)
+                _log.debug(extracted)
                 if len(extracted) > 0:
                     #print("@@ add extracted: {}".format(extracted))
                     obj = self._make_object(r, ref, data=extracted)
@@ -332,6 +332,7 @@ config = {
                 "bin/genome_annotation_client_driver.py",
                 "bin/taxon_client_driver.py",
                 "bin/test_api_service.py",
+                "bin/data_api_export_fasta.py",
                 "bin/extract_thrift_docs"],
     "name": "doekbase_data_api",
     "entry_points": {
@@ -191,6 +191,42 @@ struct UTR_data {
     2: string utr_dna_sequence;
 }
 
+/**
+ * A Feature in a gene model.
+ */
+struct Gene_model_feature {
+    /** Identifier for this Feature. */
+    1: string feature_id;
+    /** Locations of this Feature. */
+    2: list<Region> feature_locations;
+    /** Functional annotation description. */
+    3: string feature_function;
+    /** DNA sequence string, if sequences were requested. */
+    4: optional string feature_dna_sequence;
+}
+
+/**
+ * An mRNA in a gene model, with its CDS.
+ */
+struct mRNA_model {
+    /** The mRNA Feature. */
+    1: Gene_model_feature mrna;
+    /** The CDS of the mRNA, if known. */
+    2: optional Gene_model_feature cds;
+}
+
+/**
+ * A gene with its mRNAs and their CDS.
+ */
+struct Gene_model {
+    /** The gene Feature. */
+    1: Gene_model_feature gene;
+    /** The mRNAs of the gene. */
+    2: list<mRNA_model> mrnas;
+    /** CDS children of the gene that are not the CDS of any of its mRNAs. */
+    3: list<Gene_model_feature> unassigned_cds;
+}
+
 
 service thrift_service {
     /**
@@ -553,6 +589,31 @@ service thrift_service {
         3:AuthenticationException authentication_exception,
         4:ObjectReferenceException reference_exception,
         5:AttributeException attribute_exception,
+        6:TypeException type_exception),
+
+    /**
+     * Retrieve gene models: each gene with its mRNAs, the CDS of each
+     * mRNA, and their locations and functions. Every Feature container
+     * is read at most once.
+     *
+     *  Note: The Genome data type does not contain interfeature
+     *  relationship information. Calling this method for Genome objects
+     *  will raise a :js:throws:`exc.TypeException`.
+     *
+     * @param gene_id_list List of gene Feature IDs for which to retrieve models.
+     * If empty, returns models for all genes.
+     * @param include_sequences Whether to include the DNA sequence of each Feature.
+     * @return Mapping of gene Feature IDs to :js:data:`Gene_model`.
+     */
+    map<string, Gene_model> get_gene_models(1:required string token,
+                                            2:required ObjectReference ref,
+                                            3:list<string> gene_id_list,
+                                            4:bool include_sequences) throws (
+        1:ServiceException generic_exception,
+        2:AuthorizationException authorization_exception,
+        3:AuthenticationException authentication_exception,
+        4:ObjectReferenceException reference_exception,
+        5:AttributeException attribute_exception,
         6:TypeException type_exception)
 
 }
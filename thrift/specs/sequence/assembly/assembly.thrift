@@ -101,6 +101,51 @@ struct AssemblyContig {
     9: bool is_circular;
 }
 
+/**
+ * A region of a contig, located as for Feature locations:
+ * [start, start + length) on the "+" strand and
+ * (start - length, start] on the "-" strand. The first base
+ * of the contig is at position 1.
+ */
+struct ContigRegion {
+    /** Contig ID */
+    1: string contig_id;
+    /** Position of the first base of the region on its strand */
+    2: i64 start;
+    /** Number of bases */
+    3: i64 length;
+    /** "+" or "-" */
+    4: string strand;
+}
+
+/**
+ * Quality metrics of an assembly, derived from its contigs.
+ */
+struct AssemblyMetrics {
+    /** Total number of contiguous sequences. */
+    1: i64 num_contigs;
+    /** Total length of all dna sequences. */
+    2: i64 dna_size;
+    /** Length of the contig that brings the longest contigs to 50% of dna_size. */
+    3: i64 n50;
+    /** Number of contigs needed to reach 50% of dna_size. */
+    4: i64 l50;
+    /** Length of the contig that brings the longest contigs to 90% of dna_size. */
+    5: i64 n90;
+    /** Number of contigs needed to reach 90% of dna_size. */
+    6: i64 l90;
+    /** Length of the longest contig. */
+    7: i64 longest_contig;
+    /** Length of the shortest contig. */
+    8: i64 shortest_contig;
+    /** Number of bases other than A, C, G or T. */
+    9: i64 ambiguous_bases;
+    /** Edges of the contig length bins, at powers of 10. */
+    10: list<i64> histogram_bin_edges;
+    /** Number of contigs in each length bin. */
+    11: list<i64> histogram_counts;
+}
+
 
 service thrift_service {
     /**
@@ -256,5 +301,36 @@ service thrift_service {
         3:AuthenticationException authentication_exception,
         4:ObjectReferenceException reference_exception,
         5:AttributeException attribute_exception,
+        6:TypeException type_exception),
+
+    /**
+     * Retrieve the sequences of regions of contigs in this Assembly,
+     * reading only the parts of the contigs that are needed.
+     * Regions on the "-" strand are reverse complemented.
+     *
+     * @return List of sequences, in the same order as region_list.
+     */
+    list<string> get_contig_subsequences(1:required string token,
+                                         2:required ObjectReference ref,
+                                         3:required list<ContigRegion> region_list) throws (
+        1:ServiceException generic_exception,
+        2:AuthorizationException authorization_exception,
+        3:AuthenticationException authentication_exception,
+        4:ObjectReferenceException reference_exception,
+        5:AttributeException attribute_exception,
+        6:TypeException type_exception),
+
+    /**
+     * Retrieve quality metrics for this Assembly: N50/L50, N90/L90,
+     * longest and shortest contig, ambiguous bases, and a histogram
+     * of contig lengths.
+     */
+    AssemblyMetrics get_assembly_metrics(1:required string token,
+                                         2:required ObjectReference ref) throws (
+        1:ServiceException generic_exception,
+        2:AuthorizationException authorization_exception,
+        3:AuthenticationException authentication_exception,
+        4:ObjectReferenceException reference_exception,
+        5:AttributeException attribute_exception,
         6:TypeException type_exception)
 }
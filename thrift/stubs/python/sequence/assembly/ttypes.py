@@ -909,3 +909,318 @@ class AssemblyContig(object):
 
   def __ne__(self, other):
     return not (self == other)
+
+class ContigRegion(object):
+  """
+  Attributes:
+   - contig_id
+   - start
+   - length
+   - strand
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.STRING, 'contig_id', None, None, ), # 1
+    (2, TType.I64, 'start', None, None, ), # 2
+    (3, TType.I64, 'length', None, None, ), # 3
+    (4, TType.STRING, 'strand', None, None, ), # 4
+  )
+
+  def __init__(self, contig_id=None, start=None, length=None, strand=None,):
+    self.contig_id = contig_id
+    self.start = start
+    self.length = length
+    self.strand = strand
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.STRING:
+          self.contig_id = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.I64:
+          self.start = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 3:
+        if ftype == TType.I64:
+          self.length = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 4:
+        if ftype == TType.STRING:
+          self.strand = iprot.readString();
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('ContigRegion')
+    if self.contig_id is not None:
+      oprot.writeFieldBegin('contig_id', TType.STRING, 1)
+      oprot.writeString(self.contig_id)
+      oprot.writeFieldEnd()
+    if self.start is not None:
+      oprot.writeFieldBegin('start', TType.I64, 2)
+      oprot.writeI64(self.start)
+      oprot.writeFieldEnd()
+    if self.length is not None:
+      oprot.writeFieldBegin('length', TType.I64, 3)
+      oprot.writeI64(self.length)
+      oprot.writeFieldEnd()
+    if self.strand is not None:
+      oprot.writeFieldBegin('strand', TType.STRING, 4)
+      oprot.writeString(self.strand)
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __hash__(self):
+    value = 17
+    value = (value * 31) ^ hash(self.contig_id)
+    value = (value * 31) ^ hash(self.start)
+    value = (value * 31) ^ hash(self.length)
+    value = (value * 31) ^ hash(self.strand)
+    return value
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)
+
+class AssemblyMetrics(object):
+  """
+  Attributes:
+   - num_contigs
+   - dna_size
+   - n50
+   - l50
+   - n90
+   - l90
+   - longest_contig
+   - shortest_contig
+   - ambiguous_bases
+   - histogram_bin_edges
+   - histogram_counts
+  """
+
+  thrift_spec = (
+    None, # 0
+    (1, TType.I64, 'num_contigs', None, None, ), # 1
+    (2, TType.I64, 'dna_size', None, None, ), # 2
+    (3, TType.I64, 'n50', None, None, ), # 3
+    (4, TType.I64, 'l50', None, None, ), # 4
+    (5, TType.I64, 'n90', None, None, ), # 5
+    (6, TType.I64, 'l90', None, None, ), # 6
+    (7, TType.I64, 'longest_contig', None, None, ), # 7
+    (8, TType.I64, 'shortest_contig', None, None, ), # 8
+    (9, TType.I64, 'ambiguous_bases', None, None, ), # 9
+    (10, TType.LIST, 'histogram_bin_edges', (TType.I64,None), None, ), # 10
+    (11, TType.LIST, 'histogram_counts', (TType.I64,None), None, ), # 11
+  )
+
+  def __init__(self, num_contigs=None, dna_size=None, n50=None, l50=None, n90=None, l90=None, longest_contig=None, shortest_contig=None, ambiguous_bases=None, histogram_bin_edges=None, histogram_counts=None,):
+    self.num_contigs = num_contigs
+    self.dna_size = dna_size
+    self.n50 = n50
+    self.l50 = l50
+    self.n90 = n90
+    self.l90 = l90
+    self.longest_contig = longest_contig
+    self.shortest_contig = shortest_contig
+    self.ambiguous_bases = ambiguous_bases
+    self.histogram_bin_edges = histogram_bin_edges
+    self.histogram_counts = histogram_counts
+
+  def read(self, iprot):
+    if iprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and isinstance(iprot.trans, TTransport.CReadableTransport) and self.thrift_spec is not None and fastbinary is not None:
+      fastbinary.decode_binary(self, iprot.trans, (self.__class__, self.thrift_spec))
+      return
+    iprot.readStructBegin()
+    while True:
+      (fname, ftype, fid) = iprot.readFieldBegin()
+      if ftype == TType.STOP:
+        break
+      if fid == 1:
+        if ftype == TType.I64:
+          self.num_contigs = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 2:
+        if ftype == TType.I64:
+          self.dna_size = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 3:
+        if ftype == TType.I64:
+          self.n50 = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 4:
+        if ftype == TType.I64:
+          self.l50 = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 5:
+        if ftype == TType.I64:
+          self.n90 = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 6:
+        if ftype == TType.I64:
+          self.l90 = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 7:
+        if ftype == TType.I64:
+          self.longest_contig = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 8:
+        if ftype == TType.I64:
+          self.shortest_contig = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 9:
+        if ftype == TType.I64:
+          self.ambiguous_bases = iprot.readI64();
+        else:
+          iprot.skip(ftype)
+      elif fid == 10:
+        if ftype == TType.LIST:
+          self.histogram_bin_edges = []
+          (_etype32, _size31) = iprot.readListBegin()
+          for _i33 in xrange(_size31):
+            _elem34 = iprot.readI64();
+            self.histogram_bin_edges.append(_elem34)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      elif fid == 11:
+        if ftype == TType.LIST:
+          self.histogram_counts = []
+          (_etype36, _size35) = iprot.readListBegin()
+          for _i37 in xrange(_size35):
+            _elem38 = iprot.readI64();
+            self.histogram_counts.append(_elem38)
+          iprot.readListEnd()
+        else:
+          iprot.skip(ftype)
+      else:
+        iprot.skip(ftype)
+      iprot.readFieldEnd()
+    iprot.readStructEnd()
+
+  def write(self, oprot):
+    if oprot.__class__ == TBinaryProtocol.TBinaryProtocolAccelerated and self.thrift_spec is not None and fastbinary is not None:
+      oprot.trans.write(fastbinary.encode_binary(self, (self.__class__, self.thrift_spec)))
+      return
+    oprot.writeStructBegin('AssemblyMetrics')
+    if self.num_contigs is not None:
+      oprot.writeFieldBegin('num_contigs', TType.I64, 1)
+      oprot.writeI64(self.num_contigs)
+      oprot.writeFieldEnd()
+    if self.dna_size is not None:
+      oprot.writeFieldBegin('dna_size', TType.I64, 2)
+      oprot.writeI64(self.dna_size)
+      oprot.writeFieldEnd()
+    if self.n50 is not None:
+      oprot.writeFieldBegin('n50', TType.I64, 3)
+      oprot.writeI64(self.n50)
+      oprot.writeFieldEnd()
+    if self.l50 is not None:
+      oprot.writeFieldBegin('l50', TType.I64, 4)
+      oprot.writeI64(self.l50)
+      oprot.writeFieldEnd()
+    if self.n90 is not None:
+      oprot.writeFieldBegin('n90', TType.I64, 5)
+      oprot.writeI64(self.n90)
+      oprot.writeFieldEnd()
+    if self.l90 is not None:
+      oprot.writeFieldBegin('l90', TType.I64, 6)
+      oprot.writeI64(self.l90)
+      oprot.writeFieldEnd()
+    if self.longest_contig is not None:
+      oprot.writeFieldBegin('longest_contig', TType.I64, 7)
+      oprot.writeI64(self.longest_contig)
+      oprot.writeFieldEnd()
+    if self.shortest_contig is not None:
+      oprot.writeFieldBegin('shortest_contig', TType.I64, 8)
+      oprot.writeI64(self.shortest_contig)
+      oprot.writeFieldEnd()
+    if self.ambiguous_bases is not None:
+      oprot.writeFieldBegin('ambiguous_bases', TType.I64, 9)
+      oprot.writeI64(self.ambiguous_bases)
+      oprot.writeFieldEnd()
+    if self.histogram_bin_edges is not None:
+      oprot.writeFieldBegin('histogram_bin_edges', TType.LIST, 10)
+      oprot.writeListBegin(TType.I64, len(self.histogram_bin_edges))
+      for iter39 in self.histogram_bin_edges:
+        oprot.writeI64(iter39)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    if self.histogram_counts is not None:
+      oprot.writeFieldBegin('histogram_counts', TType.LIST, 11)
+      oprot.writeListBegin(TType.I64, len(self.histogram_counts))
+      for iter40 in self.histogram_counts:
+        oprot.writeI64(iter40)
+      oprot.writeListEnd()
+      oprot.writeFieldEnd()
+    oprot.writeFieldStop()
+    oprot.writeStructEnd()
+
+  def validate(self):
+    return
+
+
+  def __hash__(self):
+    value = 17
+    value = (value * 31) ^ hash(self.num_contigs)
+    value = (value * 31) ^ hash(self.dna_size)
+    value = (value * 31) ^ hash(self.n50)
+    value = (value * 31) ^ hash(self.l50)
+    value = (value * 31) ^ hash(self.n90)
+    value = (value * 31) ^ hash(self.l90)
+    value = (value * 31) ^ hash(self.longest_contig)
+    value = (value * 31) ^ hash(self.shortest_contig)
+    value = (value * 31) ^ hash(self.ambiguous_bases)
+    value = (value * 31) ^ hash(self.histogram_bin_edges)
+    value = (value * 31) ^ hash(self.histogram_counts)
+    return value
+
+  def __repr__(self):
+    L = ['%s=%r' % (key, value)
+      for key, value in self.__dict__.iteritems()]
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(L))
+
+  def __eq__(self, other):
+    return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+  def __ne__(self, other):
+    return not (self == other)